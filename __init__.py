@@ -11,33 +11,84 @@ bl_info = {
 ROOT_PATH = __file__
 LOG_DEBUG = False
 
+import sys
+
 import bpy
 
 from . import properties
 from . import operators
 from . import panels
+from .utils import event_bus
 from .utils import events
 from .utils import logs
+from .utils import tracing
+from .utils import update
+from .utils.event_bus import Event
+from .utils.update import AddonUpdate
+
+
+#---------------------------------------------------------------------------
+#   Landscape auto update
+#---------------------------------------------------------------------------
+
+# The landscape package imports numpy & starts worker processes, it's imported by its first use
+def _get_landscape():
+    return sys.modules.get(f'{__name__}.landscape')
+
+
+def _on_depsgraph(names: frozenset) -> None:
+    props = bpy.context.scene.tmlg_props
+    if not props.auto_update or props.landscape_object is None:
+        return
+    from . import landscape
+    landscape.on_depsgraph(names)
+
+
+def _on_scene_changed(items: frozenset) -> None:
+    landscape = _get_landscape()
+    if landscape is not None:
+        landscape.on_scene_changed(items)
+
+
+def _start_auto_update() -> None:
+    event_bus.subscribe(Event.DEPSGRAPH, _on_depsgraph)
+    event_bus.subscribe(Event.LOAD, _on_scene_changed)
+    event_bus.subscribe(Event.ACTIVE_SCENE, _on_scene_changed)
+
+
+def _stop_auto_update() -> None:
+    event_bus.unsubscribe(Event.DEPSGRAPH, _on_depsgraph)
+    event_bus.unsubscribe(Event.LOAD, _on_scene_changed)
+    event_bus.unsubscribe(Event.ACTIVE_SCENE, _on_scene_changed)
+    landscape = _get_landscape()
+    if landscape is not None:
+        landscape.shutdown()
 
 
 # register addon
 def register():
-    logs.start_logging()
+    with tracing.span('register'):
+        logs.start_logging()
 
-    # Register classes
-    properties.register_classes()
-    operators.register_classes()
-    panels.register_classes()
+        # Register classes
+        properties.register_classes()
+        operators.register_classes()
+        panels.register_classes()
 
-    events.start_listening()
+        events.start_listening()
+        _start_auto_update()
 
 # unregister addon
 def unregister():
-    events.stop_listening()
+    with tracing.span('unregister'):
+        _stop_auto_update()
+        events.stop_listening()
+        AddonUpdate.cancel_check()
+        update.close_session()
 
-    # Unregister classes
-    panels.unregister_classes()
-    operators.unregister_classes()
-    properties.unregister_classes()
+        # Unregister classes
+        panels.unregister_classes()
+        operators.unregister_classes()
+        properties.unregister_classes()
 
-    logs.stop_logging()
\ No newline at end of file
+        logs.stop_logging()
\ No newline at end of file
@@ -1,59 +1,185 @@
+import os
+import time
 import textwrap
 import bpy
+from dataclasses import dataclass, field
+from typing import Iterable
 
 from ..utils import path
 from ..utils import logs
+from ..utils import tracing
+from . import manifest
+from . import catalogs
 
 log = logs.get_logger(__name__)
 
 library_parent = '_TM_ProceduralScenery'
 library_name = 'TM_ProceduralScenery.blend'
 blend_FilePath = str(path.make_path(__file__).parent / library_parent / library_name)
+catalogs_FilePath = str(path.make_path(__file__).parent / library_parent / catalogs.CATALOGS_FILENAME)
+
+asset_prefix = 'TM_'
+asset_categories = ('node_groups', 'materials', 'objects', 'collections')
+
+
+@dataclass
+class LoadReport:
+    """Result of load_assets(): IDs names by category & duration in seconds."""
+    linked: dict[str, list[str]] = field(default_factory=dict)
+    skipped: dict[str, list[str]] = field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def linked_count(self) -> int:
+        return sum(len(names) for names in self.linked.values())
+
+    @property
+    def skipped_count(self) -> int:
+        return sum(len(names) for names in self.skipped.values())
+
+    def __str__(self) -> str:
+        return f'{self.linked_count} linked, {self.skipped_count} skipped in {self.duration * 1000:.1f} ms'
+
+
+def get_library() -> bpy.types.Library | None:
+    """Return the assets library datablock if it is linked in the current file."""
+    lib_path = os.path.normcase(os.path.normpath(blend_FilePath))
+    for lib in bpy.data.libraries:
+        if os.path.normcase(os.path.normpath(bpy.path.abspath(lib.filepath))) == lib_path:
+            return lib
+    return None
 
 
 def lib_exists() -> bool:
-    return library_name in bpy.data.libraries
+    return get_library() is not None
 
 
-def are_all_assets_loaded() -> bool:
-    all_loaded = True
+def get_library_version() -> str:
+    """Return a string which changes whenever the library file changes, empty if there is no library."""
+    try:
+        stat = os.stat(blend_FilePath)
+    except OSError:
+        return ''
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
 
-    if lib_exists:
-        with bpy.data.libraries.load(blend_FilePath, link=True, assets_only=True) as (data_from, data_to):
-            data_from: bpy.types.BlendData
-            data_to: bpy.types.BlendData
-        
-            for attr in dir(data_to):
-                if attr == "node_groups":
-                    for ID in getattr(data_from, attr):
-                        if ID not in getattr(data_to, attr) or ID not in getattr(bpy.data, attr):
-                            all_loaded = False
-    else:
-        all_loaded = False
-    
-    return all_loaded
-
-
-def load_assets() -> bpy.types.BlendData:
+
+def get_catalogs() -> catalogs.CatalogIndex:
+    """Return the catalog index of the assets library."""
+    return catalogs.get_index(catalogs_FilePath)
+
+
+def get_library_assets(attr: str, include: Iterable[str] = (), exclude: Iterable[str] = ()) -> frozenset[str]:
+    """Return the names of the library assets of an ID category, read from the manifest.
+
+    Assets can be filtered by catalog paths (e.g. "TM Procedural Scenery/Modifiers/Landscape"),
+    a catalog path also matches its sub-catalogs."""
+    names = (name for name in manifest.get_names(blend_FilePath, attr) if name.startswith(asset_prefix))
+    if not include and not exclude:
+        return frozenset(names)
+
+    index = get_catalogs()
+    catalog_ids = manifest.get_catalog_ids(blend_FilePath, attr)
+    return frozenset(
+        name for name in names if index.matches(catalog_ids.get(name, catalogs.NIL_UUID), include, exclude)
+    )
+
+
+def get_linked_names(attr: str) -> frozenset[str]:
+    """Return the names of the IDs of a category which are linked from the assets library."""
+    lib = get_library()
+    if lib is None:
+        return frozenset()
+    return frozenset(ID.name for ID in getattr(bpy.data, attr) if ID.library == lib)
+
+
+def resolve_dependencies(node_groups: Iterable[str]) -> frozenset[str]:
+    """Return the given node groups and all the node groups they nest, recursively."""
+    graph = manifest.get_node_group_deps(blend_FilePath)
+    resolved = set()
+    pending = list(node_groups)
+    while pending:
+        name = pending.pop()
+        if name not in resolved:
+            resolved.add(name)
+            pending.extend(graph.get(name, ()))
+    return frozenset(resolved)
+
+
+@tracing.traced('assets.are_all_assets_loaded')
+def are_all_assets_loaded(include: Iterable[str] = (), exclude: Iterable[str] = ()) -> bool:
+    if not lib_exists():
+        return False
+
+    return all(get_library_assets(attr, include, exclude) <= get_linked_names(attr) for attr in asset_categories)
+
+
+@tracing.traced('assets.load_assets')
+def load_assets(
+        categories: tuple[str, ...] = asset_categories,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        names: Iterable[str] | None = None,
+    ) -> LoadReport:
+    """Link the library assets which are not linked yet, in a single library load.
+
+    Assets already linked from the library are skipped, local IDs with the same name
+    (or their ".001" duplicates) don't count as linked.
+    Use include/exclude catalog paths or names to link a subset of the library."""
     log.info(textwrap.dedent(f'\
                              Loading assets...\n\
                                from "{blend_FilePath}"')
     )
+    start = time.perf_counter()
+    report = LoadReport()
+    if names is not None:
+        names = frozenset(names)
 
-    with bpy.data.libraries.load(blend_FilePath, link=True, assets_only=True) as (data_from, data_to):
-        data_from: bpy.types.BlendData
-        data_to: bpy.types.BlendData
-        
-        for attr in dir(data_to):
-            if attr == "node_groups":
-                IDs = [
-                    name for name in getattr(data_from, attr) if(name.startswith("TM_")
-                                                                    & (name not in getattr(bpy.data, attr)))
-                ]
+    missing = {}
+    for attr in categories:
+        wanted = get_library_assets(attr, include, exclude)
+        if names is not None:
+            wanted = wanted.intersection(names)
+        linked = get_linked_names(attr)
+        report.skipped[attr] = sorted(wanted & linked)
+        if wanted - linked:
+            missing[attr] = wanted - linked
+
+    if len(missing) > 0:
+        with bpy.data.libraries.load(blend_FilePath, link=True, assets_only=True) as (data_from, data_to):
+            data_from: bpy.types.BlendData
+            data_to: bpy.types.BlendData
+
+            for attr, missing_names in missing.items():
+                IDs = sorted(missing_names.intersection(getattr(data_from, attr)))
                 if len(IDs) > 0:
                     IDs_string = "\n- ".join(IDs)
                     log.debug(f'{attr}:\n- {IDs_string}')
                     setattr(data_to, attr, IDs)
-    
-    log.info('Finished !')
-    return data_to
\ No newline at end of file
+
+        for attr in missing:
+            report.linked[attr] = [ID.name for ID in getattr(data_to, attr) if ID is not None]
+
+    report.duration = time.perf_counter() - start
+    log.info(f'Finished ! {report}')
+    return report
+
+
+def link_node_group(name: str) -> bpy.types.NodeTree | None:
+    """Link a library node group on demand, with the node groups it depends on.
+
+    Dependencies are linked by name in the same library load: nested node groups
+    usually aren't marked as assets, the assets filter of load_assets() would drop them.
+    Return the linked node group, None if it isn't in the library."""
+    if name not in get_linked_names('node_groups') and os.path.isfile(blend_FilePath):
+        start = time.perf_counter()
+        missing = resolve_dependencies((name,)) - get_linked_names('node_groups')
+        with bpy.data.libraries.load(blend_FilePath, link=True) as (data_from, data_to):
+            data_to.node_groups = sorted(missing.intersection(data_from.node_groups))
+        linked = [ID.name for ID in data_to.node_groups if ID is not None]
+        log.debug(f'Linked {len(linked)} node groups for "{name}" in {(time.perf_counter() - start) * 1000:.1f} ms')
+
+    lib = get_library()
+    for node_group in bpy.data.node_groups:
+        if node_group.name == name and node_group.library == lib and lib is not None:
+            return node_group
+    return None
@@ -0,0 +1,119 @@
+"""Asset catalogs of the assets library, parsed from "blender_assets.cats.txt".
+
+The catalog definition file is parsed once and cached until it changes.
+Each catalog is indexed by UUID & path, with the set of its ancestors paths,
+so filtering an asset by catalog is a dict lookup.
+
+Function | Use
+:---|:---
+get_index(filepath) | Return the (cached) catalog index of a definition file
+"""
+
+import os
+from typing import Iterable, NamedTuple
+
+from ..utils import logs
+
+log = logs.get_logger(__name__)
+
+CATALOGS_FILENAME = 'blender_assets.cats.txt'
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
+
+class Catalog(NamedTuple):
+    uuid: str
+    path: str
+    simple_name: str
+
+    @property
+    def name(self) -> str:
+        """Last element of the catalog path."""
+        return self.path.rpartition('/')[2]
+
+    @property
+    def depth(self) -> int:
+        return self.path.count('/')
+
+
+class CatalogIndex():
+    """UUID to catalog path tree of an asset library."""
+
+    def __init__(self, catalogs: Iterable[Catalog]) -> None:
+        self.by_uuid: dict[str, Catalog] = {}
+        self.by_path: dict[str, Catalog] = {}
+        self.children: dict[str, list[Catalog]] = {}
+        self._ancestors: dict[str, frozenset[str]] = {}
+
+        for catalog in catalogs:
+            self.by_uuid[catalog.uuid] = catalog
+            self.by_path.setdefault(catalog.path, catalog)
+
+            parts = catalog.path.split('/')
+            self._ancestors[catalog.uuid] = frozenset('/'.join(parts[:i]) for i in range(1, len(parts) + 1))
+            self.children.setdefault('/'.join(parts[:-1]), []).append(catalog)
+
+    def __len__(self) -> int:
+        return len(self.by_uuid)
+
+    def __iter__(self):
+        return iter(sorted(self.by_uuid.values(), key=lambda catalog: catalog.path))
+
+    def get(self, uuid: str) -> Catalog | None:
+        return self.by_uuid.get(uuid)
+
+    def find(self, catalog_path: str) -> Catalog | None:
+        return self.by_path.get(catalog_path.strip('/'))
+
+    def is_within(self, uuid: str, catalog_path: str) -> bool:
+        """Return True if the catalog is the given catalog path or one of its descendants."""
+        return catalog_path.strip('/') in self._ancestors.get(uuid, ())
+
+    def matches(self, uuid: str, include: Iterable[str] = (), exclude: Iterable[str] = ()) -> bool:
+        """Return True if the catalog is within one of the included paths (or none given),
+        and within none of the excluded paths."""
+        ancestors = self._ancestors.get(uuid, frozenset())
+        include = [p.strip('/') for p in include]
+        if len(include) > 0 and ancestors.isdisjoint(include):
+            return False
+        return ancestors.isdisjoint(p.strip('/') for p in exclude)
+
+
+def parse(filepath: str) -> CatalogIndex:
+    """Parse a catalog definition file, malformed lines are ignored."""
+    catalogs = []
+    with open(filepath, mode='r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if len(line) == 0 or line.startswith(('#', 'VERSION')):
+                continue
+            uuid, sep, rest = line.partition(':')
+            catalog_path, _, simple_name = rest.partition(':')
+            if sep == '' or catalog_path == '':
+                log.warning(f'Invalid catalog definition: "{line}"')
+                continue
+            catalogs.append(Catalog(uuid, catalog_path.strip('/'), simple_name))
+    return CatalogIndex(catalogs)
+
+
+# Parsed indexes, by filepath: ((size, mtime_ns), index)
+_indexes: dict[str, tuple[tuple, CatalogIndex]] = {}
+
+
+def get_index(filepath: str) -> CatalogIndex:
+    """Return the catalog index of a definition file, parsing it again only if it changed.
+
+    Return an empty index if the file doesn't exist."""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return CatalogIndex(())
+
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _indexes.get(filepath)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    index = parse(filepath)
+    _indexes[filepath] = (key, index)
+    log.debug(f'{len(index)} catalogs parsed from "{filepath}"')
+    return index
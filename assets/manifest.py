@@ -0,0 +1,145 @@
+"""Datablocks manifest of the assets library, cached in a sidecar file.
+
+The manifest lists the datablock names of the library for every ID category,
+the catalog of each asset and the node groups dependency graph.
+It is stored next to the library and keyed by the library path, size & mtime,
+so the library is only opened again when the file changes.
+
+Function | Use
+:---|:---
+get_manifest(filepath)     | Return the (cached) manifest of a library
+get_names(filepath, attr)  | Return the datablock names of an ID category
+get_catalog_ids(filepath, attr) | Return the catalog UUID of each asset of an ID category
+get_node_group_deps(filepath)   | Return the nested node groups of each node group
+invalidate()               | Forget the in-memory manifests
+"""
+
+import json
+import os
+import bpy
+from pathlib import Path
+
+from ..utils import path
+from ..utils import logs
+
+log = logs.get_logger(__name__)
+
+MANIFEST_VERSION = 3
+MANIFEST_SUFFIX = '.manifest.json'
+
+# In-memory manifests, by library filepath
+_manifests: dict[str, dict] = {}
+
+
+def sidecar_path(filepath: str) -> Path:
+    """Returns the manifest sidecar filepath of a library."""
+    blend_path = path.make_path(filepath)
+    return blend_path.with_name(blend_path.stem + MANIFEST_SUFFIX)
+
+
+def _file_key(filepath: str) -> dict:
+    stat = os.stat(filepath)
+    return {
+        'path'      : str(filepath),
+        'size'      : stat.st_size,
+        'mtime_ns'  : stat.st_mtime_ns,
+    }
+
+
+def _read_sidecar(filepath: str, key: dict) -> dict | None:
+    try:
+        with open(sidecar_path(filepath), mode='r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('key') != key:
+        return None
+    return manifest
+
+
+def _write_sidecar(filepath: str, manifest: dict) -> None:
+    sidecar = sidecar_path(filepath)
+    tmp = sidecar.with_name(sidecar.name + '.tmp')
+    try:
+        with open(tmp, mode='w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, sidecar)
+    except OSError:
+        # Read-only install: the manifest is kept in memory for this session
+        log.warning(f'Cannot write assets manifest "{sidecar}"', exc_info=True)
+
+
+def _build(filepath: str, key: dict) -> dict:
+    log.info(f'Building assets manifest of "{filepath}"...')
+
+    ids = {}
+    catalog_ids = {}
+    # Link the assets in a temporary main to read their metadata without touching the current file
+    with bpy.data.temp_data() as temp_data:
+        with temp_data.libraries.load(filepath, link=True, assets_only=True) as (data_from, data_to):
+            for attr in dir(data_from):
+                names = getattr(data_from, attr)
+                if isinstance(names, list) and len(names) > 0:
+                    ids[attr] = sorted(names)
+                    setattr(data_to, attr, names)
+
+        for attr in ids:
+            catalog_ids[attr] = {
+                ID.name: ID.asset_data.catalog_id
+                for ID in getattr(data_to, attr) if ID is not None and ID.asset_data is not None
+            }
+
+        # Nested groups are linked indirectly, so all the library node groups are in the temporary main
+        node_group_deps = {
+            node_group.name: sorted({
+                node.node_tree.name for node in node_group.nodes
+                if node.type == 'GROUP' and node.node_tree is not None
+            })
+            for node_group in temp_data.node_groups
+        }
+
+    return {
+        'version'       : MANIFEST_VERSION,
+        'key'           : key,
+        'ids'           : ids,
+        'catalog_ids'   : catalog_ids,
+        'node_group_deps' : node_group_deps,
+    }
+
+
+def get_manifest(filepath: str) -> dict:
+    """Return the manifest of a library, rebuilding it only if the library changed."""
+    key = _file_key(filepath)
+
+    manifest = _manifests.get(filepath)
+    if manifest is not None and manifest['key'] == key:
+        return manifest
+
+    manifest = _read_sidecar(filepath, key)
+    if manifest is None:
+        manifest = _build(filepath, key)
+        _write_sidecar(filepath, manifest)
+
+    _manifests[filepath] = manifest
+    return manifest
+
+
+def get_names(filepath: str, attr: str) -> frozenset[str]:
+    """Return the datablock names of an ID category (e.g. "node_groups") of a library."""
+    return frozenset(get_manifest(filepath)['ids'].get(attr, ()))
+
+
+def get_catalog_ids(filepath: str, attr: str) -> dict[str, str]:
+    """Return the catalog UUID of each asset of an ID category of a library."""
+    return get_manifest(filepath)['catalog_ids'].get(attr, {})
+
+
+def get_node_group_deps(filepath: str) -> dict[str, list[str]]:
+    """Return the node groups directly nested in each node group of a library."""
+    return get_manifest(filepath)['node_group_deps']
+
+
+def invalidate() -> None:
+    """Forget the in-memory manifests, the sidecars are still checked against the library."""
+    _manifests.clear()
@@ -0,0 +1,119 @@
+"""Headless landscape generation of the opened map, for batch processing.
+
+Function | Use
+:---|:---
+process_map(save)   | Link the assets, generate the landscape & save, return the report
+main(argv)          | Command line entry point, write the report as JSON
+
+Run in blender, with the map file opened:
+
+Example | Note
+:---|:---
+`blender -b map.blend --python-expr "import tm_landscape_generator.batch as b; b.main()" -- --report map.json` | Installed addon
+`blender -b map.blend --python scripts/generate_map.py -- --report map.json` | From this repository
+
+`scripts/generate_maps.py` runs it over a directory of maps, in parallel blender processes.
+"""
+
+import argparse
+import json
+import sys
+import time
+import traceback
+
+import bpy
+
+from . import assets
+from . import landscape
+from .utils import logs
+from .utils import tracing
+
+log = logs.get_logger(__name__)
+
+# Exit code of blender when the map failed
+EXIT_FAILURE = 1
+
+
+def _ensure_registered() -> None:
+    """Register the addon if it isn't enabled, e.g. blender started with --factory-startup."""
+    if not hasattr(bpy.types.Scene, 'tmlg_props'):
+        from . import register
+        register()
+
+
+def process_map(save: bool = True) -> dict:
+    """Link the missing assets, generate the landscape of the current scene & save the file.
+
+    Return the report of the map, with the durations in seconds."""
+    start = time.perf_counter()
+    report = {
+        'filepath'  : bpy.data.filepath,
+        'scene'     : bpy.context.scene.name,
+        'status'    : 'ok',
+        'error'     : None,
+        'timings'   : {},
+    }
+    timings = report['timings']
+
+    try:
+        _ensure_registered()
+        props = bpy.context.scene.tmlg_props
+
+        load_report = assets.load_assets()
+        timings['load_assets'] = load_report.duration
+        report['assets'] = {'linked': load_report.linked_count, 'skipped': load_report.skipped_count}
+
+        if props.route_collection is None:
+            report['status'] = 'skipped'
+            report['error'] = 'No route collection set in the scene landscape settings'
+        else:
+            # Saved maps get the final resolution, as for an export
+            step_start = time.perf_counter()
+            # Switching the level updates an existing landscape only (see set_lod), a new one is generated here
+            regenerated = props.lod_mode != 'FINAL' and props.landscape_object is not None
+            if props.lod_mode != 'FINAL':
+                props.lod_mode = 'FINAL'
+            if not regenerated:
+                landscape.generate(bpy.context)
+            obj = props.landscape_object
+            timings['generate'] = time.perf_counter() - step_start
+            report['landscape'] = {'object': obj.name, 'vertices': len(obj.data.vertices)}
+
+            if save:
+                step_start = time.perf_counter()
+                bpy.ops.wm.save_mainfile()
+                timings['save'] = time.perf_counter() - step_start
+
+    except Exception as e:
+        log.exception(f'Failed to process "{bpy.data.filepath}"')
+        report['status'] = 'error'
+        report['error'] = ''.join(traceback.format_exception_only(e)).strip()
+
+    timings['total'] = time.perf_counter() - start
+    if tracing.is_enabled():
+        report['spans'] = {name: stats.mean_ms for name, stats in tracing.get_stats().items()}
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Process the opened map with the arguments given after "--" on blender command line.
+
+    Exit blender with EXIT_FAILURE if the map failed."""
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog='tmlg batch', description=__doc__.splitlines()[0])
+    parser.add_argument('--report', help='JSON report filepath, printed if not set')
+    parser.add_argument('--no-save', action='store_true', help="Don't save the map")
+    args = parser.parse_args(argv)
+
+    report = process_map(save=not args.no_save)
+    if args.report:
+        with open(args.report, mode='w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+    else:
+        print(json.dumps(report, indent=1))
+
+    logs.stop_logging() # flush the logs, blender exits without unregistering
+    if report['status'] == 'error':
+        sys.exit(EXIT_FAILURE)
@@ -0,0 +1,51 @@
+"""Helpers shared by the benchmarks, which run in blender:
+
+`blender -b --factory-startup --python benchmarks/<bench_file>.py -- [args]`
+"""
+
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+ADDON_ROOT = Path(__file__).resolve().parent.parent
+ADDON_MODULE = 'tm_landscape_generator'
+
+
+def import_addon():
+    """Import the addon package from this repository, whatever its directory name."""
+    if ADDON_MODULE in sys.modules:
+        return sys.modules[ADDON_MODULE]
+    spec = importlib.util.spec_from_file_location(
+        ADDON_MODULE,
+        ADDON_ROOT / '__init__.py',
+        submodule_search_locations=[str(ADDON_ROOT)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def script_args() -> list[str]:
+    """Return the arguments given after "--" on blender command line."""
+    return sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+
+def timeit(func, repeat: int = 5) -> dict:
+    """Run func several times, return min/mean durations in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {
+        'min'   : min(durations),
+        'mean'  : sum(durations) / len(durations),
+    }
+
+
+def print_results(title: str, results: dict) -> None:
+    print(f'--- {title} ---')
+    print(json.dumps(results, indent=1))
@@ -0,0 +1,49 @@
+"""Assets library: `are_all_assets_loaded` & `load_assets` on cold and warm scenes.
+
+- cold: empty file & manifests forgotten in memory, every asset is linked
+- warm: every asset is already linked, nothing to load
+
+Skipped when the assets library isn't in the repository.
+
+`blender -b --factory-startup --python benchmarks/bench_assets.py -- [repeat]`
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _common import import_addon, script_args, print_results
+
+
+def _cold_scene(assets) -> None:
+    import bpy
+    bpy.ops.wm.read_homefile(use_empty=True)
+    assets.manifest.invalidate()
+
+
+def bench_assets(repeat: int = 5) -> dict:
+    assets = import_addon().assets
+    if not os.path.exists(assets.blend_FilePath):
+        return {}
+
+    samples = {key: [] for key in ('all_loaded_cold_s', 'load_cold_s', 'all_loaded_warm_s', 'load_warm_s')}
+    for _ in range(repeat):
+        _cold_scene(assets)
+        for key, func in (
+            ('all_loaded_cold_s', assets.are_all_assets_loaded),
+            ('load_cold_s', assets.load_assets),
+            ('all_loaded_warm_s', assets.are_all_assets_loaded),
+            ('load_warm_s', assets.load_assets),
+        ):
+            start = time.perf_counter()
+            func()
+            samples[key].append(time.perf_counter() - start)
+
+    _cold_scene(assets)
+    return {key: min(values) for key, values in samples.items()}
+
+
+if __name__ == '__main__':
+    args = script_args()
+    print_results('Assets loading', bench_assets(int(args[0]) if args else 5))
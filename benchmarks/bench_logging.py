@@ -0,0 +1,143 @@
+"""Logging throughput, in records per second, before & after the queue-based pipeline.
+
+- sync (before): the previous console & html formatters, copying each record,
+  called synchronously by the logging caller
+- queued caller (after): records enqueued on the caller thread, the cost seen by the addon code
+- queued total (after): until the listener thread formatted & wrote them all
+- filtered: records under the logger level, dropped before any formatting
+
+Both cases write to the same sinks: a console stream to the null device & a log file.
+
+`blender -b --factory-startup --python benchmarks/bench_logging.py -- [records]`
+"""
+
+import copy
+import html
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _common import import_addon, script_args, print_results
+
+
+#---------------------------------------------------------------------------
+#   Previous formatters, as shipped before the queue-based pipeline
+#---------------------------------------------------------------------------
+
+class _LegacyConsoleFormatter(logging.Formatter):
+    level_to_color = {
+        logging.DEBUG       :   '1;34',
+        logging.INFO        :   '1;32',
+        logging.WARNING     :   '1;33',
+        logging.ERROR       :   '1;31',
+        logging.CRITICAL    :   '1;35',
+    }
+
+    def format(self, record) -> str:
+        cpyRecord = copy.copy(record)
+        levelcolor = self.level_to_color[cpyRecord.levelno]
+        cpyRecord.levelname     = f'\x1b[{levelcolor}m{cpyRecord.levelname:^9}\x1b[0m'
+        cpyRecord.name          = f'\x1b[{levelcolor}m{cpyRecord.name}\x1b[0m'
+        cpyRecord.threadName    = f'\x1b[{levelcolor}m{cpyRecord.threadName}\x1b[0m'
+        cpyRecord.msg           = f'\x1b[2m{cpyRecord.msg}\x1b[0m'
+        return super().format(cpyRecord)
+
+    def formatTime(self, record, datefmt=None) -> str:
+        return f'\x1b[2m{super().formatTime(record, datefmt)}\x1b[0m'
+
+
+class _LegacyHtmlFormatter(logging.Formatter):
+    level_to_color = {
+        logging.DEBUG       :   'l1',
+        logging.INFO        :   'l2',
+        logging.WARNING     :   'l3',
+        logging.ERROR       :   'l4',
+        logging.CRITICAL    :   'l5',
+    }
+
+    def format(self, record) -> str:
+        cpyRecord = copy.copy(record)
+        levelcolor = self.level_to_color[cpyRecord.levelno]
+        cpyRecord.levelname     = f'<span class="{levelcolor}">{cpyRecord.levelname:^9}</span>'
+        cpyRecord.name          = f'<span class="{levelcolor}">{cpyRecord.name}</span>'
+        cpyRecord.threadName    = f'<span class="{levelcolor}">{cpyRecord.threadName}</span>'
+        cpyRecord.msg           = f'<span class="msg">{html.escape(cpyRecord.msg)}</span>'
+        return super().format(cpyRecord)
+
+    def formatTime(self, record, datefmt=None) -> str:
+        return f'<span class="t">{super().formatTime(record, datefmt)}</span>'
+
+
+def _make_handlers(logs, tmp_dir: str, legacy: bool) -> list[logging.Handler]:
+    """Return the console & log file handlers of the previous (legacy) or current pipeline."""
+    console = logging.StreamHandler(open(os.devnull, mode='w'))
+    if legacy:
+        console.setFormatter(_LegacyConsoleFormatter(logs._debug_fmt))
+        log_file = logging.FileHandler(os.path.join(tmp_dir, 'bench.html'), mode='w', encoding='utf-8')
+        log_file.setFormatter(_LegacyHtmlFormatter(logs._debug_fmt))
+    else:
+        console.setFormatter(logs._ConsoleStyleFormatter(logs._debug_fmt))
+        log_file = logging.FileHandler(os.path.join(tmp_dir, 'bench.jsonl'), mode='w', encoding='utf-8')
+        log_file.setFormatter(logs._JsonLinesFormatter())
+    return [console, log_file]
+
+
+def _emit(logger: logging.Logger, records: int) -> float:
+    start = time.perf_counter()
+    for i in range(records):
+        logger.debug('Benchmark record %d with some <html> & "text"', i)
+    return time.perf_counter() - start
+
+
+def bench_logging(records: int = 50_000) -> dict:
+    logs = import_addon().utils.logs
+    logger = logging.getLogger(f'{logs.__package__}.bench')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Before: synchronous handlers
+        handlers = _make_handlers(logs, tmp_dir, legacy=True)
+        for handler in handlers:
+            logger.addHandler(handler)
+        duration = _emit(logger, records)
+        for handler in handlers:
+            logger.removeHandler(handler)
+            handler.close()
+        results['sync_records_per_s'] = records / duration
+
+        # After: queue handler & listener thread
+        handlers = _make_handlers(logs, tmp_dir, legacy=False)
+        q = queue.SimpleQueue()
+        queue_handler = logs._QueueHandler(q)
+        listener = logging.handlers.QueueListener(q, *handlers)
+        logger.addHandler(queue_handler)
+        listener.start()
+        start = time.perf_counter()
+        duration = _emit(logger, records)
+        listener.stop()
+        drained = time.perf_counter() - start
+        logger.removeHandler(queue_handler)
+        for handler in handlers:
+            handler.close()
+        results['queued_caller_records_per_s'] = records / duration
+        results['queued_total_records_per_s'] = records / drained
+
+        # Filtered level: records must be dropped before any formatting
+        logger.setLevel(logging.WARNING)
+        results['filtered_records_per_s'] = records / _emit(logger, records)
+
+    results['caller_speedup'] = results['queued_caller_records_per_s'] / results['sync_records_per_s']
+    results['total_speedup'] = results['queued_total_records_per_s'] / results['sync_records_per_s']
+    return results
+
+
+if __name__ == '__main__':
+    args = script_args()
+    print_results('Logging throughput', bench_logging(int(args[0]) if args else 50_000))
@@ -0,0 +1,69 @@
+"""Addon startup time: import, register & unregister in headless blender.
+
+A cold import can only be measured once per blender process, use --runs to
+measure it in several fresh blender processes.
+
+`blender -b --factory-startup --python benchmarks/bench_startup.py -- [--runs N]`
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _common import ADDON_MODULE, import_addon, script_args, print_results
+
+# Prefix of the result line printed by a single run
+_RESULT_PREFIX = 'TMLG_STARTUP_RESULT '
+
+
+def bench_startup_once() -> dict:
+    """Measure a cold import, then register & unregister, in the current process."""
+    start = time.perf_counter()
+    addon = import_addon()
+    import_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    addon.register()
+    register_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    addon.unregister()
+    unregister_duration = time.perf_counter() - start
+
+    return {
+        'import_s'      : import_duration,
+        'register_s'    : register_duration,
+        'unregister_s'  : unregister_duration,
+        'requests_imported' : 'requests' in sys.modules,
+        'landscape_imported' : f'{ADDON_MODULE}.landscape' in sys.modules,
+    }
+
+
+def bench_startup(runs: int) -> dict:
+    """Measure the startup in several fresh blender processes, return min/mean durations."""
+    import bpy
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [bpy.app.binary_path, '-b', '--factory-startup', '--python', os.path.abspath(__file__)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        line = next(line for line in output.splitlines() if line.startswith(_RESULT_PREFIX))
+        samples.append(json.loads(line[len(_RESULT_PREFIX):]))
+
+    results = {}
+    for key in ('import_s', 'register_s', 'unregister_s'):
+        values = [sample[key] for sample in samples]
+        results[key] = {'min': min(values), 'mean': sum(values) / len(values)}
+    return results
+
+
+if __name__ == '__main__':
+    args = script_args()
+    if '--runs' in args:
+        print_results('Addon startup', bench_startup(int(args[args.index('--runs') + 1])))
+    else:
+        print(_RESULT_PREFIX + json.dumps(bench_startup_once()))
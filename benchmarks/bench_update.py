@@ -0,0 +1,152 @@
+"""Release check & update against a local HTTP server serving fake releases.
+
+The server serves a github-like releases JSON, the release zip, a files manifest and the files.
+The update installs into a temporary fake addon directory, never into this repository.
+
+- check_cold_s: first check, full response parsed
+- check_revalidate_s: next checks, conditional requests answered 304
+- update_full_s: download, verify, extract & swap the whole release zip
+- update_delta_s: download only the changed files listed in the files manifest
+
+`blender -b --factory-startup --python benchmarks/bench_update.py -- [repeat]`
+"""
+
+import functools
+import hashlib
+import http.server
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _common import import_addon, script_args, print_results
+
+# Fake addon files: count & size in bytes
+_FILES = 200
+_FILE_SIZE = 16 * 1024
+_ADDON_DIRNAME = 'fake_addon'
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _write_addon(dirpath: Path, version: int) -> None:
+    """Write the fake addon files, half of them change with the version."""
+    for i in range(_FILES):
+        filepath = dirpath / f'module_{i // 20}' / f'file_{i}.py'
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        seed = f'{i}-{version if i % 2 else 0}'.encode()
+        filepath.write_bytes(hashlib.sha256(seed).digest() * (_FILE_SIZE // 32))
+
+
+def _make_release(root: Path, url: str, with_manifest: bool) -> None:
+    """Write the served files: releases JSON, release zip, files manifest & files."""
+    files = root / 'files' / _ADDON_DIRNAME
+    _write_addon(files, version=2)
+
+    archive = root / 'tm_landscape_generator_3.6.zip'
+    with zipfile.ZipFile(archive, mode='w') as z:
+        for filepath in files.rglob('*'):
+            z.write(filepath, filepath.relative_to(files.parent))
+    digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+
+    assets = [{
+        'name'                  : archive.name,
+        'browser_download_url'  : f'{url}/{archive.name}',
+        'size'                  : archive.stat().st_size,
+        'digest'                : f'sha256:{digest}',
+    }]
+    if with_manifest:
+        manifest = {
+            'base_url'  : f'{url}/files/{_ADDON_DIRNAME}/',
+            'files'     : {
+                filepath.relative_to(files).as_posix(): {
+                    'size'  : filepath.stat().st_size,
+                    'sha256': hashlib.sha256(filepath.read_bytes()).hexdigest(),
+                }
+                for filepath in files.rglob('*') if filepath.is_file()
+            },
+        }
+        (root / 'files_manifest.json').write_text(json.dumps(manifest))
+        assets.append({'name': 'files_manifest.json', 'browser_download_url': f'{url}/files_manifest.json'})
+
+    releases = [{'tag_name': 'v99.0.0', 'prerelease': False, 'assets': assets}]
+    (root / 'releases.json').write_text(json.dumps(releases))
+
+
+def _time_update(AddonUpdate, tmp: Path, repeat: int) -> float:
+    durations = []
+    for i in range(repeat):
+        install = tmp / f'install_{i}'
+        addon_path = install / _ADDON_DIRNAME
+        _write_addon(addon_path, version=1)
+
+        AddonUpdate.update_successful = False
+        start = time.perf_counter()
+        AddonUpdate.do_update(addon_path=addon_path)
+        durations.append(time.perf_counter() - start)
+        if not AddonUpdate.update_successful:
+            raise RuntimeError('Update failed, see the logs')
+        shutil.rmtree(install)
+    return min(durations)
+
+
+def bench_update(repeat: int = 5) -> dict:
+    addon = import_addon()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = tmp / 'www'
+        root.mkdir()
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_QuietHandler, directory=str(root)))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        cache_filepath = str(tmp / 'releases_cache.json')
+
+        class BenchAddonUpdate(addon.utils.update.AddonUpdate):
+            url_releases = f'{url}/releases.json'
+
+            @classmethod
+            def get_cache_filepath(cls) -> str:
+                return cache_filepath
+
+        try:
+            _make_release(root, url, with_manifest=False)
+            start = time.perf_counter()
+            BenchAddonUpdate.check_for_new_release()
+            results['check_cold_s'] = time.perf_counter() - start
+
+            durations = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                BenchAddonUpdate.check_for_new_release()
+                durations.append(time.perf_counter() - start)
+            results['check_revalidate_s'] = min(durations)
+
+            results['update_full_s'] = _time_update(BenchAddonUpdate, tmp, repeat)
+
+            shutil.rmtree(root / 'files')
+            _make_release(root, url, with_manifest=True)
+            os.remove(cache_filepath)
+            BenchAddonUpdate.check_for_new_release()
+            results['update_delta_s'] = _time_update(BenchAddonUpdate, tmp, repeat)
+        finally:
+            server.shutdown()
+            server.server_close()
+            addon.utils.update.close_session()
+
+    return results
+
+
+if __name__ == '__main__':
+    args = script_args()
+    print_results('Release check & update', bench_update(int(args[0]) if args else 5))
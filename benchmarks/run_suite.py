@@ -0,0 +1,134 @@
+"""Benchmark suite of the addon hot paths, compared to a baseline to catch regressions.
+
+`blender -b --factory-startup --python benchmarks/run_suite.py -- [options]`
+
+Option | Use
+:---|:---
+`--baseline FILE`   | Baseline JSON, `benchmarks/baseline.json` by default
+`--save-baseline`   | Write the results as the new baseline instead of comparing
+`--threshold PCT`   | Regression tolerance in percent, 10 by default
+`--repeat N`        | Runs per measure, the best one is kept, 5 by default
+`--output FILE`     | Also write the results JSON there
+
+Blender exits with code 1 when a metric regressed by more than the threshold.
+Baselines depend on the machine: save one before a change, compare after it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _common import import_addon, script_args, print_results
+from bench_assets import bench_assets
+from bench_logging import bench_logging
+from bench_update import bench_update
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Metrics are durations (lower is better) unless their name ends with one of these
+_HIGHER_IS_BETTER = ('_per_s', '_speedup')
+
+
+def bench_register(repeat: int) -> dict:
+    """Register & unregister the addon several times, after a first warm-up cycle."""
+    addon = import_addon()
+    addon.register()
+    addon.unregister()
+
+    register, unregister = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        addon.register()
+        register.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        addon.unregister()
+        unregister.append(time.perf_counter() - start)
+    return {'register_s': min(register), 'unregister_s': min(unregister)}
+
+
+def run_suite(repeat: int) -> dict[str, float]:
+    """Run every benchmark, return the metrics by "<bench>.<metric>" name."""
+    benches = {
+        'startup'   : lambda: bench_register(repeat),
+        'assets'    : lambda: bench_assets(repeat),
+        'logging'   : lambda: bench_logging(),
+        'update'    : lambda: bench_update(repeat),
+    }
+    metrics = {}
+    for bench_name, bench in benches.items():
+        results = bench()
+        print_results(bench_name, results)
+        metrics.update({f'{bench_name}.{name}': value for name, value in results.items() if isinstance(value, (int, float))})
+    return metrics
+
+
+def get_regression(name: str, value: float, baseline: float) -> float:
+    """Return how much worse the value is than the baseline, in percent (negative if better)."""
+    if baseline == 0:
+        return 0.0
+    if name.endswith(_HIGHER_IS_BETTER):
+        return (baseline - value) / baseline * 100
+    return (value - baseline) / baseline * 100
+
+
+def compare(metrics: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Print the comparison table, return the names of the metrics regressed over the threshold."""
+    regressed = []
+    print(f'--- Comparison to baseline (threshold {threshold}%) ---')
+    for name, value in metrics.items():
+        if name not in baseline:
+            print(f'  {name:40} {value:12.6g}  (new)')
+            continue
+        regression = get_regression(name, value, baseline[name])
+        status = 'REGRESSED' if regression > threshold else 'ok'
+        if regression > threshold:
+            regressed.append(name)
+        print(f'  {name:40} {value:12.6g}  baseline {baseline[name]:12.6g}  {regression:+7.1f}%  {status}')
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='run_suite.py', description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=10.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    args = parser.parse_args(script_args())
+
+    import bpy
+    metrics = run_suite(args.repeat)
+    document = {
+        'blender'   : bpy.app.version_string,
+        'platform'  : platform.platform(),
+        'python'    : platform.python_version(),
+        'metrics'   : metrics,
+    }
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as f:
+            json.dump(document, f, indent=1)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, mode='w', encoding='utf-8') as f:
+            json.dump(document, f, indent=1)
+        print(f'Baseline saved to "{args.baseline}"')
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('blender') != document['blender'] or baseline.get('platform') != document['platform']:
+        print('Warning: the baseline was measured with another blender or platform')
+
+    regressed = compare(metrics, baseline['metrics'], args.threshold)
+    if regressed:
+        print(f'{len(regressed)} metrics regressed: {", ".join(regressed)}')
+        sys.exit(1)
+    print('No regression')
+
+
+if __name__ == '__main__':
+    main()
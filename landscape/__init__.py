@@ -0,0 +1,339 @@
+"""Landscape grid generation from the route, see `heightfield` for the heights computation.
+
+Function | Use
+:---|:---
+get_grid_spec(props, lod)   | Return the grid spec of the scene properties, at the current or given level of detail
+get_height_params(props)    | Return the heights parameters of the scene properties
+get_route_objects(props)    | Return the mesh objects of the route collection
+ensure_landscape_object(context) | Return the landscape object with the mesh of the level of detail, (re)building its grid if needed
+generate(context)           | Compute & write the whole landscape heights
+final_resolution(context)   | Context manager switching to the final level of detail, e.g. for bake & export
+evaluated_objects(context, objects) | Context manager evaluating the objects at the final level of detail, even if hidden
+update_tiles(context, tiles)    | Compute & write the heights of some tiles only
+on_depsgraph(names)         | Regenerate the dirty tiles after route updates (see `tiles`)
+on_scene_changed(items)     | Forget the tracked route of the previous file or scene
+shutdown()                  | Forget the tracked route & stop the worker processes
+
+This package imports numpy & starts worker processes: the addon imports it lazily,
+at the first use of an operator, panel or auto update (see the addon `register()`).
+"""
+
+import contextlib
+import hashlib
+import math
+import time
+
+import bpy
+import numpy as np
+
+from .. import assets
+from ..properties.properties import BLOCK_SIZE
+from ..utils import logs
+from ..utils import tracing
+from . import backend
+from . import cache
+from . import heightfield
+from . import mesh
+from . import tiles
+from .heightfield import GridSpec, HeightParams, Window
+
+log = logs.get_logger(__name__)
+
+LANDSCAPE_NAME = 'Landscape'
+
+# Mesh custom property storing the key of the route & parameters the heights were generated from
+ROUTE_PROPERTY = 'tmlg_route'
+
+
+def get_grid_spec(props, lod: str | None = None) -> GridSpec:
+    """The grid starts at the map origin and covers grid_blocks * grid_blocks trackmania blocks.
+
+    The preview level of detail uses preview_subdivisions instead of grid_subdivisions."""
+    lod = lod or props.lod_mode
+    subdivisions = props.preview_subdivisions if lod == 'PREVIEW' else props.grid_subdivisions
+    cells = props.grid_blocks * subdivisions
+    return GridSpec(
+        origin_x=0.0,
+        origin_y=0.0,
+        step=BLOCK_SIZE / subdivisions,
+        nx=cells + 1,
+        ny=cells + 1,
+    )
+
+
+def get_height_params(props) -> HeightParams:
+    return HeightParams(
+        base_height=props.base_height,
+        influence_radius=props.influence_radius,
+        route_offset=props.route_offset,
+    )
+
+
+def get_route_objects(props) -> list[bpy.types.Object]:
+    if props.route_collection is None:
+        return []
+    return [
+        obj for obj in props.route_collection.all_objects
+        if obj.type == 'MESH' and obj != props.landscape_object
+    ]
+
+
+def _get_lod_mesh(props, current_mesh: bpy.types.Mesh | None) -> bpy.types.Mesh:
+    """Return the mesh of the current level of detail, each level keeps its own mesh.
+
+    A new level mesh gets the materials of the current landscape mesh."""
+    attr = 'preview_mesh' if props.lod_mode == 'PREVIEW' else 'final_mesh'
+    lod_mesh = getattr(props, attr)
+    if lod_mesh is None:
+        if current_mesh is not None and current_mesh not in (props.preview_mesh, props.final_mesh):
+            lod_mesh = current_mesh # landscape mesh without level of detail yet
+        else:
+            lod_mesh = bpy.data.meshes.new(f'{LANDSCAPE_NAME}_{props.lod_mode.lower()}')
+            for material in current_mesh.materials if current_mesh else ():
+                lod_mesh.materials.append(material)
+        setattr(props, attr, lod_mesh)
+    return lod_mesh
+
+
+def ensure_landscape_object(context: bpy.types.Context) -> bpy.types.Object:
+    """Return the landscape object, created in the landscape collection if missing.
+
+    It uses the mesh of the current level of detail, rebuilt when the grid properties changed."""
+    props = context.scene.tmlg_props
+    spec = get_grid_spec(props)
+
+    obj = props.landscape_object
+    if obj is None:
+        obj = bpy.data.objects.new(LANDSCAPE_NAME, _get_lod_mesh(props, None))
+        collection = props.landscape_collection or context.scene.collection
+        collection.objects.link(obj)
+        props.landscape_object = obj
+        log.info(f'Created landscape object "{obj.name}" in "{collection.name}"')
+
+    lod_mesh = _get_lod_mesh(props, obj.data)
+    if obj.data != lod_mesh:
+        obj.data = lod_mesh
+
+    if not mesh.is_grid_mesh(obj.data, spec):
+        with tracing.span('landscape.build_grid'):
+            mesh.build_grid_mesh(obj.data, spec)
+        log.info(f'Built {spec.nx}x{spec.ny} landscape grid ({spec.nx * spec.ny} vertices)')
+    return obj
+
+
+def _get_route_key(points: np.ndarray, params: HeightParams) -> str:
+    h = hashlib.sha1(repr((tuple(params), assets.get_library_version())).encode())
+    h.update(np.ascontiguousarray(points, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+def _write_all(context: bpy.types.Context, obj: bpy.types.Object, points: np.ndarray, depsgraph: bpy.types.Depsgraph) -> None:
+    props = context.scene.tmlg_props
+    spec = get_grid_spec(props)
+    params = get_height_params(props)
+    results = _compute_tiles(points, spec, params, tiles.all_tiles(spec))
+    with tracing.span('landscape.write'):
+        mesh.write_heightfield(obj.data, spec, results)
+    obj.data[ROUTE_PROPERTY] = _get_route_key(points, params)
+    tiles.get_tracker().reset(get_route_objects(props), depsgraph, spec)
+
+
+@tracing.traced('landscape.generate')
+def generate(context: bpy.types.Context) -> bpy.types.Object:
+    """Compute the heights of the whole grid from the route and write them to the landscape mesh."""
+    props = context.scene.tmlg_props
+    start_time = time.perf_counter()
+
+    obj = ensure_landscape_object(context)
+    depsgraph = context.evaluated_depsgraph_get()
+
+    with tracing.span('landscape.read_route'):
+        points = mesh.read_route_points(get_route_objects(props), depsgraph)
+    _write_all(context, obj, points, depsgraph)
+    log.info(f'Generated landscape from {len(points)} route points in {time.perf_counter() - start_time:.3f}s')
+    return obj
+
+
+@contextlib.contextmanager
+def final_resolution(context: bpy.types.Context):
+    """Switch the landscape to the final level of detail for the block, e.g. to bake or export it.
+
+    The previous level is restored after, its mesh is kept so switching back is cheap."""
+    props = context.scene.tmlg_props
+    previous_mode = props.lod_mode
+    if previous_mode != 'FINAL':
+        props.lod_mode = 'FINAL' # updates the heights if needed, see set_lod()
+    try:
+        yield
+    finally:
+        if props.lod_mode != previous_mode:
+            props.lod_mode = previous_mode
+
+
+@contextlib.contextmanager
+def evaluated_objects(context: bpy.types.Context, objects: list[bpy.types.Object]):
+    """Switch to the final level of detail & yield the evaluated depsgraph, with the modifiers of the objects applied.
+
+    Objects disabled in viewports (e.g. the sources of a bake) aren't in the depsgraph,
+    they are enabled while the context is open."""
+    hidden = [obj for obj in objects if obj.hide_viewport]
+    for obj in hidden:
+        obj.hide_viewport = False
+    try:
+        with final_resolution(context):
+            yield context.evaluated_depsgraph_get()
+    finally:
+        for obj in hidden:
+            obj.hide_viewport = True
+
+
+def set_lod(context: bpy.types.Context) -> None:
+    """Switch the landscape object to the mesh of the current level of detail.
+
+    The level mesh is kept as is when it's still the grid of the level & its heights
+    were generated from the current route, else it's regenerated: heights come from
+    the tiles cache when both levels were generated before."""
+    props = context.scene.tmlg_props
+    obj = props.landscape_object
+    if obj is None or props.route_collection is None:
+        return
+    with tracing.span('landscape.set_lod'):
+        spec = get_grid_spec(props)
+        # Checked before ensure_landscape_object() rebuilds the grid
+        is_built = mesh.is_grid_mesh(_get_lod_mesh(props, obj.data), spec)
+        obj = ensure_landscape_object(context)
+        depsgraph = context.evaluated_depsgraph_get()
+        with tracing.span('landscape.read_route'):
+            points = mesh.read_route_points(get_route_objects(props), depsgraph)
+
+        if is_built and obj.data.get(ROUTE_PROPERTY) == _get_route_key(points, get_height_params(props)):
+            tiles.get_tracker().reset(get_route_objects(props), depsgraph, spec)
+            log.info(f'Landscape level of detail: {props.lod_mode.lower()}, kept')
+        else:
+            _write_all(context, obj, points, depsgraph)
+            log.info(f'Landscape level of detail: {props.lod_mode.lower()}, regenerated')
+
+
+def _compute_tiles(
+        points: np.ndarray,
+        spec: GridSpec,
+        params: HeightParams,
+        tile_set: set[tiles.Tile],
+    ) -> list[tuple[Window, np.ndarray, np.ndarray]]:
+    """Return the heights & influence of the tiles windows, read from the cache or computed & cached."""
+    budget = cache.get_budget()
+    if budget == 0:
+        with tracing.span('landscape.compute'):
+            return [(window, *backend.compute(points, spec, params, window)) for window in tiles.merge_windows(tile_set, spec)]
+
+    with tracing.span('landscape.cache.read'):
+        keys = cache.get_tile_keys(points, spec, params, tile_set, salt=assets.get_library_version())
+        results = []
+        missing = set()
+        for tile, key in keys.items():
+            rasters = cache.get(key)
+            if rasters is None:
+                missing.add(tile)
+            else:
+                results.append((tiles.tile_window(tile, spec), rasters[0], rasters[1]))
+
+    for window in tiles.merge_windows(missing, spec):
+        with tracing.span('landscape.compute'):
+            heights, influence = backend.compute(points, spec, params, window)
+        results.append((window, heights, influence))
+
+        with tracing.span('landscape.cache.write'):
+            for tile in missing:
+                tile_window = tiles.tile_window(tile, spec)
+                if tile_window.ix0 >= window.ix0 and tile_window.ix1 <= window.ix1 and tile_window.iy0 >= window.iy0 and tile_window.iy1 <= window.iy1:
+                    crop = (slice(tile_window.iy0 - window.iy0, tile_window.iy1 - window.iy0), slice(tile_window.ix0 - window.ix0, tile_window.ix1 - window.ix0))
+                    cache.put(keys[tile], np.stack((heights[crop], influence[crop])))
+
+    if len(missing) > 0:
+        cache.evict(budget)
+    log.debug(f'Landscape tiles: {len(keys) - len(missing)} cached, {len(missing)} computed')
+    return results
+
+
+def _window_bounds(window: Window, spec: GridSpec) -> tiles.Bounds:
+    """Return the bounds of the points binned into the window vertices."""
+    return tiles.Bounds(
+        spec.origin_x + (window.ix0 - 0.5) * spec.step,
+        spec.origin_y + (window.iy0 - 0.5) * spec.step,
+        spec.origin_x + (window.ix1 - 0.5) * spec.step,
+        spec.origin_y + (window.iy1 - 0.5) * spec.step,
+    )
+
+
+def _overlaps(a: tiles.Bounds, b: tiles.Bounds) -> bool:
+    return a.x0 <= b.x1 and b.x0 <= a.x1 and a.y0 <= b.y1 and b.y0 <= a.y1
+
+
+@tracing.traced('landscape.update_tiles')
+def update_tiles(context: bpy.types.Context, dirty_tiles: set[tiles.Tile]) -> None:
+    """Compute the heights of the tiles and write them to the landscape mesh, in one write.
+
+    Only the route objects whose bounds reach the tiles are read."""
+    props = context.scene.tmlg_props
+    obj = props.landscape_object
+    spec = get_grid_spec(props)
+    params = get_height_params(props)
+    depsgraph = context.evaluated_depsgraph_get()
+
+    # Read the objects around the tiles up to the tiles within the halo, the points the cache keys hash
+    windows = tiles.merge_windows(dirty_tiles, spec)
+    cells = tiles.get_tile_cells(spec)
+    margin = math.ceil(heightfield.halo(spec, params) / cells) * cells
+    reach = [_window_bounds(window.expand(margin, spec), spec) for window in windows]
+    objects = [
+        route_obj for route_obj in get_route_objects(props)
+        if any(_overlaps(tiles.get_object_bounds(route_obj.evaluated_get(depsgraph)), r) for r in reach)
+    ]
+
+    with tracing.span('landscape.read_route'):
+        points = mesh.read_route_points(objects, depsgraph)
+    results = _compute_tiles(points, spec, params, dirty_tiles)
+    with tracing.span('landscape.write'):
+        mesh.write_heightfield(obj.data, spec, results)
+    # Only the points around the tiles were read, the whole route isn't hashed on each update
+    if ROUTE_PROPERTY in obj.data:
+        del obj.data[ROUTE_PROPERTY]
+
+    log.debug(f'Updated {len(dirty_tiles)} landscape tiles from {len(objects)} route objects')
+
+
+#---------------------------------------------------------------------------
+#   Auto update
+#---------------------------------------------------------------------------
+
+def on_depsgraph(names: frozenset) -> None:
+    """Regenerate the tiles around the updated route objects."""
+    context = bpy.context
+    props = context.scene.tmlg_props
+    obj = props.landscape_object
+    if not props.auto_update or obj is None or context.mode != 'OBJECT':
+        return
+
+    spec = get_grid_spec(props)
+    if not mesh.is_grid_mesh(obj.data, spec):
+        return # grid settings changed, needs a full generation
+
+    tracker = tiles.get_tracker()
+    depsgraph = context.evaluated_depsgraph_get()
+    # Reach of a point on the heights: the blur radius in whole cells & the binning to the nearest vertex
+    margin = heightfield.halo(spec, get_height_params(props)) * spec.step
+    tracker.update(names, get_route_objects(props), depsgraph, spec, margin)
+
+    dirty_tiles = tracker.pop_dirty()
+    if len(dirty_tiles) > 0:
+        update_tiles(context, dirty_tiles)
+
+
+def on_scene_changed(items: frozenset) -> None:
+    """The tracked bounds belong to the previous file or scene."""
+    tiles.get_tracker().clear()
+
+
+def shutdown() -> None:
+    tiles.get_tracker().clear()
+    backend.shutdown()
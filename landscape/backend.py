@@ -0,0 +1,165 @@
+"""Landscape heights execution backend: serial, or split across a pool of worker processes.
+
+Function | Use
+:---|:---
+get_worker_count()      | Return the number of worker processes from the preferences, 1 is serial
+compute(points, spec, params, window) | Compute the window heights & influence, in parallel if worth it
+shutdown()              | Stop the worker processes
+
+Blender's python runs on one core: big windows are split into bands of rows, computed by
+`workers/tmlg_tile_worker.py` in a `ProcessPoolExecutor`. Route points & results go through
+`multiprocessing.shared_memory`, only names, shapes & small tuples are pickled.
+Blender data is never touched by the workers, the caller writes the results to the mesh.
+
+If the pool can't be started or breaks, the computation falls back to serial.
+"""
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..properties import get_prefs
+from ..utils import logs
+from ..utils import tracing
+from . import heightfield
+from .heightfield import GridSpec, HeightParams, Window
+
+log = logs.get_logger(__name__)
+
+# Windows smaller than this vertices count are computed serially, the pool overhead isn't worth it
+MIN_PARALLEL_VERTICES = 128 * 128
+
+# Bands per worker, so faster workers pick more work
+_BANDS_PER_WORKER = 2
+
+_WORKERS_DIRPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'workers')
+
+_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_pool_workers = 0
+
+
+def get_worker_count() -> int:
+    prefs = get_prefs()
+    count = prefs.worker_count if prefs is not None else 1
+    if count == 0:
+        count = max(1, (os.cpu_count() or 1) - 1)
+    return count
+
+
+#---------------------------------------------------------------------------
+#   Pool
+#---------------------------------------------------------------------------
+
+def _get_pool(workers: int) -> concurrent.futures.ProcessPoolExecutor:
+    """Return the pool, (re)started with the workers count."""
+    global _pool, _pool_workers
+    if _pool is not None and _pool_workers != workers:
+        shutdown()
+
+    if _pool is None:
+        # Spawned processes inherit sys.path, so they can unpickle the worker function
+        if _WORKERS_DIRPATH not in sys.path:
+            sys.path.append(_WORKERS_DIRPATH)
+        # Never fork blender: spawn the bundled python (sys.executable)
+        context = multiprocessing.get_context('spawn')
+        _pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _pool_workers = workers
+        log.debug(f'Started landscape pool with {workers} workers')
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        log.debug('Stopped landscape pool')
+    _pool = None
+    _pool_workers = 0
+
+
+#---------------------------------------------------------------------------
+#   Compute
+#---------------------------------------------------------------------------
+
+def _split_rows(window: Window, parts: int) -> list[Window]:
+    rows = math.ceil(window.shape[0] / parts)
+    return [
+        Window(window.ix0, iy0, window.ix1, min(iy0 + rows, window.iy1))
+        for iy0 in range(window.iy0, window.iy1, rows)
+    ]
+
+
+def _compute_parallel(
+        points: np.ndarray,
+        spec: GridSpec,
+        params: HeightParams,
+        window: Window,
+        workers: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    pool = _get_pool(workers)
+    import tmlg_tile_worker # importable once the pool added its directory to sys.path
+    points = points.astype(np.float32, copy=False)
+    points = heightfield.points_in_window(points, spec, window.expand(heightfield.halo(spec, params), spec))
+
+    points_buffer = shared_memory.SharedMemory(create=True, size=max(points.nbytes, 1))
+    out_buffer = shared_memory.SharedMemory(create=True, size=2 * math.prod(window.shape) * 4)
+    shared_points = out = None
+    try:
+        shared_points = np.ndarray(points.shape, dtype=np.float32, buffer=points_buffer.buf)
+        shared_points[:] = points
+
+        futures = [
+            pool.submit(
+                tmlg_tile_worker.compute_window,
+                points_buffer.name,
+                len(points),
+                out_buffer.name,
+                tuple(window),
+                tuple(spec),
+                tuple(params),
+                tuple(band),
+            )
+            for band in _split_rows(window, workers * _BANDS_PER_WORKER)
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+        out = np.ndarray((2,) + window.shape, dtype=np.float32, buffer=out_buffer.buf)
+        heights, influence = out[0].copy(), out[1].copy()
+    finally:
+        shared_points = out = None # release the buffers before closing them
+        points_buffer.close()
+        points_buffer.unlink()
+        out_buffer.close()
+        out_buffer.unlink()
+    return heights, influence
+
+
+@tracing.traced('landscape.backend.compute')
+def compute(
+        points: np.ndarray,
+        spec: GridSpec,
+        params: HeightParams,
+        window: Window | None = None,
+        workers: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the heights & influence (h, w) rasters of the window, same results as `heightfield.compute_heightfield`.
+
+    Workers defaults to the preferences worker count."""
+    window = window or heightfield.full_window(spec)
+    if workers is None:
+        workers = get_worker_count()
+
+    if workers > 1 and math.prod(window.shape) >= MIN_PARALLEL_VERTICES:
+        try:
+            return _compute_parallel(points, spec, params, window, workers)
+        except (OSError, RuntimeError, ImportError): # BrokenProcessPool is a RuntimeError
+            log.exception('Landscape pool failed, computing serially')
+            shutdown()
+
+    return heightfield.compute_heightfield(points, spec, params, window)
@@ -0,0 +1,152 @@
+"""Bake of the evaluated landscape into static tile objects, identical tiles sharing one mesh.
+
+Function | Use
+:---|:---
+extract_chunk(arrays, polygons, tile, spec) | Return the tile geometry moved to its origin, & the origin
+get_chunk_key(arrays)   | Return the hash of a tile geometry, positioned at its origin
+bake(context, hide_sources) | Replace the landscape objects by baked tile objects, return the BakeReport
+
+Each tile geometry is moved to its origin (tile corner & lowest vertex) before hashing,
+so flat fill tiles, or identical slopes at other heights, get the same key: tile objects
+with the same key link the same mesh datablock, placed by their location.
+Chunk meshes are kept by key between bakes, unchanged tiles reuse them.
+
+Hiding the source objects stops the evaluation of their node trees.
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass
+
+import bpy
+import numpy as np
+
+from ..utils import logs
+from ..utils import tracing
+from . import LANDSCAPE_NAME, evaluated_objects, get_grid_spec
+from . import mesh
+from . import modifiers
+from . import tiles
+from .heightfield import GridSpec
+from .mesh import MeshArrays
+
+log = logs.get_logger(__name__)
+
+# Mesh custom property storing the chunk key of the baked meshes
+CHUNK_PROPERTY = 'tmlg_chunk'
+
+# Quantization steps of the hashed values: coordinates (m), normals & UVs
+_CO_PRECISION = 1e-4
+_NORMAL_PRECISION = 1e-3
+_UV_PRECISION = 1e-5
+
+
+@dataclass
+class BakeReport:
+    """Result of bake(): tile objects, distinct meshes, new meshes & duration in seconds."""
+    tile_count: int = 0
+    mesh_count: int = 0
+    created_count: int = 0
+    duration: float = 0.0
+
+    def __str__(self) -> str:
+        return f'{self.tile_count} tiles, {self.mesh_count} meshes ({self.created_count} new) in {self.duration:.2f}s'
+
+
+def _quantize(values: np.ndarray, precision: float) -> bytes:
+    return np.round(values / precision).astype(np.int64).tobytes()
+
+
+def get_chunk_key(arrays: MeshArrays) -> str:
+    """Return the hash of the geometry, equal for geometries equal up to the quantization."""
+    h = hashlib.sha1()
+    h.update(_quantize(arrays.co, _CO_PRECISION))
+    h.update(arrays.corner_vertices.astype(np.int32).tobytes())
+    h.update(arrays.loop_total.astype(np.int32).tobytes())
+    h.update(_quantize(arrays.normals, _NORMAL_PRECISION))
+    if arrays.uv is not None:
+        h.update(_quantize(arrays.uv, _UV_PRECISION))
+    # Materials by name, in the slots order the mesh would get
+    used, material_index = np.unique(arrays.material_index, return_inverse=True)
+    h.update(material_index.astype(np.int32).tobytes())
+    h.update(repr([arrays.materials[i].name if arrays.materials[i] else None for i in used]).encode())
+    return h.hexdigest()
+
+
+def extract_chunk(
+        arrays: MeshArrays,
+        polygons: np.ndarray,
+        tile: tiles.Tile,
+        spec: GridSpec,
+    ) -> tuple[MeshArrays, tuple[float, float, float]]:
+    """Return the geometry of the tile polygons relative to the tile corner & lowest vertex, and that origin."""
+    tile_arrays = mesh.extract_polygons(arrays, polygons)
+    origin_x, origin_y = tiles.get_tile_origin(tile, spec)
+    origin_z = float(tile_arrays.co[:, 2].min())
+    co = tile_arrays.co - np.array((origin_x, origin_y, origin_z), dtype=np.float32)
+    return tile_arrays._replace(co=co), (origin_x, origin_y, origin_z)
+
+
+def _ensure_bake_collection(context: bpy.types.Context) -> bpy.types.Collection:
+    props = context.scene.tmlg_props
+    collection = props.bake_collection
+    if collection is None:
+        collection = bpy.data.collections.new(f'{LANDSCAPE_NAME}_baked')
+        context.scene.collection.children.link(collection)
+        props.bake_collection = collection
+    return collection
+
+
+@tracing.traced('landscape.bake')
+def bake(context: bpy.types.Context, hide_sources: bool = True) -> BakeReport:
+    """Replace the objects of the bake collection by one static object per tile of the evaluated landscape."""
+    props = context.scene.tmlg_props
+    report = BakeReport()
+    start = time.perf_counter()
+
+    collection = _ensure_bake_collection(context)
+    baked = set(collection.all_objects)
+    sources = [obj for obj in modifiers.get_landscape_objects(props) if obj.type == 'MESH' and obj not in baked]
+    # Sources hidden by a previous bake are evaluated too
+    with evaluated_objects(context, sources) as depsgraph:
+        spec = get_grid_spec(props)
+        with tracing.span('landscape.bake.read'):
+            arrays = mesh.read_geometry(sources, depsgraph)
+
+    for obj in list(collection.objects):
+        bpy.data.objects.remove(obj)
+    chunk_meshes = {m[CHUNK_PROPERTY]: m for m in bpy.data.meshes if CHUNK_PROPERTY in m}
+
+    used_keys = set()
+    with tracing.span('landscape.bake.tiles'):
+        for tile, polygons in sorted(tiles.split_points(mesh.get_polygon_centers(arrays), spec).items()):
+            tile_arrays, origin = extract_chunk(arrays, polygons, tile, spec)
+            key = get_chunk_key(tile_arrays)
+            chunk = chunk_meshes.get(key)
+            if chunk is None:
+                chunk = bpy.data.meshes.new(f'{LANDSCAPE_NAME}_chunk_{key[:8]}')
+                mesh.write_geometry(chunk, tile_arrays)
+                chunk[CHUNK_PROPERTY] = key
+                chunk_meshes[key] = chunk
+                report.created_count += 1
+            used_keys.add(key)
+
+            obj = bpy.data.objects.new(f'{LANDSCAPE_NAME}_{tile[0]:02d}_{tile[1]:02d}', chunk)
+            obj.location = origin
+            collection.objects.link(obj)
+            report.tile_count += 1
+
+    # Chunks of the previous bake no tile uses anymore
+    for key, chunk in chunk_meshes.items():
+        if key not in used_keys and chunk.users == 0:
+            bpy.data.meshes.remove(chunk)
+
+    if hide_sources:
+        for obj in sources:
+            obj.hide_viewport = True
+            obj.hide_render = True
+
+    report.mesh_count = len(used_keys)
+    report.duration = time.perf_counter() - start
+    log.info(f'Baked landscape: {report}')
+    return report
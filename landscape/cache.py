@@ -0,0 +1,186 @@
+"""Content-addressed cache of the tiles heights & influence, as memory-mapped .npy files.
+
+Function | Use
+:---|:---
+get_budget()        | Return the disk budget (bytes) from the preferences, 0 if the cache is disabled
+get_tile_keys(points, spec, params, tiles, salt) | Return the cache key of each tile
+get(key)            | Return the memory-mapped (2, h, w) rasters of a key, None if not cached
+put(key, rasters)   | Store the (2, h, w) rasters of a key
+evict(budget)       | Delete the least recently used files over the disk budget (bytes)
+clear()             | Delete every cached file
+
+A tile key hashes everything its heights depend on: the route points around the tile,
+the tile window, the grid spec, the heights parameters & a salt (e.g. the assets library version).
+So a key never needs to be invalidated, changed inputs give a new key.
+
+Recently used files are tracked with their mtime, touched on each hit.
+"""
+
+import hashlib
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from ..properties import get_prefs
+from ..utils import logs
+from ..utils import path
+from . import heightfield
+from . import tiles
+from .heightfield import GridSpec, HeightParams
+
+log = logs.get_logger(__name__)
+
+# Change it when the heights kernel changes, to ignore the previous results
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.npy'
+
+# Cached files by key: (size in bytes, last use time), loaded from the cache directory on first use
+_index: dict[str, tuple[int, float]] | None = None
+
+
+def get_budget() -> int:
+    prefs = get_prefs()
+    return prefs.tile_cache_size * 2**20 if prefs is not None else 0
+
+
+def get_cache_dirpath() -> Path:
+    return path.get_user_cache_path() / 'tiles'
+
+
+def _get_filepath(key: str) -> Path:
+    return get_cache_dirpath() / f'{key}{CACHE_SUFFIX}'
+
+
+def _get_index() -> dict[str, tuple[int, float]]:
+    global _index
+    if _index is None:
+        _index = {}
+        dirpath = get_cache_dirpath()
+        if dirpath.is_dir():
+            for entry in os.scandir(dirpath):
+                if entry.name.endswith(CACHE_SUFFIX):
+                    stat = entry.stat()
+                    _index[entry.name[:-len(CACHE_SUFFIX)]] = (stat.st_size, stat.st_mtime)
+    return _index
+
+
+#---------------------------------------------------------------------------
+#   Keys
+#---------------------------------------------------------------------------
+
+def get_tile_keys(
+        points: np.ndarray,
+        spec: GridSpec,
+        params: HeightParams,
+        tile_set: Iterable[tiles.Tile],
+        salt: str = '',
+    ) -> dict[tiles.Tile, str]:
+    """Return the key of each tile.
+
+    Points are sorted by tile once, each tile hashes the points of the tiles within the heights halo."""
+    cells = tiles.get_tile_cells(spec)
+    n_ty, n_tx = tiles.get_tiles_shape(spec)
+    reach = math.ceil(heightfield.halo(spec, params) / cells)
+
+    # Same bounds as the points used for the full grid
+    points = heightfield.points_in_window(points, spec, heightfield.full_window(spec))
+    tile_size = cells * spec.step
+    tx = np.clip(np.floor((points[:, 0] - spec.origin_x + 0.5 * spec.step) / tile_size), 0, n_tx - 1).astype(np.int64)
+    ty = np.clip(np.floor((points[:, 1] - spec.origin_y + 0.5 * spec.step) / tile_size), 0, n_ty - 1).astype(np.int64)
+    flat = ty * n_tx + tx
+    order = np.argsort(flat, kind='stable')
+    sorted_points = np.ascontiguousarray(points[order], dtype=np.float32)
+    bounds = np.searchsorted(flat[order], np.arange(n_tx * n_ty + 1))
+
+    chunk_digests = {}
+    def chunk_digest(i: int) -> bytes:
+        digest = chunk_digests.get(i)
+        if digest is None:
+            digest = chunk_digests[i] = hashlib.sha1(sorted_points[bounds[i]:bounds[i + 1]].tobytes()).digest()
+        return digest
+
+    header = repr((CACHE_VERSION, tuple(spec), tuple(params), salt)).encode()
+    keys = {}
+    for tile in tile_set:
+        h = hashlib.sha256(header)
+        h.update(repr(tile).encode())
+        for ny in range(max(tile[1] - reach, 0), min(tile[1] + reach, n_ty - 1) + 1):
+            for nx in range(max(tile[0] - reach, 0), min(tile[0] + reach, n_tx - 1) + 1):
+                h.update(chunk_digest(ny * n_tx + nx))
+        keys[tile] = h.hexdigest()
+    return keys
+
+
+#---------------------------------------------------------------------------
+#   Files
+#---------------------------------------------------------------------------
+
+def get(key: str) -> np.ndarray | None:
+    """Return the read-only memory-mapped rasters of the key, None if not cached."""
+    index = _get_index()
+    if key not in index:
+        return None
+
+    filepath = _get_filepath(key)
+    try:
+        rasters = np.load(filepath, mmap_mode='r')
+        os.utime(filepath)
+    except (OSError, ValueError):
+        log.debug(f'Dropped unreadable cached tile {key}')
+        del index[key]
+        return None
+    index[key] = (index[key][0], os.stat(filepath).st_mtime)
+    return rasters
+
+
+def put(key: str, rasters: np.ndarray) -> None:
+    """Store the rasters, written to a temporary file then renamed so readers never see a partial file."""
+    dirpath = get_cache_dirpath()
+    dirpath.mkdir(parents=True, exist_ok=True)
+    filepath = _get_filepath(key)
+    fd, tmp_filepath = tempfile.mkstemp(dir=dirpath, suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode='wb') as f:
+            np.save(f, np.ascontiguousarray(rasters, dtype=np.float32))
+        os.replace(tmp_filepath, filepath)
+    except OSError:
+        log.exception(f'Failed to cache tile {key}')
+        Path(tmp_filepath).unlink(missing_ok=True)
+        return
+    stat = os.stat(filepath)
+    _get_index()[key] = (stat.st_size, stat.st_mtime)
+
+
+def evict(budget: int) -> int:
+    """Delete the least recently used files until the cache fits in the budget (bytes).
+
+    Return the number of deleted files."""
+    index = _get_index()
+    total = sum(size for size, _ in index.values())
+    if total <= budget:
+        return 0
+
+    deleted = 0
+    for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+        if total <= budget:
+            break
+        _get_filepath(key).unlink(missing_ok=True)
+        del index[key]
+        total -= size
+        deleted += 1
+    log.debug(f'Evicted {deleted} cached tiles, {total / 2**20:.1f} MiB left')
+    return deleted
+
+
+def clear() -> None:
+    global _index
+    dirpath = get_cache_dirpath()
+    if dirpath.is_dir():
+        for entry in os.scandir(dirpath):
+            if entry.name.endswith((CACHE_SUFFIX, '.tmp')):
+                os.unlink(entry.path)
+    _index = None
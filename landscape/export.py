@@ -0,0 +1,131 @@
+"""Streaming export of the evaluated landscape for NadeoImporter, one FBX file per distinct tile.
+
+Function | Use
+:---|:---
+get_chunk_filename(prefix, key) | Return the file name of a chunk
+export_tiles(context, dirpath, prefix) | Export the landscape objects at the final level of detail, return the ExportReport
+
+The evaluated geometry of the landscape objects is read once, with one `foreach_get` per array
+(see `mesh.read_geometry`), and its polygons are binned by tile from their centers.
+Each tile is moved to its origin & hashed like the bake does (see `bake.extract_chunk`):
+identical tiles, e.g. flat fills, are written once and become a single item in the map.
+New chunks are encoded & written by a pool of threads (see `fbx`): at most 2 chunks per thread
+are in flight, so the memory holds the landscape arrays & a few chunks, whatever the number of tiles.
+
+`<prefix>_tiles.json` lists the chunk files and the placement of each tile: its chunk file
+& its origin (blender coordinates, Z up).
+"""
+
+import collections
+import concurrent.futures
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+import bpy
+import numpy as np
+
+from ..utils import logs
+from ..utils import tracing
+from . import LANDSCAPE_NAME, evaluated_objects, get_grid_spec
+from . import backend
+from . import bake
+from . import fbx
+from . import mesh
+from . import modifiers
+from . import tiles
+from .mesh import MeshArrays
+
+log = logs.get_logger(__name__)
+
+# Chunks in flight per thread, extracted but not written yet
+_CHUNKS_PER_THREAD = 2
+
+
+@dataclass
+class ExportReport:
+    """Result of export_tiles(): manifest entries of the written chunks & of the tiles, duration in seconds."""
+    chunks: list[dict] = field(default_factory=list)
+    tiles: list[dict] = field(default_factory=list)
+    manifest_filepath: str = ''
+    duration: float = 0.0
+
+    @property
+    def polygon_count(self) -> int:
+        return sum(entry['polygons'] for entry in self.chunks)
+
+    def __str__(self) -> str:
+        return f'{len(self.tiles)} tiles, {len(self.chunks)} files, {self.polygon_count} polygons in {self.duration:.2f}s'
+
+
+def get_chunk_filename(prefix: str, key: str) -> str:
+    return f'{prefix}_{key[:12]}.fbx'
+
+
+def _write_chunk(filepath: str, name: str, arrays: MeshArrays, tile_size: float) -> dict:
+    """Encode & write a chunk, return its manifest entry. Runs in the export threads."""
+    # Top view of the tile, landscape polygons don't overlap from above
+    lightmap_uv = np.clip(arrays.co[arrays.corner_vertices, :2] / tile_size, 0.0, 1.0)
+    material_names = fbx.write_mesh(filepath, name, arrays, lightmap_uv)
+    return {
+        'file'      : os.path.basename(filepath),
+        'vertices'  : len(arrays.co),
+        'polygons'  : len(arrays.loop_start),
+        'materials' : material_names,
+    }
+
+
+@tracing.traced('landscape.export_tiles')
+def export_tiles(context: bpy.types.Context, dirpath: str, prefix: str = LANDSCAPE_NAME) -> ExportReport:
+    """Write the evaluated landscape objects as one FBX file per distinct tile, and the tiles manifest."""
+    props = context.scene.tmlg_props
+    report = ExportReport()
+    start = time.perf_counter()
+    fbx.init()
+
+    # Landscape objects hidden by a bake are exported with their modifiers too
+    objects = [obj for obj in modifiers.get_landscape_objects(props) if obj.type == 'MESH']
+    with evaluated_objects(context, objects) as depsgraph:
+        spec = get_grid_spec(props)
+        with tracing.span('landscape.export.read'):
+            arrays = mesh.read_geometry(objects, depsgraph)
+
+    with tracing.span('landscape.export.split'):
+        tile_polygons = tiles.split_points(mesh.get_polygon_centers(arrays), spec)
+
+    os.makedirs(dirpath, exist_ok=True)
+    tile_size = tiles.get_tile_cells(spec) * spec.step
+    workers = backend.get_worker_count()
+    written = set()
+    with tracing.span('landscape.export.write'):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tmlg_export') as executor:
+            pending = collections.deque()
+            for tile, polygons in sorted(tile_polygons.items()):
+                chunk_arrays, origin = bake.extract_chunk(arrays, polygons, tile, spec)
+                filename = get_chunk_filename(prefix, bake.get_chunk_key(chunk_arrays))
+                report.tiles.append({'tile': list(tile), 'file': filename, 'origin': list(origin)})
+                if filename in written:
+                    continue
+                written.add(filename)
+
+                if len(pending) >= _CHUNKS_PER_THREAD * workers:
+                    report.chunks.append(pending.popleft().result())
+                pending.append(executor.submit(
+                    _write_chunk, os.path.join(dirpath, filename), filename[:-len('.fbx')], chunk_arrays, tile_size,
+                ))
+            report.chunks.extend(future.result() for future in pending)
+
+    report.manifest_filepath = os.path.join(dirpath, f'{prefix}_tiles.json')
+    with open(report.manifest_filepath, mode='w', encoding='utf-8') as f:
+        json.dump({
+            'grid'      : list(spec),
+            'tile_size' : tile_size,
+            'up_axis'   : 'Y',
+            'chunks'    : report.chunks,
+            'tiles'     : report.tiles,
+        }, f, indent=1)
+
+    report.duration = time.perf_counter() - start
+    log.info(f'Exported landscape to "{dirpath}": {report}')
+    return report
@@ -0,0 +1,232 @@
+"""Binary FBX writer of a single static mesh, as read by NadeoImporter.
+
+Function | Use
+:---|:---
+init()                      | Prepare the encoder, once before writing files
+write_mesh(filepath, name, arrays, lightmap_uv) | Write the MeshArrays as one mesh object with its materials
+
+The container encoding comes from blender's bundled FBX addon (`io_scene_fbx.encode_bin`),
+the document only holds what NadeoImporter reads: the geometry with the "BaseMaterial"
+& "Lightmap" UV layers, the materials (by name) & the model. Arrays are written from numpy buffers,
+no python object per vertex, and compressed with zlib which releases the GIL: files can be written by threads.
+
+Coordinates are converted to the Y up axis of Trackmania, in meters.
+"""
+
+import array
+
+import numpy as np
+
+from .mesh import MeshArrays
+
+FBX_VERSION = 7400
+CREATOR = b'TM Landscape Generator'
+
+# Layer names of the UV maps, as expected by NadeoImporter
+UV_BASE_MATERIAL = b'BaseMaterial'
+UV_LIGHTMAP = b'Lightmap'
+
+# Default name of the polygons without material
+DEFAULT_MATERIAL = 'Default'
+
+# Separator between an object name & its class, "Name::Class" in ASCII FBX
+_NAME_CLASS_SEP = b'\x00\x01'
+
+
+def _encode_bin():
+    from io_scene_fbx import encode_bin # bundled with blender, enabled or not
+    return encode_bin
+
+
+def init() -> None:
+    _encode_bin().init_version(FBX_VERSION)
+
+
+#---------------------------------------------------------------------------
+#   Elements
+#---------------------------------------------------------------------------
+
+def _elem(parent, name: bytes):
+    elem = _encode_bin().FBXElem(name)
+    parent.elems.append(elem)
+    return elem
+
+
+def _int32(parent, name: bytes, value: int) -> None:
+    _elem(parent, name).add_int32(value)
+
+
+def _string(parent, name: bytes, value: bytes) -> None:
+    _elem(parent, name).add_string(value)
+
+
+def _float64_array(parent, name: bytes, values: np.ndarray) -> None:
+    data = array.array('d')
+    data.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    _elem(parent, name).add_float64_array(data)
+
+
+def _int32_array(parent, name: bytes, values: np.ndarray) -> None:
+    data = array.array('i')
+    data.frombytes(np.ascontiguousarray(values, dtype=np.int32).tobytes())
+    _elem(parent, name).add_int32_array(data)
+
+
+def _property(properties, name: bytes, type_name: bytes, label: bytes, *values) -> None:
+    """Add a "P" entry of a Properties70 element, int or float values."""
+    elem = _elem(properties, b'P')
+    for value in (name, type_name, label, b''):
+        elem.add_string(value)
+    for value in values:
+        if isinstance(value, float):
+            elem.add_float64(value)
+        else:
+            elem.add_int32(value)
+
+
+def _object(parent, name: bytes, uid: int, fbx_class: bytes, sub_type: bytes):
+    elem = _elem(parent, name)
+    elem.add_int64(uid)
+    elem.add_string(fbx_class)
+    elem.add_string(sub_type)
+    return elem
+
+
+def _connect(connections, child: int, parent: int) -> None:
+    elem = _elem(connections, b'C')
+    elem.add_string(b'OO')
+    elem.add_int64(child)
+    elem.add_int64(parent)
+
+
+#---------------------------------------------------------------------------
+#   Document
+#---------------------------------------------------------------------------
+
+def _to_y_up(vectors: np.ndarray) -> np.ndarray:
+    """Blender (x, y, z) Z up -> (x, z, -y) Y up."""
+    return np.stack((vectors[:, 0], vectors[:, 2], -vectors[:, 1]), axis=1)
+
+
+def _uv_layer(geometry, index: int, name: bytes, uv: np.ndarray) -> None:
+    layer = _elem(geometry, b'LayerElementUV')
+    layer.add_int32(index)
+    _int32(layer, b'Version', 101)
+    _string(layer, b'Name', name)
+    _string(layer, b'MappingInformationType', b'ByPolygonVertex')
+    _string(layer, b'ReferenceInformationType', b'IndexToDirect')
+    _float64_array(layer, b'UV', uv.ravel())
+    _int32_array(layer, b'UVIndex', np.arange(len(uv), dtype=np.int32))
+
+
+def _layer(geometry, index: int, element_types: tuple[bytes, ...]) -> None:
+    layer = _elem(geometry, b'Layer')
+    layer.add_int32(index)
+    _int32(layer, b'Version', 100)
+    for element_type in element_types:
+        element = _elem(layer, b'LayerElement')
+        _string(element, b'Type', element_type)
+        _int32(element, b'TypedIndex', index)
+
+
+def write_mesh(filepath: str, name: str, arrays: MeshArrays, lightmap_uv: np.ndarray) -> list[str]:
+    """Write the geometry as one mesh object, with the corners (L, 2) lightmap UVs.
+
+    Only the materials used by the polygons are written, return their names."""
+    encode_bin = _encode_bin()
+    name = name.encode()
+
+    # Materials used by the polygons, renumbered
+    used, material_index = np.unique(arrays.material_index, return_inverse=True)
+    material_names = [
+        arrays.materials[i].name if arrays.materials[i] is not None else DEFAULT_MATERIAL
+        for i in used
+    ]
+
+    # Last corner of each polygon is stored as -(index + 1)
+    polygon_vertex_index = arrays.corner_vertices.copy()
+    last = arrays.loop_start + arrays.loop_total - 1
+    polygon_vertex_index[last] = ~polygon_vertex_index[last]
+
+    root = encode_bin.FBXElem(b'')
+    header = _elem(root, b'FBXHeaderExtension')
+    _int32(header, b'FBXHeaderVersion', 1003)
+    _int32(header, b'FBXVersion', FBX_VERSION)
+    _int32(header, b'EncryptionType', 0)
+    _string(header, b'Creator', CREATOR)
+    _elem(root, b'FileId').add_bytes(b'') # both set by encode_bin.write()
+    _string(root, b'CreationTime', b'')
+    _string(root, b'Creator', CREATOR)
+
+    settings = _elem(root, b'GlobalSettings')
+    _int32(settings, b'Version', 1000)
+    properties = _elem(settings, b'Properties70')
+    _property(properties, b'UpAxis', b'int', b'Integer', 1)
+    _property(properties, b'UpAxisSign', b'int', b'Integer', 1)
+    _property(properties, b'FrontAxis', b'int', b'Integer', 2)
+    _property(properties, b'FrontAxisSign', b'int', b'Integer', 1)
+    _property(properties, b'CoordAxis', b'int', b'Integer', 0)
+    _property(properties, b'CoordAxisSign', b'int', b'Integer', 1)
+    _property(properties, b'UnitScaleFactor', b'double', b'Number', 100.0) # centimeters per unit
+
+    definitions = _elem(root, b'Definitions')
+    _int32(definitions, b'Version', 100)
+    _int32(definitions, b'Count', 3 + len(material_names))
+    for object_type, count in ((b'GlobalSettings', 1), (b'Model', 1), (b'Geometry', 1), (b'Material', len(material_names))):
+        definition = _elem(definitions, b'ObjectType')
+        definition.add_string(object_type)
+        _int32(definition, b'Count', count)
+
+    objects = _elem(root, b'Objects')
+    model_id, geometry_id = 1000, 1001
+    geometry = _object(objects, b'Geometry', geometry_id, name + _NAME_CLASS_SEP + b'Geometry', b'Mesh')
+    _float64_array(geometry, b'Vertices', _to_y_up(arrays.co).ravel())
+    _int32_array(geometry, b'PolygonVertexIndex', polygon_vertex_index)
+    _int32(geometry, b'GeometryVersion', 124)
+
+    normals = _elem(geometry, b'LayerElementNormal')
+    normals.add_int32(0)
+    _int32(normals, b'Version', 101)
+    _string(normals, b'Name', b'')
+    _string(normals, b'MappingInformationType', b'ByPolygonVertex')
+    _string(normals, b'ReferenceInformationType', b'Direct')
+    _float64_array(normals, b'Normals', _to_y_up(arrays.normals).ravel())
+
+    base_uv = arrays.uv if arrays.uv is not None else lightmap_uv
+    _uv_layer(geometry, 0, UV_BASE_MATERIAL, base_uv)
+    _uv_layer(geometry, 1, UV_LIGHTMAP, lightmap_uv)
+
+    materials = _elem(geometry, b'LayerElementMaterial')
+    materials.add_int32(0)
+    _int32(materials, b'Version', 101)
+    _string(materials, b'Name', b'')
+    _string(materials, b'MappingInformationType', b'ByPolygon')
+    _string(materials, b'ReferenceInformationType', b'IndexToDirect')
+    _int32_array(materials, b'Materials', material_index.ravel())
+
+    _layer(geometry, 0, (b'LayerElementNormal', b'LayerElementUV', b'LayerElementMaterial'))
+    _layer(geometry, 1, (b'LayerElementUV',))
+
+    model = _object(objects, b'Model', model_id, name + _NAME_CLASS_SEP + b'Model', b'Mesh')
+    _int32(model, b'Version', 232)
+    _elem(model, b'Shading').add_bool(True)
+    _string(model, b'Culling', b'CullingOff')
+
+    material_ids = []
+    for i, material_name in enumerate(material_names):
+        material_id = 2000 + i
+        material = _object(objects, b'Material', material_id, material_name.encode() + _NAME_CLASS_SEP + b'Material', b'')
+        _int32(material, b'Version', 102)
+        _string(material, b'ShadingModel', b'lambert')
+        _int32(material, b'MultiLayer', 0)
+        material_ids.append(material_id)
+
+    # Materials order is the material layer indices order
+    connections = _elem(root, b'Connections')
+    _connect(connections, model_id, 0)
+    _connect(connections, geometry_id, model_id)
+    for material_id in material_ids:
+        _connect(connections, material_id, model_id)
+
+    encode_bin.write(filepath, root, FBX_VERSION)
+    return material_names
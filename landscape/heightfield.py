@@ -0,0 +1,185 @@
+"""Vectorized landscape heightfield kernel.
+
+The landscape is a regular grid of vertices, stored as (ny, nx) rasters (row-major, y then x).
+Heights follow the route where it is close and fall back to the base height far from it:
+
+1. route points are binned into the grid cells (mean height per cell)
+2. route heights are spread around with a normalized box blur
+3. the influence is the route cells dilated by half the radius, then smoothed by a blur
+
+Every step is a whole-array operation, there is no per-vertex python loop.
+Any window of the grid can be computed alone, from the route points around it.
+
+This module must only depend on numpy (no bpy, no relative imports) so it can be imported
+by worker processes.
+"""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+
+class GridSpec(NamedTuple):
+    """Regular grid of nx * ny vertices, spaced by step meters, from origin (x, y)."""
+    origin_x: float
+    origin_y: float
+    step: float
+    nx: int
+    ny: int
+
+    @property
+    def size_x(self) -> float:
+        return (self.nx - 1) * self.step
+
+    @property
+    def size_y(self) -> float:
+        return (self.ny - 1) * self.step
+
+
+class Window(NamedTuple):
+    """Vertex indices range of a grid part: [ix0, ix1[ * [iy0, iy1[."""
+    ix0: int
+    iy0: int
+    ix1: int
+    iy1: int
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.iy1 - self.iy0, self.ix1 - self.ix0)
+
+    @property
+    def slices(self) -> tuple[slice, slice]:
+        """Slices of the window in a (ny, nx) raster."""
+        return (slice(self.iy0, self.iy1), slice(self.ix0, self.ix1))
+
+    def expand(self, margin: int, spec: GridSpec) -> 'Window':
+        """Return the window grown by margin vertices, clamped to the grid."""
+        return Window(
+            max(self.ix0 - margin, 0),
+            max(self.iy0 - margin, 0),
+            min(self.ix1 + margin, spec.nx),
+            min(self.iy1 + margin, spec.ny),
+        )
+
+
+class HeightParams(NamedTuple):
+    base_height: float
+    influence_radius: float
+    route_offset: float
+
+
+def full_window(spec: GridSpec) -> Window:
+    return Window(0, 0, spec.nx, spec.ny)
+
+
+def halo(spec: GridSpec, params: HeightParams) -> int:
+    """Return the number of vertices around a window which influence its heights."""
+    return _radius_cells(spec, params) + 1
+
+
+def _radius_cells(spec: GridSpec, params: HeightParams) -> int:
+    return max(1, math.ceil(params.influence_radius / spec.step))
+
+
+#---------------------------------------------------------------------------
+#   Raster filters
+#---------------------------------------------------------------------------
+
+def box_blur(a: np.ndarray, radius: int) -> np.ndarray:
+    """Separable mean filter of a 2D raster, (2 * radius + 1) wide, zero outside of the raster."""
+    if radius <= 0:
+        return a
+    n = 2 * radius + 1
+    for axis in (0, 1):
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (radius + 1, radius)
+        c = np.cumsum(np.pad(a, pad), axis=axis, dtype=np.float64)
+        if axis == 0:
+            a = c[n:] - c[:-n]
+        else:
+            a = c[:, n:] - c[:, :-n]
+        a = (a / n).astype(np.float32)
+    return a
+
+
+def max_filter(a: np.ndarray, radius: int) -> np.ndarray:
+    """Separable max filter (dilation) of a 2D raster, (2 * radius + 1) wide."""
+    if radius <= 0:
+        return a
+    for axis in (0, 1):
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (radius, radius)
+        padded = np.pad(a, pad)
+        length = a.shape[axis]
+        out = np.take(padded, range(0, length), axis=axis)
+        for k in range(1, 2 * radius + 1):
+            np.maximum(out, np.take(padded, range(k, k + length), axis=axis), out=out)
+        a = out
+    return a
+
+
+#---------------------------------------------------------------------------
+#   Heightfield
+#---------------------------------------------------------------------------
+
+def rasterize_route(points: np.ndarray, spec: GridSpec, window: Window) -> tuple[np.ndarray, np.ndarray]:
+    """Bin route points (N, 3) into the window vertices.
+
+    Return the mean route height & the route mask (1 where points), as (h, w) rasters."""
+    h, w = window.shape
+    ix = np.floor((points[:, 0] - spec.origin_x) / spec.step + 0.5).astype(np.int64) - window.ix0
+    iy = np.floor((points[:, 1] - spec.origin_y) / spec.step + 0.5).astype(np.int64) - window.iy0
+    inside = (ix >= 0) & (ix < w) & (iy >= 0) & (iy < h)
+
+    flat = iy[inside] * w + ix[inside]
+    count = np.bincount(flat, minlength=h * w).reshape(h, w)
+    z_sum = np.bincount(flat, weights=points[inside, 2], minlength=h * w).reshape(h, w)
+
+    mask = (count > 0).astype(np.float32)
+    z_mean = np.divide(z_sum, count, out=np.zeros((h, w), dtype=np.float64), where=count > 0)
+    return z_mean.astype(np.float32), mask
+
+
+def points_in_window(points: np.ndarray, spec: GridSpec, window: Window) -> np.ndarray:
+    """Return the points whose (x, y) fall in the window, vectorized bounding box filter."""
+    x0 = spec.origin_x + (window.ix0 - 0.5) * spec.step
+    y0 = spec.origin_y + (window.iy0 - 0.5) * spec.step
+    x1 = spec.origin_x + (window.ix1 - 0.5) * spec.step
+    y1 = spec.origin_y + (window.iy1 - 0.5) * spec.step
+    x, y = points[:, 0], points[:, 1]
+    return points[(x >= x0) & (x < x1) & (y >= y0) & (y < y1)]
+
+
+def compute_heightfield(
+        points: np.ndarray,
+        spec: GridSpec,
+        params: HeightParams,
+        window: Window | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the heights & route influence (0-1) of the window vertices, as (h, w) float32 rasters.
+
+    Only the points around the window are used, the result doesn't depend on the window bounds."""
+    window = window or full_window(spec)
+    radius = _radius_cells(spec, params)
+    ext = window.expand(halo(spec, params), spec)
+    points = points_in_window(points, spec, ext)
+
+    z_mean, mask = rasterize_route(points, spec, ext)
+
+    # Spread route heights: normalized convolution, so empty cells get the mean of the route around
+    weight = box_blur(mask, radius)
+    z_spread = box_blur(z_mean * mask, radius)
+    has_route = weight > 1e-6
+    route_heights = np.divide(z_spread, weight, out=np.full_like(z_spread, params.base_height), where=has_route)
+    route_heights += params.route_offset
+
+    # Influence: 1 close to the route, smooth falloff to 0 at influence radius
+    half = max(1, radius // 2)
+    influence = box_blur(max_filter(mask, half), half)
+    np.clip(influence, 0.0, 1.0, out=influence)
+
+    heights = params.base_height + influence * (route_heights - params.base_height)
+
+    crop = (slice(window.iy0 - ext.iy0, window.iy1 - ext.iy0), slice(window.ix0 - ext.ix0, window.ix1 - ext.ix0))
+    return heights[crop].astype(np.float32), influence[crop].astype(np.float32)
@@ -0,0 +1,209 @@
+"""Ground materials splat & weight masks, baked from the landscape heightfield into images.
+
+Function | Use
+:---|:---
+get_slope(heights, spec)    | Return the slope angle (radians) of the grid vertices
+compute_splat(proximity, slope, params) | Return the normalized grass, dirt, shoulder & rock weights
+fill_mask(out, kind, rasters, spec, params) | Write a mask into a (r, r, 4) pixels buffer, by chunks of rows
+bake_masks(context)         | Write the masks images of the landscape & link them to the `TM_` materials, return the MasksReport
+
+Masks | Channels
+:---|:---
+`<Landscape>_splat`   | Grass, dirt, road shoulder & rock weights, summing to 1
+`<Landscape>_weights` | Route proximity (the influence), slope (0 flat - 1 vertical), normalized height
+
+Images cover the grid like its UV map. Grid rasters are bilinearly sampled & the weights computed
+CHUNK_ROWS pixel rows at a time, so temporaries stay small for 4K-8K masks;
+each image gets its pixels in a single `foreach_set` & is packed in the file.
+
+In the `TM_` materials, image texture nodes named SPLAT_NODE / WEIGHTS_NODE get the images.
+Materials linked from the assets library are read-only & skipped: append the material
+or make it local to use the masks.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+import bpy
+import numpy as np
+
+from .. import assets
+from ..utils import logs
+from ..utils import tracing
+from . import LANDSCAPE_NAME, final_resolution, generate, get_grid_spec
+from . import mesh
+from .heightfield import GridSpec
+
+log = logs.get_logger(__name__)
+
+# Pixel rows computed at once
+CHUNK_ROWS = 256
+
+# Image texture node names of the `TM_` materials receiving the masks
+SPLAT_NODE = 'tmlg_splat'
+WEIGHTS_NODE = 'tmlg_weights'
+
+# Route proximity bands (influence 0-1) of the dirt & road shoulder
+_DIRT_BAND = (0.3, 0.6)
+_SHOULDER_BAND = (0.7, 0.9)
+
+
+@dataclass
+class MasksReport:
+    """Result of bake_masks(): images, names of the materials receiving them & of the skipped linked ones."""
+    images: list[bpy.types.Image] = field(default_factory=list)
+    materials: list[str] = field(default_factory=list)
+    linked_materials: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return f'{", ".join(image.name for image in self.images)} linked to {len(self.materials)} materials'
+
+
+class MaskParams(NamedTuple):
+    rock_slope: float   # radians, slope where the rock starts
+    rock_blend: float   # radians, rock transition width
+
+
+def get_mask_params(props) -> MaskParams:
+    return MaskParams(rock_slope=props.mask_rock_slope, rock_blend=props.mask_rock_blend)
+
+
+#---------------------------------------------------------------------------
+#   Kernels
+#---------------------------------------------------------------------------
+
+def _smoothstep(edge0: float, edge1: float, x: np.ndarray) -> np.ndarray:
+    t = np.clip((x - edge0) / max(edge1 - edge0, 1e-6), 0.0, 1.0)
+    return t * t * (3.0 - 2.0 * t)
+
+
+def get_slope(heights: np.ndarray, spec: GridSpec) -> np.ndarray:
+    dy, dx = np.gradient(heights.astype(np.float32), spec.step)
+    return np.arctan(np.hypot(dx, dy))
+
+
+def compute_splat(proximity: np.ndarray, slope: np.ndarray, params: MaskParams) -> np.ndarray:
+    """Return the (..., 4) grass, dirt, shoulder & rock weights, summing to 1."""
+    shoulder = _smoothstep(*_SHOULDER_BAND, proximity)
+    dirt = _smoothstep(*_DIRT_BAND, proximity) * (1.0 - shoulder)
+    rock = _smoothstep(params.rock_slope, params.rock_slope + params.rock_blend, slope) * (1.0 - shoulder)
+    grass = np.maximum(1.0 - shoulder - dirt - rock, 0.0)
+
+    splat = np.stack((grass, dirt, shoulder, rock), axis=-1)
+    splat /= np.maximum(splat.sum(axis=-1, keepdims=True), 1e-6)
+    return splat
+
+
+def _sample_axis(n_pixels: int, n_vertices: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the first vertex index & weight of the next one, for each pixel center."""
+    position = (np.arange(n_pixels, dtype=np.float32) + 0.5) / n_pixels * (n_vertices - 1)
+    index = np.minimum(position.astype(np.int64), max(n_vertices - 2, 0))
+    return index, np.clip(position - index, 0.0, 1.0)
+
+
+def _sample_rows(raster: np.ndarray, iy: np.ndarray, fy: np.ndarray, ix: np.ndarray, fx: np.ndarray) -> np.ndarray:
+    """Bilinear samples of the raster at the rows (iy, fy) & columns (ix, fx) pixels.
+
+    Rows are interpolated at the grid width first, then expanded to the pixel columns."""
+    iy1 = np.minimum(iy + 1, raster.shape[0] - 1)
+    ix1 = np.minimum(ix + 1, raster.shape[1] - 1)
+    fy = fy[:, np.newaxis]
+    rows = raster[iy] * (1.0 - fy) + raster[iy1] * fy
+    return rows[:, ix] * (1.0 - fx) + rows[:, ix1] * fx
+
+
+def fill_mask(
+        out: np.ndarray,
+        kind: str,
+        rasters: tuple[np.ndarray, np.ndarray, np.ndarray],
+        spec: GridSpec,
+        params: MaskParams,
+    ) -> None:
+    """Write the 'SPLAT' or 'WEIGHTS' mask of the (heights, influence, slope) grid rasters into the (r, r, 4) buffer."""
+    heights, influence, slope = rasters
+    resolution = out.shape[0]
+    ix, fx = _sample_axis(resolution, spec.nx)
+    iy, fy = _sample_axis(resolution, spec.ny)
+    h_min, h_max = float(heights.min()), float(heights.max())
+
+    for row in range(0, resolution, CHUNK_ROWS):
+        rows = slice(row, min(row + CHUNK_ROWS, resolution))
+        proximity = _sample_rows(influence, iy[rows], fy[rows], ix, fx)
+        chunk_slope = _sample_rows(slope, iy[rows], fy[rows], ix, fx)
+        if kind == 'SPLAT':
+            out[rows] = compute_splat(proximity, chunk_slope, params)
+        else:
+            out[rows, :, 0] = proximity
+            out[rows, :, 1] = chunk_slope / (0.5 * math.pi)
+            out[rows, :, 2] = (_sample_rows(heights, iy[rows], fy[rows], ix, fx) - h_min) / max(h_max - h_min, 1e-6)
+            out[rows, :, 3] = 1.0
+
+
+#---------------------------------------------------------------------------
+#   Images
+#---------------------------------------------------------------------------
+
+def _ensure_image(name: str, resolution: int) -> bpy.types.Image:
+    image = bpy.data.images.get(name)
+    if image is not None and tuple(image.size) != (resolution, resolution):
+        bpy.data.images.remove(image)
+        image = None
+    if image is None:
+        image = bpy.data.images.new(name, resolution, resolution, alpha=True)
+        image.colorspace_settings.name = 'Non-Color'
+    return image
+
+
+def _link_to_materials(images: dict[str, bpy.types.Image], report: MasksReport) -> None:
+    """Set the images of the named image texture nodes of the local `TM_` materials."""
+    for material in bpy.data.materials:
+        if not material.name.startswith(assets.asset_prefix) or material.node_tree is None:
+            continue
+        nodes = [node for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.name in images]
+        if not nodes:
+            continue
+        # Node trees of linked materials are read-only
+        if material.library is not None:
+            report.linked_materials.append(material.name)
+            continue
+        for node in nodes:
+            node.image = images[node.name]
+        report.materials.append(material.name)
+
+
+@tracing.traced('landscape.bake_masks')
+def bake_masks(context: bpy.types.Context) -> MasksReport:
+    """Write & pack the splat & weights images of the landscape heightfield, at the final resolution."""
+    props = context.scene.tmlg_props
+    resolution = int(props.mask_resolution)
+    params = get_mask_params(props)
+    report = MasksReport()
+
+    with final_resolution(context):
+        spec = get_grid_spec(props)
+        obj = props.landscape_object
+        if not mesh.is_grid_mesh(obj.data, spec):
+            generate(context)
+        heights, influence = mesh.read_heightfield(obj.data, spec)
+    rasters = (heights, influence, get_slope(heights, spec))
+
+    # One full buffer at a time, 8K RGBA float is 1 GiB
+    images = {}
+    for node_name, kind in ((SPLAT_NODE, 'SPLAT'), (WEIGHTS_NODE, 'WEIGHTS')):
+        with tracing.span(f'landscape.masks.{kind.lower()}'):
+            pixels = np.empty((resolution, resolution, 4), dtype=np.float32)
+            fill_mask(pixels, kind, rasters, spec, params)
+            image = _ensure_image(f'{LANDSCAPE_NAME}_{kind.lower()}', resolution)
+            image.pixels.foreach_set(pixels.ravel())
+            del pixels
+            image.update()
+            image.pack()
+            images[node_name] = image
+
+    report.images = list(images.values())
+    _link_to_materials(images, report)
+    if report.linked_materials:
+        log.warning(f'Masks not set in the linked materials: {", ".join(report.linked_materials)}')
+    log.info(f'Baked {resolution}x{resolution} landscape masks: {report}')
+    return report
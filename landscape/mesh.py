@@ -0,0 +1,310 @@
+"""Bulk mesh I/O between blender meshes & numpy arrays.
+
+Function | Use
+:---|:---
+build_grid_mesh(mesh, spec)       | Replace the mesh geometry by the flat grid of the spec
+is_grid_mesh(mesh, spec)          | Return True if the mesh is still the grid built from the spec
+read_coords(mesh)                 | Return the vertices coordinates as a (N, 3) array
+write_heightfield(mesh, spec, results) | Write windows heights & influence rasters to the grid mesh
+read_heightfield(mesh, spec)      | Return the heights & influence rasters of the grid mesh
+read_route_points(objects, depsgraph) | Return the world coordinates of the evaluated route vertices
+read_geometry(objects, depsgraph) | Return the evaluated geometry of the objects in world space, as MeshArrays
+get_polygon_centers(arrays)       | Return the (P, 3) centers of the polygons
+extract_polygons(arrays, polygons) | Return the MeshArrays of some polygons only, with their vertices
+write_geometry(mesh, arrays)      | Replace the mesh geometry & materials by the MeshArrays
+
+Every read & write is a single `foreach_get` / `foreach_set` call.
+Grid vertices are row-major: the vertex (ix, iy) has the index iy * nx + ix,
+so a (ny, nx) raster maps directly to the vertices z coordinates.
+"""
+
+from typing import Iterable, NamedTuple
+
+import bpy
+import numpy as np
+
+from .heightfield import GridSpec, Window, full_window
+
+# Mesh custom property storing the grid spec the mesh was built from
+GRID_PROPERTY = 'tmlg_grid'
+
+# Point attribute storing the route influence (0-1), used by the landscape modifiers & materials
+INFLUENCE_ATTRIBUTE = 'tmlg_influence'
+
+
+def build_grid_mesh(mesh: bpy.types.Mesh, spec: GridSpec) -> None:
+    """Replace the mesh geometry by a flat grid of quads, with an UV map."""
+    nx, ny = spec.nx, spec.ny
+    mesh.clear_geometry()
+
+    xs = spec.origin_x + np.arange(nx, dtype=np.float32) * spec.step
+    ys = spec.origin_y + np.arange(ny, dtype=np.float32) * spec.step
+    co = np.zeros((ny, nx, 3), dtype=np.float32)
+    co[..., 0] = xs[np.newaxis, :]
+    co[..., 1] = ys[:, np.newaxis]
+
+    # Quad (ix, iy) -> vertices v, v + 1, v + nx + 1, v + nx (counter-clockwise, normal up)
+    v0 = (np.arange(ny - 1)[:, np.newaxis] * nx + np.arange(nx - 1)[np.newaxis, :]).ravel()
+    quads = np.stack((v0, v0 + 1, v0 + nx + 1, v0 + nx), axis=1).astype(np.int32)
+    n_quads = len(quads)
+
+    mesh.vertices.add(nx * ny)
+    mesh.loops.add(4 * n_quads)
+    mesh.polygons.add(n_quads)
+    mesh.vertices.foreach_set('co', co.ravel())
+    mesh.loops.foreach_set('vertex_index', quads.ravel())
+    mesh.polygons.foreach_set('loop_start', np.arange(0, 4 * n_quads, 4, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.full(n_quads, 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    # UVs follow the grid, from 0 to 1
+    uv = np.empty((ny, nx, 2), dtype=np.float32)
+    uv[..., 0] = (np.arange(nx, dtype=np.float32) / max(nx - 1, 1))[np.newaxis, :]
+    uv[..., 1] = (np.arange(ny, dtype=np.float32) / max(ny - 1, 1))[:, np.newaxis]
+    uv_layer = mesh.uv_layers.new(name='UVMap')
+    uv_layer.data.foreach_set('uv', uv.reshape(-1, 2)[quads.ravel()].ravel())
+
+    mesh[GRID_PROPERTY] = list(spec)
+
+
+def is_grid_mesh(mesh: bpy.types.Mesh, spec: GridSpec) -> bool:
+    """Return True if the mesh is still the grid built from the spec."""
+    built_spec = mesh.get(GRID_PROPERTY)
+    return (
+        built_spec is not None
+        and tuple(built_spec) == tuple(spec)
+        and len(mesh.vertices) == spec.nx * spec.ny
+    )
+
+
+def read_coords(mesh: bpy.types.Mesh) -> np.ndarray:
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    return co.reshape(-1, 3)
+
+
+def write_heightfield(
+        mesh: bpy.types.Mesh,
+        spec: GridSpec,
+        results: Iterable[tuple[Window, np.ndarray, np.ndarray]],
+        co: np.ndarray | None = None,
+    ) -> None:
+    """Write the (h, w) heights & influence rasters of each window to the grid mesh vertices, in one write.
+
+    Pass the current coordinates as `co` to avoid reading them again."""
+    if co is None:
+        co = read_coords(mesh)
+    grid = co.reshape(spec.ny, spec.nx, 3)
+
+    attribute = mesh.attributes.get(INFLUENCE_ATTRIBUTE)
+    if attribute is None:
+        attribute = mesh.attributes.new(INFLUENCE_ATTRIBUTE, 'FLOAT', 'POINT')
+    values = np.empty(len(mesh.vertices), dtype=np.float32)
+    results = list(results)
+    if all(window != full_window(spec) for window, _, _ in results):
+        attribute.data.foreach_get('value', values)
+
+    for window, heights, influence in results:
+        grid[window.slices + (2,)] = heights
+        values.reshape(spec.ny, spec.nx)[window.slices] = influence
+
+    mesh.vertices.foreach_set('co', co.ravel())
+    attribute.data.foreach_set('value', values)
+    mesh.update()
+
+
+def read_heightfield(mesh: bpy.types.Mesh, spec: GridSpec) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (ny, nx) heights & influence rasters of the grid mesh, zero influence if never written."""
+    heights = read_coords(mesh)[:, 2].reshape(spec.ny, spec.nx)
+    influence = np.zeros(len(mesh.vertices), dtype=np.float32)
+    attribute = mesh.attributes.get(INFLUENCE_ATTRIBUTE)
+    if attribute is not None:
+        attribute.data.foreach_get('value', influence)
+    return heights, influence.reshape(spec.ny, spec.nx)
+
+
+def read_route_points(objects, depsgraph: bpy.types.Depsgraph) -> np.ndarray:
+    """Return the world coordinates of the evaluated vertices of the objects, as a (N, 3) array."""
+    chunks = []
+    for obj in objects:
+        obj_eval = obj.evaluated_get(depsgraph)
+        try:
+            mesh = obj_eval.to_mesh()
+        except RuntimeError:
+            continue # object without geometry
+        if mesh is None:
+            continue
+
+        co = read_coords(mesh)
+        matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+        chunks.append(co @ matrix[:3, :3].T + matrix[:3, 3])
+        obj_eval.to_mesh_clear()
+
+    if len(chunks) == 0:
+        return np.empty((0, 3), dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+#---------------------------------------------------------------------------
+#   Evaluated geometry
+#---------------------------------------------------------------------------
+
+class MeshArrays(NamedTuple):
+    """Polygons geometry as flat arrays, corners ordered by polygon.
+
+    `material_index` indexes `materials`, None for the empty slots."""
+    co: np.ndarray              # (V, 3) float32
+    corner_vertices: np.ndarray # (L,) int32
+    loop_start: np.ndarray      # (P,) int32
+    loop_total: np.ndarray      # (P,) int32
+    normals: np.ndarray         # (L, 3) float32, corner normals
+    uv: np.ndarray | None       # (L, 2) float32, active UV map
+    material_index: np.ndarray  # (P,) int32
+    materials: list
+
+
+def _read_corner_normals(mesh: bpy.types.Mesh) -> np.ndarray:
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if bpy.app.version >= (4, 1, 0):
+        mesh.corner_normals.foreach_get('vector', normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get('normal', normals)
+    return normals.reshape(-1, 3)
+
+
+def read_geometry(objects, depsgraph: bpy.types.Depsgraph) -> MeshArrays:
+    """Return the evaluated geometry of the objects in world space, concatenated.
+
+    Each array is read with one `foreach_get` per object, the material slots are merged by material."""
+    materials = []
+    chunks = []
+    vertex_offset = loop_offset = 0
+    for obj in objects:
+        obj_eval = obj.evaluated_get(depsgraph)
+        try:
+            mesh = obj_eval.to_mesh()
+        except RuntimeError:
+            continue # object without geometry
+        if mesh is None or len(mesh.polygons) == 0:
+            obj_eval.to_mesh_clear()
+            continue
+
+        matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+        normal_matrix = np.linalg.inv(matrix[:3, :3]).T
+        co = read_coords(mesh) @ matrix[:3, :3].T + matrix[:3, 3]
+        normals = _read_corner_normals(mesh) @ normal_matrix.T
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+
+        n_loops, n_polygons = len(mesh.loops), len(mesh.polygons)
+        corner_vertices = np.empty(n_loops, dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', corner_vertices)
+        loop_start = np.empty(n_polygons, dtype=np.int32)
+        mesh.polygons.foreach_get('loop_start', loop_start)
+        loop_total = np.empty(n_polygons, dtype=np.int32)
+        mesh.polygons.foreach_get('loop_total', loop_total)
+        material_index = np.empty(n_polygons, dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', material_index)
+
+        uv = None
+        if mesh.uv_layers.active is not None:
+            uv = np.empty(n_loops * 2, dtype=np.float32)
+            mesh.uv_layers.active.data.foreach_get('uv', uv)
+            uv = uv.reshape(-1, 2)
+
+        # Object slots -> merged materials
+        # Original materials: the evaluated copies belong to the depsgraph
+        slots = [slot.material.original if slot.material else None for slot in obj_eval.material_slots] or [None]
+        for material in slots:
+            if material not in materials:
+                materials.append(material)
+        slot_map = np.array([materials.index(material) for material in slots], dtype=np.int32)
+        material_index = slot_map[np.clip(material_index, 0, len(slots) - 1)]
+
+        chunks.append((co, corner_vertices + vertex_offset, loop_start + loop_offset, loop_total, normals, uv, material_index))
+        vertex_offset += len(co)
+        loop_offset += n_loops
+        obj_eval.to_mesh_clear()
+
+    if len(chunks) == 0:
+        return MeshArrays(
+            np.empty((0, 3), dtype=np.float32), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int32), np.empty((0, 3), dtype=np.float32), None, np.empty(0, dtype=np.int32), [],
+        )
+
+    # Objects without UV map get zeros, so the corners stay aligned
+    has_uv = any(chunk[5] is not None for chunk in chunks)
+    return MeshArrays(
+        co=np.concatenate([chunk[0] for chunk in chunks]).astype(np.float32, copy=False),
+        corner_vertices=np.concatenate([chunk[1] for chunk in chunks]),
+        loop_start=np.concatenate([chunk[2] for chunk in chunks]),
+        loop_total=np.concatenate([chunk[3] for chunk in chunks]),
+        normals=np.concatenate([chunk[4] for chunk in chunks]).astype(np.float32, copy=False),
+        uv=np.concatenate([
+            chunk[5] if chunk[5] is not None else np.zeros((len(chunk[1]), 2), dtype=np.float32)
+            for chunk in chunks
+        ]) if has_uv else None,
+        material_index=np.concatenate([chunk[6] for chunk in chunks]),
+        materials=materials,
+    )
+
+
+def get_polygon_centers(arrays: MeshArrays) -> np.ndarray:
+    """Return the mean of the vertices of each polygon, as a (P, 3) array."""
+    if len(arrays.loop_start) == 0:
+        return np.empty((0, 3), dtype=np.float32)
+    sums = np.add.reduceat(arrays.co[arrays.corner_vertices], arrays.loop_start, axis=0)
+    return sums / arrays.loop_total[:, np.newaxis]
+
+
+def extract_polygons(arrays: MeshArrays, polygons: np.ndarray) -> MeshArrays:
+    """Return the geometry of the polygons only, with their used vertices renumbered.
+
+    Materials are kept as is: `material_index` still indexes the same list."""
+    starts = arrays.loop_start[polygons]
+    totals = arrays.loop_total[polygons]
+    new_starts = (np.cumsum(totals) - totals).astype(np.int32)
+    corners = np.repeat(starts - new_starts, totals) + np.arange(totals.sum(), dtype=np.int32)
+
+    vertices, corner_vertices = np.unique(arrays.corner_vertices[corners], return_inverse=True)
+    return MeshArrays(
+        co=arrays.co[vertices],
+        corner_vertices=corner_vertices.ravel().astype(np.int32),
+        loop_start=new_starts,
+        loop_total=totals,
+        normals=arrays.normals[corners],
+        uv=arrays.uv[corners] if arrays.uv is not None else None,
+        material_index=arrays.material_index[polygons],
+        materials=arrays.materials,
+    )
+
+
+def write_geometry(mesh: bpy.types.Mesh, arrays: MeshArrays) -> None:
+    """Replace the mesh geometry by the arrays, with their corner normals as custom normals.
+
+    The mesh gets a material slot per material used by the polygons."""
+    mesh.clear_geometry()
+    mesh.materials.clear()
+    used, material_index = np.unique(arrays.material_index, return_inverse=True)
+    for i in used:
+        mesh.materials.append(arrays.materials[i])
+
+    n_polygons = len(arrays.loop_start)
+    mesh.vertices.add(len(arrays.co))
+    mesh.loops.add(len(arrays.corner_vertices))
+    mesh.polygons.add(n_polygons)
+    mesh.vertices.foreach_set('co', arrays.co.ravel())
+    mesh.loops.foreach_set('vertex_index', arrays.corner_vertices)
+    mesh.polygons.foreach_set('loop_start', arrays.loop_start)
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', arrays.loop_total)
+    mesh.polygons.foreach_set('material_index', material_index.ravel().astype(np.int32))
+    mesh.polygons.foreach_set('use_smooth', np.ones(n_polygons, dtype=bool))
+    mesh.update(calc_edges=True)
+
+    if arrays.uv is not None:
+        mesh.uv_layers.new(name='UVMap').data.foreach_set('uv', arrays.uv.ravel())
+    if bpy.app.version < (4, 1, 0):
+        mesh.use_auto_smooth = True
+    mesh.normals_split_custom_set(arrays.normals)
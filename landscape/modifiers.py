@@ -0,0 +1,160 @@
+"""Batched editing of the `TM_` geometry nodes modifiers inputs of the landscape objects.
+
+Function | Use
+:---|:---
+get_landscape_objects(props)  | Return the objects of the landscape collection & the landscape object
+iter_tm_modifiers(objects)    | Yield the (object, modifier) of the `TM_` node groups modifiers
+refresh_inputs(context)       | Fill the scene inputs editor from the current modifiers
+on_input_changed(item, context) | Mark an edited input pending & schedule the apply
+apply_pending(context)        | Write all the pending inputs to every modifier, in one evaluation
+
+Modifier inputs are ID properties: writing them doesn't trigger an evaluation by itself.
+All the pending values are written to every modifier, then each changed object is tagged once,
+so the heavy node trees are evaluated once per object by the next depsgraph update,
+instead of once per object & per property when editing the modifiers one by one.
+Edits made during the same event loop iteration (e.g. a slider drag) are grouped.
+"""
+
+from typing import Iterator
+
+import bpy
+
+from .. import assets
+from ..utils import logs
+from ..utils import tracing
+
+log = logs.get_logger(__name__)
+
+# Node socket type prefixes of the editable inputs, to the editor value property
+_SOCKET_KINDS = (
+    ('NodeSocketFloat', 'FLOAT'),
+    ('NodeSocketInt', 'INT'),
+    ('NodeSocketBool', 'BOOLEAN'),
+    ('NodeSocketVector', 'VECTOR'),
+)
+
+VALUE_PROPS = {
+    'FLOAT'     : 'float_value',
+    'INT'       : 'int_value',
+    'BOOLEAN'   : 'bool_value',
+    'VECTOR'    : 'vector_value',
+}
+
+# Set while the editor is filled, so its updates aren't edits
+_is_refreshing = False
+
+
+def get_landscape_objects(props) -> list[bpy.types.Object]:
+    objects = list(props.landscape_collection.all_objects) if props.landscape_collection else []
+    if props.landscape_object is not None and props.landscape_object not in objects:
+        objects.append(props.landscape_object)
+    return objects
+
+
+def iter_tm_modifiers(objects) -> Iterator[tuple[bpy.types.Object, bpy.types.NodesModifier]]:
+    for obj in objects:
+        for modifier in obj.modifiers:
+            if modifier.type == 'NODES' and modifier.node_group and modifier.node_group.name.startswith(assets.asset_prefix):
+                yield obj, modifier
+
+
+def _get_group_inputs(node_group: bpy.types.NodeTree) -> Iterator[tuple[str, str, str]]:
+    """Yield the (identifier, name, kind) of the editable inputs of a node group."""
+    if bpy.app.version >= (4, 0, 0):
+        sockets = [
+            (item.identifier, item.name, item.socket_type) for item in node_group.interface.items_tree
+            if item.item_type == 'SOCKET' and item.in_out == 'INPUT'
+        ]
+    else:
+        sockets = [(socket.identifier, socket.name, socket.bl_socket_idname) for socket in node_group.inputs]
+
+    for identifier, name, socket_type in sockets:
+        kind = next((kind for prefix, kind in _SOCKET_KINDS if socket_type.startswith(prefix)), None)
+        if kind is not None:
+            yield identifier, name, kind
+
+
+@tracing.traced('landscape.modifiers.refresh_inputs')
+def refresh_inputs(context: bpy.types.Context) -> int:
+    """Fill the editor with the inputs of the `TM_` modifiers, valued from the first modifier.
+
+    Return the number of inputs."""
+    global _is_refreshing
+    props = context.scene.tmlg_props
+    inputs = props.modifier_inputs
+    inputs.clear()
+
+    _is_refreshing = True
+    try:
+        seen = set()
+        for obj, modifier in iter_tm_modifiers(get_landscape_objects(props)):
+            group_name = modifier.node_group.name
+            for identifier, name, kind in _get_group_inputs(modifier.node_group):
+                if (group_name, identifier) in seen or identifier not in modifier:
+                    continue
+                seen.add((group_name, identifier))
+
+                item = inputs.add()
+                item.name = name
+                item.node_group = group_name
+                item.identifier = identifier
+                item.kind = kind
+                setattr(item, VALUE_PROPS[kind], modifier[identifier])
+    finally:
+        _is_refreshing = False
+    return len(inputs)
+
+
+def on_input_changed(item, context: bpy.types.Context) -> None:
+    """Mark the input pending, applied on the next event loop iteration unless edits are deferred."""
+    if _is_refreshing:
+        return
+    item.is_pending = True
+    if not context.scene.tmlg_props.defer_modifier_edits and not bpy.app.timers.is_registered(_apply_timer):
+        bpy.app.timers.register(_apply_timer, first_interval=0.0)
+
+
+def _apply_timer() -> None:
+    apply_pending(bpy.context)
+    return None
+
+
+def has_pending(props) -> bool:
+    return any(item.is_pending for item in props.modifier_inputs)
+
+
+@tracing.traced('landscape.modifiers.apply_pending')
+def apply_pending(context: bpy.types.Context) -> int:
+    """Write the pending inputs to every landscape modifier using their node group, tag each changed object once.
+
+    Return the number of changed objects."""
+    props = context.scene.tmlg_props
+    pending: dict[str, list[tuple[str, object]]] = {}
+    for item in props.modifier_inputs:
+        if item.is_pending:
+            value = getattr(item, VALUE_PROPS[item.kind])
+            pending.setdefault(item.node_group, []).append((item.identifier, value[:] if item.kind == 'VECTOR' else value))
+            item.is_pending = False
+    if len(pending) == 0:
+        return 0
+
+    changed_objects = set()
+    for obj, modifier in iter_tm_modifiers(get_landscape_objects(props)):
+        for identifier, value in pending.get(modifier.node_group.name, ()):
+            if identifier in modifier:
+                current = modifier[identifier]
+                if isinstance(current, (bool, int, float)):
+                    value = type(current)(value) # e.g. booleans stored as int ID properties
+                modifier[identifier] = value
+                changed_objects.add(obj)
+
+    # A single re-evaluation per object, on the next depsgraph update
+    for obj in changed_objects:
+        obj.update_tag()
+    if context.screen:
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+    log.debug(f'Applied {sum(len(values) for values in pending.values())} modifier inputs to {len(changed_objects)} objects')
+    return len(changed_objects)
@@ -0,0 +1,220 @@
+"""Landscape tiles & dirty tiles tracking, for incremental regeneration.
+
+Function | Use
+:---|:---
+get_tile_cells(spec)          | Return the number of grid cells on a tile side
+get_tiles_shape(spec)         | Return the number of tiles on (y, x)
+tile_window(tile, spec)       | Return the vertices window of a tile
+get_tile_origin(tile, spec)   | Return the world xy of a tile first vertex
+all_tiles(spec)               | Return every tile of the grid
+tiles_in_bounds(bounds, spec) | Return the tiles overlapping xy bounds
+merge_windows(tiles, spec)    | Group tiles into as few windows as worth computing together
+split_points(points, spec)    | Return the indices of the xy points in each tile, e.g. polygons centers
+get_tracker()                 | Return the dirty tiles tracker
+
+Tiles are squares of TILE_BLOCKS * TILE_BLOCKS trackmania blocks, aligned to the block grid.
+Tile (tx, ty) covers the vertices [tx * cells, (tx + 1) * cells[ on x (same on y),
+the last tile of a row also covers the last vertex, so tiles share no vertex.
+"""
+
+import math
+from typing import Iterable, NamedTuple
+
+import bpy
+import numpy as np
+
+from ..properties.properties import BLOCK_SIZE
+from .heightfield import GridSpec, Window
+
+# Tile side, in trackmania blocks
+TILE_BLOCKS = 4
+
+# Tiles are merged in a single window while it computes less than this ratio of extra vertices
+_MERGE_RATIO = 2.0
+
+Tile = tuple[int, int]
+
+
+class Bounds(NamedTuple):
+    """World xy bounding box."""
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+    def expand(self, margin: float) -> 'Bounds':
+        return Bounds(self.x0 - margin, self.y0 - margin, self.x1 + margin, self.y1 + margin)
+
+
+#---------------------------------------------------------------------------
+#   Tiles geometry
+#---------------------------------------------------------------------------
+
+def get_tile_cells(spec: GridSpec) -> int:
+    return max(1, round(TILE_BLOCKS * BLOCK_SIZE / spec.step))
+
+
+def get_tiles_shape(spec: GridSpec) -> tuple[int, int]:
+    cells = get_tile_cells(spec)
+    return (max(1, math.ceil((spec.ny - 1) / cells)), max(1, math.ceil((spec.nx - 1) / cells)))
+
+
+def tile_window(tile: Tile, spec: GridSpec) -> Window:
+    tx, ty = tile
+    cells = get_tile_cells(spec)
+    n_ty, n_tx = get_tiles_shape(spec)
+    return Window(
+        tx * cells,
+        ty * cells,
+        spec.nx if tx == n_tx - 1 else (tx + 1) * cells,
+        spec.ny if ty == n_ty - 1 else (ty + 1) * cells,
+    )
+
+
+def all_tiles(spec: GridSpec) -> set[Tile]:
+    n_ty, n_tx = get_tiles_shape(spec)
+    return {(tx, ty) for ty in range(n_ty) for tx in range(n_tx)}
+
+
+def tiles_in_bounds(bounds: Bounds, spec: GridSpec) -> set[Tile]:
+    """Return the tiles overlapping the bounds, none if the bounds are out of the grid."""
+    tile_size = get_tile_cells(spec) * spec.step
+    n_ty, n_tx = get_tiles_shape(spec)
+    tx0 = max(math.floor((bounds.x0 - spec.origin_x) / tile_size), 0)
+    ty0 = max(math.floor((bounds.y0 - spec.origin_y) / tile_size), 0)
+    tx1 = min(math.floor((bounds.x1 - spec.origin_x) / tile_size), n_tx - 1)
+    ty1 = min(math.floor((bounds.y1 - spec.origin_y) / tile_size), n_ty - 1)
+    return {(tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)}
+
+
+def merge_windows(tiles: Iterable[Tile], spec: GridSpec) -> list[Window]:
+    """Return one window around all the tiles when it isn't much bigger than them, else one per tile.
+
+    Each window is computed with a halo, so a few big windows are cheaper than many small ones."""
+    windows = [tile_window(tile, spec) for tile in sorted(tiles)]
+    if len(windows) <= 1:
+        return windows
+
+    merged = Window(
+        min(w.ix0 for w in windows),
+        min(w.iy0 for w in windows),
+        max(w.ix1 for w in windows),
+        max(w.iy1 for w in windows),
+    )
+    area = sum(math.prod(w.shape) for w in windows)
+    if math.prod(merged.shape) <= _MERGE_RATIO * area:
+        return [merged]
+    return windows
+
+
+def get_tile_origin(tile: Tile, spec: GridSpec) -> tuple[float, float]:
+    """Return the world xy of the tile first vertex."""
+    cells = get_tile_cells(spec)
+    return (spec.origin_x + tile[0] * cells * spec.step, spec.origin_y + tile[1] * cells * spec.step)
+
+
+def split_points(points: np.ndarray, spec: GridSpec) -> dict[Tile, np.ndarray]:
+    """Return the sorted indices of the points in each non-empty tile, points out of the grid go to the border tiles."""
+    tile_size = get_tile_cells(spec) * spec.step
+    n_ty, n_tx = get_tiles_shape(spec)
+    tx = np.clip(np.floor((points[:, 0] - spec.origin_x) / tile_size), 0, n_tx - 1).astype(np.int64)
+    ty = np.clip(np.floor((points[:, 1] - spec.origin_y) / tile_size), 0, n_ty - 1).astype(np.int64)
+    flat = ty * n_tx + tx
+    order = np.argsort(flat, kind='stable')
+    bounds = np.searchsorted(flat[order], np.arange(n_tx * n_ty + 1))
+    return {
+        (i % n_tx, i // n_tx): order[bounds[i]:bounds[i + 1]]
+        for i in range(n_tx * n_ty) if bounds[i + 1] > bounds[i]
+    }
+
+
+#---------------------------------------------------------------------------
+#   Dirty tiles tracker
+#---------------------------------------------------------------------------
+
+def get_object_bounds(obj: bpy.types.Object) -> Bounds:
+    """Return the world xy bounds of the (evaluated) object bounding box."""
+    corners = np.array(obj.bound_box, dtype=np.float32)
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    world = corners @ matrix[:3, :3].T + matrix[:3, 3]
+    x0, y0 = world[:, :2].min(axis=0)
+    x1, y1 = world[:, :2].max(axis=0)
+    return Bounds(float(x0), float(y0), float(x1), float(y1))
+
+
+class DirtyTileTracker():
+    """Remember the bounds of the route objects, to find the tiles their updates affect.
+
+    An updated object dirties the tiles around its previous and new bounds, grown by the influence radius:
+    updates of objects out of the route collection, or whose bounds are out of the grid, dirty nothing."""
+
+    def __init__(self) -> None:
+        self.dirty: set[Tile] = set()
+        self.spec: GridSpec | None = None
+        self._bounds: dict[str, Bounds] = {}
+
+    def clear(self) -> None:
+        self.dirty.clear()
+        self.spec = None
+        self._bounds.clear()
+
+    def reset(self, objects: Iterable[bpy.types.Object], depsgraph: bpy.types.Depsgraph, spec: GridSpec) -> None:
+        """Remember the current bounds of the route objects, with no dirty tile (after a full generation)."""
+        self.clear()
+        self.spec = spec
+        for obj in objects:
+            self._bounds[obj.name] = get_object_bounds(obj.evaluated_get(depsgraph))
+
+    def update(
+            self,
+            names: Iterable[str],
+            objects: Iterable[bpy.types.Object],
+            depsgraph: bpy.types.Depsgraph,
+            spec: GridSpec,
+            margin: float,
+        ) -> set[Tile]:
+        """Mark dirty the tiles affected by the updated objects names, return the new dirty tiles.
+
+        `objects` are the current route objects: updated names not in them are ignored,
+        unless they were route objects before (removed from the route or deleted).
+        Every tile is dirty if the tracker wasn't reset with this grid spec."""
+        route = {obj.name: obj for obj in objects}
+        if self.spec != spec:
+            self.reset(route.values(), depsgraph, spec)
+            self.dirty = all_tiles(spec)
+            return set(self.dirty)
+
+        new_dirty = set()
+        for name in set(names) | (self._bounds.keys() - route.keys()):
+            old_bounds = self._bounds.get(name)
+            obj = route.get(name)
+            if obj is None and old_bounds is None:
+                continue # not a route object
+
+            changed_bounds = []
+            if obj is None:
+                del self._bounds[name]
+            else:
+                bounds = self._bounds[name] = get_object_bounds(obj.evaluated_get(depsgraph))
+                changed_bounds.append(bounds)
+            if old_bounds is not None and old_bounds not in changed_bounds:
+                changed_bounds.append(old_bounds)
+
+            for bounds in changed_bounds:
+                new_dirty |= tiles_in_bounds(bounds.expand(margin), spec)
+
+        new_dirty -= self.dirty
+        self.dirty |= new_dirty
+        return new_dirty
+
+    def pop_dirty(self) -> set[Tile]:
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+
+
+_tracker = DirtyTileTracker()
+
+
+def get_tracker() -> DirtyTileTracker:
+    return _tracker
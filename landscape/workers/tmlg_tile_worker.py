@@ -0,0 +1,68 @@
+"""Landscape tiles worker, run in the processes of the `backend` pool.
+
+This directory is added to `sys.path` so the spawned processes (a plain python, not blender)
+can import this module by name: it must not be part of the addon package, and only imports
+the numpy `heightfield` kernel, by path.
+
+Arrays are never pickled: route points are read from, and heights written to, shared memory.
+"""
+
+import importlib.util
+import os
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _load_heightfield():
+    module = sys.modules.get('tmlg_heightfield')
+    if module is None:
+        filepath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'heightfield.py')
+        spec = importlib.util.spec_from_file_location('tmlg_heightfield', filepath)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['tmlg_heightfield'] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+heightfield = _load_heightfield()
+
+
+def compute_window(
+        points_shm: str,
+        n_points: int,
+        out_shm: str,
+        out_window: tuple,
+        grid_spec: tuple,
+        height_params: tuple,
+        window: tuple,
+    ) -> tuple:
+    """Compute the window heights & influence into the (2, h, w) output raster of out_window.
+
+    Specs, params & windows are passed as plain tuples, their classes only exist in the parent."""
+    out_window = heightfield.Window(*out_window)
+    window = heightfield.Window(*window)
+
+    points_buffer = shared_memory.SharedMemory(name=points_shm)
+    out_buffer = shared_memory.SharedMemory(name=out_shm)
+    points = out = None
+    try:
+        points = np.ndarray((n_points, 3), dtype=np.float32, buffer=points_buffer.buf)
+        out = np.ndarray((2,) + out_window.shape, dtype=np.float32, buffer=out_buffer.buf)
+
+        heights, influence = heightfield.compute_heightfield(
+            points,
+            heightfield.GridSpec(*grid_spec),
+            heightfield.HeightParams(*height_params),
+            window,
+        )
+        rows = slice(window.iy0 - out_window.iy0, window.iy1 - out_window.iy0)
+        cols = slice(window.ix0 - out_window.ix0, window.ix1 - out_window.ix0)
+        out[0, rows, cols] = heights
+        out[1, rows, cols] = influence
+    finally:
+        points = out = None # release the buffers before closing them
+        points_buffer.close()
+        out_buffer.close()
+    return tuple(window)
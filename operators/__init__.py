@@ -5,12 +5,48 @@
 from .tmlg.OT_import_assets import (
     TMLG_OT_import_assets,
 )
+from .tmlg.OT_generate_landscape import (
+    TMLG_OT_generate_landscape,
+)
+from .tmlg.OT_export_tiles import (
+    TMLG_OT_export_tiles,
+)
+from .tmlg.OT_bake_landscape import (
+    TMLG_OT_bake_landscape,
+)
+from .tmlg.OT_bake_masks import (
+    TMLG_OT_bake_masks,
+)
+from .tmlg.OT_modifier_inputs_refresh import (
+    TMLG_OT_modifier_inputs_refresh,
+)
+from .tmlg.OT_modifier_inputs_apply import (
+    TMLG_OT_modifier_inputs_apply,
+)
+from .tmlg.OT_profile_nodes import (
+    TMLG_OT_profile_nodes,
+)
+from .tmlg.OT_profile_nodes_export import (
+    TMLG_OT_profile_nodes_export,
+)
 from .tmlg.OT_update_check import (
     TMLG_OT_update_check,
 )
 from .tmlg.OT_update_download import (
     TMLG_OT_update_download,
 )
+from .tmlg.OT_open_logs import (
+    TMLG_OT_open_logs,
+)
+from .tmlg.OT_tracing_toggle import (
+    TMLG_OT_tracing_toggle,
+)
+from .tmlg.OT_tracing_reset import (
+    TMLG_OT_tracing_reset,
+)
+from .tmlg.OT_tracing_export import (
+    TMLG_OT_tracing_export,
+)
 
 # ui
 from .ui.OT_message_popup import (
@@ -23,8 +59,20 @@ from .ui.OT_open_url import (
 
 _classes = (
     TMLG_OT_import_assets,
+    TMLG_OT_generate_landscape,
+    TMLG_OT_export_tiles,
+    TMLG_OT_bake_landscape,
+    TMLG_OT_bake_masks,
+    TMLG_OT_modifier_inputs_refresh,
+    TMLG_OT_modifier_inputs_apply,
+    TMLG_OT_profile_nodes,
+    TMLG_OT_profile_nodes_export,
     TMLG_OT_update_check,
     TMLG_OT_update_download,
+    TMLG_OT_open_logs,
+    TMLG_OT_tracing_toggle,
+    TMLG_OT_tracing_reset,
+    TMLG_OT_tracing_export,
     UI_OT_message_popup,
     UI_OT_open_url,
 )
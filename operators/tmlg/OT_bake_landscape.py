@@ -0,0 +1,27 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_bake_landscape(bpy.types.Operator):
+    """Bake the evaluated landscape into static tile objects, identical tiles sharing one mesh"""
+    bl_idname = 'tmlg.bake_landscape'
+    bl_label = 'Bake Landscape'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    hide_sources: bpy.props.BoolProperty(
+        name='Hide Sources',
+        description='Disable the landscape objects in viewports & renders, so their node trees are not evaluated anymore',
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return context.mode == 'OBJECT' and context.scene.tmlg_props.landscape_object is not None
+
+    def execute(self, context):
+        from ...landscape import bake
+        with tracing.span(self.bl_idname):
+            report = bake.bake(context, hide_sources=self.hide_sources)
+            self.report({'INFO'}, f'Baked {report}')
+            return {'FINISHED'}
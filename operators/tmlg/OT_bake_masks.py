@@ -0,0 +1,25 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_bake_masks(bpy.types.Operator):
+    """Bake the ground materials splat & weights masks of the landscape into packed images"""
+    bl_idname = 'tmlg.bake_masks'
+    bl_label = 'Bake Masks'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return context.mode == 'OBJECT' and context.scene.tmlg_props.landscape_object is not None
+
+    def execute(self, context):
+        from ...landscape import masks
+        with tracing.span(self.bl_idname):
+            report = masks.bake_masks(context)
+            if not report.materials:
+                linked = f', linked materials are read-only: {", ".join(report.linked_materials)}' if report.linked_materials else ''
+                self.report({'WARNING'}, f'Baked masks, but no material received them{linked}')
+            else:
+                self.report({'INFO'}, f'Baked masks: {report}')
+            return {'FINISHED'}
@@ -0,0 +1,37 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_export_tiles(bpy.types.Operator):
+    """Export the evaluated landscape at the final resolution, one FBX file per distinct tile for NadeoImporter"""
+    bl_idname = 'tmlg.export_tiles'
+    bl_label = 'Export Tiles'
+
+    directory: bpy.props.StringProperty(subtype='DIR_PATH')
+    filter_folder: bpy.props.BoolProperty(default=True, options={'HIDDEN'})
+
+    prefix: bpy.props.StringProperty(
+        name='Prefix',
+        description='Name prefix of the chunk files & of the tiles manifest',
+        default='Landscape',
+    )
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return context.mode == 'OBJECT' and context.scene.tmlg_props.landscape_object is not None
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        from ...landscape import export
+        with tracing.span(self.bl_idname):
+            try:
+                report = export.export_tiles(context, bpy.path.abspath(self.directory), self.prefix)
+            except (OSError, ImportError) as e:
+                self.report({'ERROR'}, f'Export failed: {e}')
+                return {'CANCELLED'}
+            self.report({'INFO'}, f'Exported {report} to "{self.directory}"')
+            return {'FINISHED'}
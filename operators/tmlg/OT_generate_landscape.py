@@ -0,0 +1,21 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_generate_landscape(bpy.types.Operator):
+    """Generate the landscape heights from the route collection"""
+    bl_idname = 'tmlg.generate_landscape'
+    bl_label = 'Generate Landscape'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return context.mode == 'OBJECT' and context.scene.tmlg_props.route_collection is not None
+
+    def execute(self, context):
+        from ... import landscape
+        with tracing.span(self.bl_idname):
+            obj = landscape.generate(context)
+            self.report({'INFO'}, f'Generated "{obj.name}" ({len(obj.data.vertices)} vertices)')
+            return {'FINISHED'}
@@ -1,25 +1,87 @@
 import bpy
 
 from ... import assets
+from ...properties import TMLG_CatalogFilter
+from ...utils import tracing
 
 
 class TMLG_OT_import_assets(bpy.types.Operator):
+    """Link the assets from the library, optionally filtered by catalogs"""
     bl_idname = 'tmlg.import_assets'
     bl_label = 'Import Assets'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # One item per catalog, whatever their number: enum flags are limited to 32 items
+    catalogs: bpy.props.CollectionProperty(type=TMLG_CatalogFilter)
+    node_group: bpy.props.StringProperty(
+        name='Node Group',
+        description='Only link this node group and the node groups it depends on',
+        default='',
+        options={'SKIP_SAVE'},
+    )
 
     @classmethod
     def poll(cls, context) -> bool:
         return True #no specific context restriction
 
+    def invoke(self, context, event):
+        if self.node_group:
+            return self.execute(context)
+        self._refresh_catalogs()
+        return bpy.types.WindowManager.invoke_props_dialog(self)
+
+    def _refresh_catalogs(self) -> None:
+        """Fill the catalogs from the library, keeping the flags of the previous call."""
+        flags = {item.uuid: (item.include, item.exclude) for item in self.catalogs}
+        self.catalogs.clear()
+        for catalog in assets.get_catalogs():
+            item = self.catalogs.add()
+            item.name = catalog.path
+            item.uuid = catalog.uuid
+            item.depth = catalog.depth
+            item.include, item.exclude = flags.get(catalog.uuid, (False, False))
+
     def execute(self, context):
-        self.report({'INFO'}, f'{assets.blend_FilePath = }')
+        with tracing.span(self.bl_idname):
+            self.report({'INFO'}, f'{assets.blend_FilePath = }')
+
+            if self.node_group:
+                if assets.link_node_group(self.node_group) is None:
+                    self.report({'ERROR'}, f'Node group "{self.node_group}" not found in the library')
+                    return {'CANCELLED'}
+                return {'FINISHED'}
+
+            index = assets.get_catalogs()
+            include = [index.get(item.uuid).path for item in self.catalogs if item.include and index.get(item.uuid)]
+            exclude = [index.get(item.uuid).path for item in self.catalogs if item.exclude and index.get(item.uuid)]
+
+            lib_exists = assets.lib_exists()
+            self.report({'INFO'}, f'{lib_exists = }')
+
+            all_loaded = assets.are_all_assets_loaded(include, exclude)
+            self.report({'INFO'}, f'{all_loaded = }')
 
-        lib_exists = assets.lib_exists()
-        self.report({'INFO'}, f'{lib_exists = }')
+            if not all_loaded:
+                report = assets.load_assets(include=include, exclude=exclude)
+                self.report({'INFO'}, f'Assets: {report}')
 
-        all_loaded = assets.are_all_assets_loaded()
-        self.report({'INFO'}, f'{all_loaded = }')
+            return {'FINISHED'}
 
-        assets.load_assets()
+    def draw(self, context):
+        layout = self.layout
+        if len(self.catalogs) == 0:
+            layout.label(text='No catalogs, all assets are linked')
+            return
 
-        return {'FINISHED'}
\ No newline at end of file
+        split = layout.split(factor=0.8)
+        split.label(text='Catalog')
+        split.label(text='Include / Exclude')
+        col = layout.column(align=True)
+        for item in self.catalogs:
+            split = col.split(factor=0.8)
+            label = split.row()
+            label.separator(factor=2.0 * item.depth)
+            label.label(text=item.name.rpartition('/')[2])
+            flags = split.row(align=True)
+            flags.prop(item, 'include', text='', icon='CHECKMARK')
+            flags.prop(item, 'exclude', text='', icon='X')
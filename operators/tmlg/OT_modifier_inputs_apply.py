@@ -0,0 +1,22 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_modifier_inputs_apply(bpy.types.Operator):
+    """Write the pending inputs to every landscape TM_ modifier, in one evaluation"""
+    bl_idname = 'tmlg.modifier_inputs_apply'
+    bl_label = 'Apply Modifier Inputs'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        from ...landscape import modifiers
+        return modifiers.has_pending(context.scene.tmlg_props)
+
+    def execute(self, context):
+        from ...landscape import modifiers
+        with tracing.span(self.bl_idname):
+            count = modifiers.apply_pending(context)
+            self.report({'INFO'}, f'Updated the modifiers of {count} objects')
+            return {'FINISHED'}
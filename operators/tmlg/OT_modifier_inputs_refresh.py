@@ -0,0 +1,17 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_modifier_inputs_refresh(bpy.types.Operator):
+    """Read the inputs of the landscape TM_ modifiers, to edit them all at once"""
+    bl_idname = 'tmlg.modifier_inputs_refresh'
+    bl_label = 'Refresh Modifier Inputs'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        from ...landscape import modifiers
+        with tracing.span(self.bl_idname):
+            count = modifiers.refresh_inputs(context)
+            self.report({'INFO'}, f'{count} modifier inputs')
+            return {'FINISHED'}
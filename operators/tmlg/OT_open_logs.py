@@ -0,0 +1,13 @@
+import bpy
+
+from ...utils import logs
+
+
+class TMLG_OT_open_logs(bpy.types.Operator):
+    """Render the logs as html and open them in the web browser"""
+    bl_idname = 'tmlg.open_logs'
+    bl_label = 'Open Logs'
+
+    def execute(self, context):
+        html_filepath = logs.render_html()
+        return bpy.ops.ui.open_url(url=str(html_filepath))
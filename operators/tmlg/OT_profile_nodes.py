@@ -0,0 +1,34 @@
+import bpy
+
+from ...utils import nodes_profiler
+from ...utils import tracing
+
+
+class TMLG_OT_profile_nodes(bpy.types.Operator):
+    """Evaluate the objects using TM_ node groups several times and rank the node groups by execution time"""
+    bl_idname = 'tmlg.profile_nodes'
+    bl_label = 'Profile Node Groups'
+
+    iterations: bpy.props.IntProperty(
+        name='Iterations',
+        description='Evaluations of the profiled objects',
+        default=10,
+        min=1,
+        soft_max=100,
+    )
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        with tracing.span(self.bl_idname):
+            results = nodes_profiler.profile(context, self.iterations)
+            if len(results) == 0:
+                self.report({'WARNING'}, 'No visible object uses a TM_ node group')
+                return {'CANCELLED'}
+
+            self.report({'INFO'}, f'Slowest node group: {results[0].node_group} ({results[0].pass_ms:.1f} ms per pass)')
+            if context.area:
+                context.area.tag_redraw()
+            return {'FINISHED'}
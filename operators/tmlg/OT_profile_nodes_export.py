@@ -0,0 +1,38 @@
+import bpy
+from bpy_extras.io_utils import ExportHelper
+
+from ...utils import nodes_profiler
+
+
+class TMLG_OT_profile_nodes_export(bpy.types.Operator, ExportHelper):
+    """Export the node groups profile as CSV or JSON (with the raw samples)"""
+    bl_idname = 'tmlg.profile_nodes_export'
+    bl_label = 'Export Node Groups Profile'
+
+    filename_ext = '.csv'
+    filter_glob: bpy.props.StringProperty(default='*.csv;*.json', options={'HIDDEN'})
+
+    file_format: bpy.props.EnumProperty(
+        name='Format',
+        items=(
+            ('CSV', 'CSV', 'One row per node group'),
+            ('JSON', 'JSON', 'One entry per node group, with the raw samples'),
+        ),
+        default='CSV',
+    )
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        return len(nodes_profiler.get_results()) > 0
+
+    def check(self, context) -> bool:
+        self.filename_ext = '.json' if self.file_format == 'JSON' else '.csv'
+        return super().check(context)
+
+    def execute(self, context):
+        if self.file_format == 'JSON':
+            count = nodes_profiler.export_json(self.filepath)
+        else:
+            count = nodes_profiler.export_csv(self.filepath)
+        self.report({'INFO'}, f'{count} node groups exported to "{self.filepath}"')
+        return {'FINISHED'}
@@ -0,0 +1,18 @@
+import bpy
+from bpy_extras.io_utils import ExportHelper
+
+from ...utils import tracing
+
+
+class TMLG_OT_tracing_export(bpy.types.Operator, ExportHelper):
+    """Export the recorded timings as Chrome trace events (chrome://tracing, ui.perfetto.dev)"""
+    bl_idname = 'tmlg.tracing_export'
+    bl_label = 'Export Trace'
+
+    filename_ext = '.json'
+    filter_glob: bpy.props.StringProperty(default='*.json', options={'HIDDEN'})
+
+    def execute(self, context):
+        count = tracing.export_chrome_trace(self.filepath)
+        self.report({'INFO'}, f'{count} spans exported to "{self.filepath}"')
+        return {'FINISHED'}
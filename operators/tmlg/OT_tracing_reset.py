@@ -0,0 +1,17 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_tracing_reset(bpy.types.Operator):
+    """Forget the recorded timings"""
+    bl_idname = 'tmlg.tracing_reset'
+    bl_label = 'Reset Tracing'
+
+    def execute(self, context):
+        tracing.reset()
+
+        if context.area:
+            context.area.tag_redraw()
+
+        return {'FINISHED'}
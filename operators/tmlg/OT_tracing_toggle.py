@@ -0,0 +1,20 @@
+import bpy
+
+from ...utils import tracing
+
+
+class TMLG_OT_tracing_toggle(bpy.types.Operator):
+    """Start or stop recording the addon timings"""
+    bl_idname = 'tmlg.tracing_toggle'
+    bl_label = 'Toggle Tracing'
+
+    def execute(self, context):
+        if tracing.is_enabled():
+            tracing.disable()
+        else:
+            tracing.enable()
+
+        if context.area:
+            context.area.tag_redraw()
+
+        return {'FINISHED'}
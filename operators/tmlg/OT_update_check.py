@@ -1,26 +1,36 @@
 import bpy
 
 from ... import bl_info
+from ...utils import logs
+from ...utils import tracing
 from ...utils.update import AddonUpdate
 
+log = logs.get_logger(__name__)
+
+
+def _log_check_result() -> None:
+    if AddonUpdate.can_update:
+        log.info(f'{bl_info["name"]}: update available !')
+    elif AddonUpdate.new_addon_available and not AddonUpdate.current_blender_supported:
+        log.error(f'A new version is available but blender version is too old ! Minimal is {AddonUpdate.latest_minimal_blender_version}).')
+
 
 class TMLG_OT_update_check(bpy.types.Operator):
     """Check if new release is available"""
     bl_idname = 'tmlg.update_check'
     bl_label = 'Check Update'
 
-    def execute(self, context):
-        AddonUpdate.check_for_new_release()
+    @classmethod
+    def poll(cls, context) -> bool:
+        return not AddonUpdate.is_checking
 
-        if AddonUpdate.can_update:
-            self.report({'INFO'}, f'{bl_info["name"]}: update available !')
-        elif AddonUpdate.new_addon_available and not AddonUpdate.current_blender_supported:
-            self.report({'ERROR'}, f'A new version is available but blender version is too old ! Minimal is {AddonUpdate.latest_minimal_blender_version}).')
-        else:
-            self.report({'INFO'}, f'{bl_info["name"]}: no update available.')
+    def execute(self, context):
+        with tracing.span(self.bl_idname):
+            # Result is applied & the panel redrawn once the background check is done
+            AddonUpdate.start_check(on_done=_log_check_result)
+            self.report({'INFO'}, f'{bl_info["name"]}: checking for update...')
 
-        if context.area:
-            context.area.tag_redraw()
-            
-        return {'FINISHED'}        
+            if context.area:
+                context.area.tag_redraw()
 
+            return {'FINISHED'}        
@@ -1,6 +1,7 @@
 import bpy
 
 from ... import bl_info
+from ...utils import tracing
 from ...utils.update import AddonUpdate
 
 
@@ -13,18 +14,26 @@ class TMLG_OT_update_download(bpy.types.Operator):
         return bpy.types.WindowManager.invoke_props_dialog(self)
 
     def execute(self, context):
-        if AddonUpdate.can_update:
-            AddonUpdate.do_update()
-
-            if AddonUpdate.update_successful:
-                self.report({'INFO'}, f'{bl_info["name"]}: update successful, blender must be restarted.')
-            else:
-                self.report({'ERROR'}, f'{bl_info["name"]}: update error, try again later. If the problem persists, save logs and contact staff.')
-
-        if context.area:
-            context.area.tag_redraw()
-                
-        return {'FINISHED'}        
+        with tracing.span(self.bl_idname):
+            if AddonUpdate.can_update:
+                wm = context.window_manager
+                wm.progress_begin(0, 100)
+                try:
+                    AddonUpdate.do_update(
+                        progress=lambda done, total: wm.progress_update(done * 100 // total if total else 0)
+                    )
+                finally:
+                    wm.progress_end()
+
+                if AddonUpdate.update_successful:
+                    self.report({'INFO'}, f'{bl_info["name"]}: update successful, blender must be restarted.')
+                else:
+                    self.report({'ERROR'}, f'{bl_info["name"]}: update error, try again later. If the problem persists, save logs and contact staff.')
+
+            if context.area:
+                context.area.tag_redraw()
+
+            return {'FINISHED'}        
 
     def draw(self, context):
         layout = self.layout
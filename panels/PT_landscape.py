@@ -0,0 +1,51 @@
+import bpy
+
+from . import _ChildPanel
+from ..operators import (
+    TMLG_OT_generate_landscape,
+    TMLG_OT_export_tiles,
+    TMLG_OT_bake_landscape,
+    TMLG_OT_bake_masks,
+)
+
+class VIEW3D_PT_landscape(_ChildPanel, bpy.types.Panel):
+    bl_label = "Landscape"
+
+    def draw_header(self, context):
+        pass
+
+    def draw(self, context):
+        props = context.scene.tmlg_props
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        col = layout.column(align=True)
+        col.prop(props, 'route_collection')
+        col.prop(props, 'landscape_collection')
+        col.prop(props, 'landscape_object')
+
+        col = layout.column(align=True)
+        col.prop(props, 'grid_blocks')
+        col.prop(props, 'grid_subdivisions')
+        col.prop(props, 'preview_subdivisions', text='Preview')
+        layout.row().prop(props, 'lod_mode', expand=True)
+
+        col = layout.column(align=True)
+        col.prop(props, 'base_height')
+        col.prop(props, 'influence_radius')
+        col.prop(props, 'route_offset')
+
+        row = layout.row(align=True)
+        row.operator(TMLG_OT_generate_landscape.bl_idname, icon='MOD_DISPLACE')
+        row.prop(props, 'auto_update', text='', icon='FILE_REFRESH')
+        row = layout.row(align=True)
+        row.operator(TMLG_OT_bake_landscape.bl_idname, icon='MESH_GRID')
+        row.operator(TMLG_OT_export_tiles.bl_idname, icon='EXPORT')
+        layout.prop(props, 'bake_collection')
+
+        col = layout.column(align=True)
+        col.prop(props, 'mask_resolution')
+        col.prop(props, 'mask_rock_slope')
+        col.prop(props, 'mask_rock_blend')
+        layout.operator(TMLG_OT_bake_masks.bl_idname, icon='TEXTURE')
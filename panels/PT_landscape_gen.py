@@ -5,12 +5,12 @@ from .. import bl_info
 from ..utils.constants import (
     GIT_REPO_URL,
 )
-from ..utils.logs import html_logs_filepath
 from ..utils.update import AddonUpdate
 from ..operators import (
     UI_OT_open_url,
     TMLG_OT_update_check,
     TMLG_OT_update_download,
+    TMLG_OT_open_logs,
 )
 
 class VIEW3D_PT_lanscape_gen(_MainPanel, bpy.types.Panel):
@@ -33,8 +33,10 @@ class VIEW3D_PT_lanscape_gen(_MainPanel, bpy.types.Panel):
                 row.alert = True
                 row.operator(TMLG_OT_update_download.bl_idname, text=f'{new_version_str}', icon='IMPORT')
                 row.alert = False
+            elif AddonUpdate.is_checking:
+                row.label(text='', icon='SORTTIME')
             else:
                 row.operator(TMLG_OT_update_check.bl_idname, text='', icon='FILE_REFRESH')
         
         row.operator(UI_OT_open_url.bl_idname, text='', icon='URL').url = GIT_REPO_URL
-        row.operator(UI_OT_open_url.bl_idname, text='', icon='FILE_TEXT').url = str(html_logs_filepath)
\ No newline at end of file
+        row.operator(TMLG_OT_open_logs.bl_idname, text='', icon='FILE_TEXT')
\ No newline at end of file
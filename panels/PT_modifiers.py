@@ -0,0 +1,40 @@
+import bpy
+
+from . import _ChildPanel
+from ..operators import (
+    TMLG_OT_modifier_inputs_refresh,
+    TMLG_OT_modifier_inputs_apply,
+)
+
+class VIEW3D_PT_modifiers(_ChildPanel, bpy.types.Panel):
+    bl_label = "Modifiers"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        pass
+
+    def draw(self, context):
+        from ..landscape.modifiers import VALUE_PROPS
+        props = context.scene.tmlg_props
+        layout = self.layout
+
+        row = layout.row(align=True)
+        row.operator(TMLG_OT_modifier_inputs_refresh.bl_idname, text='Refresh', icon='FILE_REFRESH')
+        row.prop(props, 'defer_modifier_edits', text='', icon='PAUSE')
+        if props.defer_modifier_edits:
+            row.operator(TMLG_OT_modifier_inputs_apply.bl_idname, text='Apply', icon='CHECKMARK')
+
+        if len(props.modifier_inputs) == 0:
+            layout.label(text='No TM_ modifier inputs')
+            return
+
+        col = layout.column(align=True)
+        node_group = None
+        for item in props.modifier_inputs:
+            if item.node_group != node_group:
+                node_group = item.node_group
+                col = layout.column(align=True)
+                col.label(text=node_group, icon='NODETREE')
+            row = col.row(align=True)
+            row.alert = item.is_pending
+            row.prop(item, VALUE_PROPS[item.kind], text=item.name)
@@ -0,0 +1,38 @@
+import bpy
+
+from . import _ChildPanel
+from ..utils import nodes_profiler
+from ..operators import (
+    TMLG_OT_profile_nodes,
+    TMLG_OT_profile_nodes_export,
+)
+
+# Max number of node groups shown, sorted by time per evaluation pass
+_MAX_ROWS = 20
+
+class VIEW3D_PT_profiler(_ChildPanel, bpy.types.Panel):
+    bl_label = "Node Groups Profiler"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        pass
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row(align=True)
+        row.operator(TMLG_OT_profile_nodes.bl_idname, text='Profile', icon='PREVIEW_RANGE')
+        row.operator(TMLG_OT_profile_nodes_export.bl_idname, text='', icon='EXPORT')
+
+        results = nodes_profiler.get_results()
+        if len(results) == 0:
+            layout.label(text='No profile')
+            return
+
+        grid = layout.grid_flow(row_major=True, columns=4, even_columns=False, align=True)
+        for header in ('Node Group', 'Objects', 'Mean ms', 'p95 ms'):
+            grid.label(text=header)
+        for timings in results[:_MAX_ROWS]:
+            grid.label(text=timings.node_group)
+            grid.label(text=f'{timings.object_count}')
+            grid.label(text=f'{timings.mean_ms:.2f}')
+            grid.label(text=f'{timings.p95_ms:.2f}')
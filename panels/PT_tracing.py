@@ -0,0 +1,43 @@
+import bpy
+
+from . import _ChildPanel
+from ..utils import tracing
+from ..operators import (
+    TMLG_OT_tracing_toggle,
+    TMLG_OT_tracing_reset,
+    TMLG_OT_tracing_export,
+)
+
+# Max number of spans shown, sorted by total duration
+_MAX_ROWS = 20
+
+class VIEW3D_PT_tracing(_ChildPanel, bpy.types.Panel):
+    bl_label = "Timings"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw_header(self, context):
+        pass
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row(align=True)
+        if tracing.is_enabled():
+            row.operator(TMLG_OT_tracing_toggle.bl_idname, text='Stop', icon='PAUSE', depress=True)
+        else:
+            row.operator(TMLG_OT_tracing_toggle.bl_idname, text='Record', icon='REC')
+        row.operator(TMLG_OT_tracing_reset.bl_idname, text='', icon='TRASH')
+        row.operator(TMLG_OT_tracing_export.bl_idname, text='', icon='EXPORT')
+
+        stats = sorted(tracing.get_stats().items(), key=lambda item: item[1].total_ns, reverse=True)
+        if len(stats) == 0:
+            layout.label(text='No timings recorded')
+            return
+
+        grid = layout.grid_flow(row_major=True, columns=4, even_columns=False, align=True)
+        for header in ('Span', 'Count', 'Mean ms', 'p95 ms'):
+            grid.label(text=header)
+        for name, span_stats in stats[:_MAX_ROWS]:
+            grid.label(text=name)
+            grid.label(text=f'{span_stats.count}')
+            grid.label(text=f'{span_stats.mean_ms:.2f}')
+            grid.label(text=f'{span_stats.percentile_ms(0.95):.2f}')
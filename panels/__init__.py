@@ -19,6 +19,22 @@ from .PT_configuration import (
     VIEW3D_PT_test,
 )
 
+from .PT_landscape import (
+    VIEW3D_PT_landscape,
+)
+
+from .PT_modifiers import (
+    VIEW3D_PT_modifiers,
+)
+
+from .PT_profiler import (
+    VIEW3D_PT_profiler,
+)
+
+from .PT_tracing import (
+    VIEW3D_PT_tracing,
+)
+
 
 _classes = (
     # Register order is important for panels :
@@ -26,6 +42,10 @@ _classes = (
     # - Panels registered first will appear above other panels
     VIEW3D_PT_lanscape_gen,
     VIEW3D_PT_test,
+    VIEW3D_PT_landscape,
+    VIEW3D_PT_modifiers,
+    VIEW3D_PT_profiler,
+    VIEW3D_PT_tracing,
 )
 
 def register_classes():
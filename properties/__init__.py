@@ -3,12 +3,14 @@
 # Private
 
 # Public
-from .preferences import TMLG_Prefs
-from .properties import TMLG_Props
+from .preferences import TMLG_Prefs, get_prefs
+from .properties import TMLG_CatalogFilter, TMLG_ModifierInput, TMLG_Props
 
 
 _classes = (
     TMLG_Prefs,
+    TMLG_CatalogFilter,
+    TMLG_ModifierInput,
     TMLG_Props,
 )
 
@@ -16,8 +18,10 @@ def register_classes():
     import bpy
     for cls in _classes:
         bpy.utils.register_class(cls)
+    bpy.types.Scene.tmlg_props = bpy.props.PointerProperty(type=TMLG_Props)
 
 def unregister_classes():
     import bpy
+    del bpy.types.Scene.tmlg_props
     for cls in reversed(_classes):
         bpy.utils.unregister_class(cls)
@@ -4,7 +4,8 @@ from .. import bl_info
 
 
 class TMLG_Prefs(bpy.types.AddonPreferences):
-    bl_idname = __package__
+    # Must be the addon module name, not this sub-package
+    bl_idname = __package__.rpartition('.')[0]
 
     do_check_new_release_on_startup: bpy.props.BoolProperty(
         name='Check For New Release On Startup',
@@ -12,8 +13,41 @@ class TMLG_Prefs(bpy.types.AddonPreferences):
         default=True,
     )
 
+    release_cache_ttl: bpy.props.IntProperty(
+        name='Release Cache Duration',
+        description='Minutes during which release metadata is reused without requesting github on startup',
+        default=60,
+        min=0,
+    )
+
+    worker_count: bpy.props.IntProperty(
+        name='Landscape Workers',
+        description='Processes computing the landscape in parallel. 0 uses all cores but one, 1 computes in blender only',
+        default=0,
+        min=0,
+        soft_max=32,
+    )
+
+    tile_cache_size: bpy.props.IntProperty(
+        name='Tile Cache Size',
+        description='Disk space (MiB) of the generated landscape tiles cache, least recently used tiles are deleted first. 0 disables the cache',
+        default=1024,
+        min=0,
+        soft_max=16384,
+    )
+
     def draw(self, context):
         layout = self.layout
         layout.label(text=f'{bl_info["name"]} preferences.')
         col = layout.column(align=True)
-        col.prop(self, 'do_check_new_release_on_startup')
\ No newline at end of file
+        col.prop(self, 'do_check_new_release_on_startup')
+        col.prop(self, 'release_cache_ttl')
+        col = layout.column(align=True)
+        col.prop(self, 'worker_count')
+        col.prop(self, 'tile_cache_size')
+
+
+def get_prefs() -> TMLG_Prefs | None:
+    """Return the addon preferences, None if the addon isn't enabled."""
+    addon = bpy.context.preferences.addons.get(TMLG_Prefs.bl_idname)
+    return addon.preferences if addon else None
@@ -1,5 +1,180 @@
+import math
+
 import bpy
 
+# Trackmania blocks are 32 meters wide
+BLOCK_SIZE = 32.0
+
+
+def _poll_mesh_object(self, obj) -> bool:
+    return obj.type == 'MESH'
+
+
+def _on_lod_mode_update(self, context) -> None:
+    from .. import landscape
+    landscape.set_lod(context)
+
+
+def _on_modifier_input_update(self, context) -> None:
+    from ..landscape import modifiers
+    modifiers.on_input_changed(self, context)
+
+
+class TMLG_ModifierInput(bpy.types.PropertyGroup):
+    """Input of the landscape modifiers using a node group, edited for all of them at once."""
+    node_group: bpy.props.StringProperty()
+    identifier: bpy.props.StringProperty()
+    kind: bpy.props.EnumProperty(
+        items=(
+            ('FLOAT', 'Float', ''),
+            ('INT', 'Integer', ''),
+            ('BOOLEAN', 'Boolean', ''),
+            ('VECTOR', 'Vector', ''),
+        ),
+    )
+    float_value: bpy.props.FloatProperty(update=_on_modifier_input_update)
+    int_value: bpy.props.IntProperty(update=_on_modifier_input_update)
+    bool_value: bpy.props.BoolProperty(update=_on_modifier_input_update)
+    vector_value: bpy.props.FloatVectorProperty(size=3, update=_on_modifier_input_update)
+    is_pending: bpy.props.BoolProperty()
+
+
+class TMLG_CatalogFilter(bpy.types.PropertyGroup):
+    """Catalog of the assets library, named by its path, included or excluded by the assets import."""
+    uuid: bpy.props.StringProperty()
+    depth: bpy.props.IntProperty()
+    include: bpy.props.BoolProperty(
+        name='Include',
+        description='Only link assets from the included catalogs (and their sub-catalogs). All if none included',
+    )
+    exclude: bpy.props.BoolProperty(
+        name='Exclude',
+        description='Never link assets from this catalog (and its sub-catalogs)',
+    )
+
 
 class TMLG_Props(bpy.types.PropertyGroup):
-    pass
\ No newline at end of file
+    route_collection: bpy.props.PointerProperty(
+        name='Route',
+        description='Collection of the route objects the landscape follows',
+        type=bpy.types.Collection,
+    )
+    landscape_collection: bpy.props.PointerProperty(
+        name='Landscape',
+        description='Collection of the landscape objects',
+        type=bpy.types.Collection,
+    )
+    landscape_object: bpy.props.PointerProperty(
+        name='Landscape Object',
+        description='Grid mesh object generated from the route',
+        type=bpy.types.Object,
+        poll=_poll_mesh_object,
+    )
+
+    auto_update: bpy.props.BoolProperty(
+        name='Auto Update',
+        description='Regenerate the landscape tiles around the route objects when they change',
+        default=False,
+    )
+
+    # Grid
+    grid_blocks: bpy.props.IntProperty(
+        name='Blocks',
+        description='Grid size in trackmania blocks (32m), on both axes',
+        default=48,
+        min=1,
+        soft_max=64,
+    )
+    grid_subdivisions: bpy.props.IntProperty(
+        name='Subdivisions',
+        description='Grid cells per block, on both axes',
+        default=16,
+        min=1,
+        max=64,
+    )
+
+    # Level of detail
+    lod_mode: bpy.props.EnumProperty(
+        name='Resolution',
+        description='Landscape grid resolution',
+        items=(
+            ('PREVIEW', 'Preview', 'Reduced resolution, fast to edit the route'),
+            ('FINAL', 'Final', 'Full resolution, used to bake & export'),
+        ),
+        default='FINAL',
+        update=_on_lod_mode_update,
+    )
+    preview_subdivisions: bpy.props.IntProperty(
+        name='Preview Subdivisions',
+        description='Grid cells per block, on both axes, in preview resolution',
+        default=4,
+        min=1,
+        max=64,
+    )
+    preview_mesh: bpy.props.PointerProperty(type=bpy.types.Mesh)
+    final_mesh: bpy.props.PointerProperty(type=bpy.types.Mesh)
+
+    # Heights
+    base_height: bpy.props.FloatProperty(
+        name='Base Height',
+        description='Landscape height far from the route',
+        default=0.0,
+        subtype='DISTANCE',
+    )
+    influence_radius: bpy.props.FloatProperty(
+        name='Influence Radius',
+        description='Distance at which the route stops shaping the landscape',
+        default=64.0,
+        min=1.0,
+        subtype='DISTANCE',
+    )
+    route_offset: bpy.props.FloatProperty(
+        name='Route Offset',
+        description='Landscape height relative to the route surface',
+        default=-0.5,
+        subtype='DISTANCE',
+    )
+
+    # Modifiers editor
+    modifier_inputs: bpy.props.CollectionProperty(type=TMLG_ModifierInput)
+    defer_modifier_edits: bpy.props.BoolProperty(
+        name='Defer Edits',
+        description='Keep the edited modifier inputs pending until applied, instead of applying them right away',
+        default=False,
+    )
+
+    # Bake
+    bake_collection: bpy.props.PointerProperty(
+        name='Baked',
+        description='Collection of the static tile objects baked from the landscape',
+        type=bpy.types.Collection,
+    )
+
+    # Masks
+    mask_resolution: bpy.props.EnumProperty(
+        name='Mask Resolution',
+        description='Size of the splat & weights mask images',
+        items=(
+            ('1024', '1K', '1024 x 1024 pixels'),
+            ('2048', '2K', '2048 x 2048 pixels'),
+            ('4096', '4K', '4096 x 4096 pixels'),
+            ('8192', '8K', '8192 x 8192 pixels'),
+        ),
+        default='2048',
+    )
+    mask_rock_slope: bpy.props.FloatProperty(
+        name='Rock Slope',
+        description='Slope where the rock starts to replace the grass & dirt',
+        default=math.radians(30),
+        min=0.0,
+        max=math.radians(90),
+        subtype='ANGLE',
+    )
+    mask_rock_blend: bpy.props.FloatProperty(
+        name='Rock Blend',
+        description='Slope range of the transition to rock',
+        default=math.radians(10),
+        min=0.0,
+        max=math.radians(90),
+        subtype='ANGLE',
+    )
@@ -0,0 +1,34 @@
+"""Generate the landscape of a map with the addon of this repository, in headless blender:
+
+`blender -b --factory-startup map.blend --python scripts/generate_map.py -- [--report map.json] [--no-save]`
+
+See `batch.py` of the addon for the arguments.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+ADDON_ROOT = Path(__file__).resolve().parent.parent
+ADDON_MODULE = 'tm_landscape_generator'
+
+
+def import_addon():
+    """Import the addon package from this repository, whatever its directory name."""
+    if ADDON_MODULE in sys.modules:
+        return sys.modules[ADDON_MODULE]
+    spec = importlib.util.spec_from_file_location(
+        ADDON_MODULE,
+        ADDON_ROOT / '__init__.py',
+        submodule_search_locations=[str(ADDON_ROOT)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_MODULE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+if __name__ == '__main__':
+    import_addon()
+    from tm_landscape_generator import batch
+    batch.main()
@@ -0,0 +1,173 @@
+"""Generate the landscapes of a directory of maps, in parallel headless blender processes.
+
+`python scripts/generate_maps.py <maps_dir> [--blender PATH] [--jobs N] [--output DIR] [--retry-failed]`
+
+Each map is processed by `scripts/generate_map.py` in its own blender process, at most --jobs at once.
+Reports are written to `<output>/<map>.json` (sub-directories joined by `__`) & summed up in `<output>/summary.json`.
+
+Progress is saved in `<output>/progress.json` after each map: running the same command again
+skips the maps already done (unless modified since), so an interrupted batch resumes where it stopped.
+Failed maps are retried with --retry-failed.
+
+This script runs with any python 3.10+, it doesn't need blender modules.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+MAP_SCRIPT = Path(__file__).resolve().parent / 'generate_map.py'
+PROGRESS_FILENAME = 'progress.json'
+SUMMARY_FILENAME = 'summary.json'
+
+
+#---------------------------------------------------------------------------
+#   Progress
+#---------------------------------------------------------------------------
+
+class Progress():
+    """Status of each map, saved to a JSON file after every change."""
+
+    def __init__(self, filepath: Path) -> None:
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        self.maps: dict[str, dict] = {}
+        if filepath.exists():
+            with open(filepath, encoding='utf-8') as f:
+                self.maps = json.load(f).get('maps', {})
+
+    def is_done(self, map_path: Path, retry_failed: bool) -> bool:
+        """Return True if the map was processed & not modified since."""
+        entry = self.maps.get(str(map_path))
+        if entry is None or entry['mtime_ns'] != map_path.stat().st_mtime_ns:
+            return False
+        return entry['status'] in ('ok', 'skipped') or (entry['status'] == 'error' and not retry_failed)
+
+    def set(self, map_path: Path, report: dict) -> None:
+        with self._lock:
+            self.maps[str(map_path)] = {
+                'status'    : report['status'],
+                'mtime_ns'  : map_path.stat().st_mtime_ns, # after the save
+                'report'    : report,
+            }
+            # Write a temporary file then replace, an interruption never corrupts the progress
+            tmp_filepath = self.filepath.with_suffix('.tmp')
+            with open(tmp_filepath, mode='w', encoding='utf-8') as f:
+                json.dump({'maps': self.maps}, f, indent=1)
+            os.replace(tmp_filepath, self.filepath)
+
+
+#---------------------------------------------------------------------------
+#   Maps processing
+#---------------------------------------------------------------------------
+
+def find_maps(dirpath: Path) -> list[Path]:
+    return sorted(path.resolve() for path in dirpath.rglob('*.blend') if path.is_file())
+
+
+def get_report_path(output: Path, maps_dir: Path, map_path: Path) -> Path:
+    """Report of "<maps_dir>/a/b.blend" is "<output>/a__b.json", maps in sub-directories can share names."""
+    relative = map_path.relative_to(maps_dir.resolve()).with_suffix('')
+    return output / f'{"__".join(relative.parts)}.json'
+
+
+def process_map(blender: str, map_path: Path, report_path: Path, timeout: float | None, save: bool) -> dict:
+    """Run blender on the map, return its report."""
+    command = [
+        blender, '-b', '--factory-startup', str(map_path),
+        '--python', str(MAP_SCRIPT),
+        '--', '--report', str(report_path),
+    ]
+    if not save:
+        command.append('--no-save')
+
+    report_path.unlink(missing_ok=True)
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        returncode, output = result.returncode, result.stdout + result.stderr
+    except subprocess.TimeoutExpired:
+        returncode, output = None, f'Timed out after {timeout}s'
+    duration = time.perf_counter() - start
+
+    if report_path.exists():
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+    else:
+        # Blender crashed or timed out before writing the report
+        report = {'filepath': str(map_path), 'status': 'error', 'error': output[-2000:], 'timings': {}}
+    report['returncode'] = returncode
+    report['timings']['process'] = duration
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('maps_dir', type=Path, help='Directory of the .blend maps, searched recursively')
+    parser.add_argument('--blender', default=os.environ.get('BLENDER', 'blender'), help='Blender executable, $BLENDER by default')
+    parser.add_argument('--jobs', '-j', type=int, default=max(1, (os.cpu_count() or 2) // 2), help='Blender processes at once')
+    parser.add_argument('--output', type=Path, help='Reports directory, <maps_dir>/tmlg_reports by default')
+    parser.add_argument('--timeout', type=float, default=None, help='Seconds before a map is cancelled')
+    parser.add_argument('--retry-failed', action='store_true', help='Process again the maps which failed')
+    parser.add_argument('--no-save', action='store_true', help="Don't save the maps")
+    args = parser.parse_args(argv)
+
+    if shutil.which(args.blender) is None and not Path(args.blender).is_file():
+        parser.error(f'Blender executable not found: {args.blender}')
+
+    output = args.output or args.maps_dir / 'tmlg_reports'
+    output.mkdir(parents=True, exist_ok=True)
+    progress = Progress(output / PROGRESS_FILENAME)
+
+    maps = find_maps(args.maps_dir)
+    todo = [map_path for map_path in maps if not progress.is_done(map_path, args.retry_failed)]
+    print(f'{len(maps)} maps, {len(maps) - len(todo)} already done, processing {len(todo)} with {args.jobs} jobs')
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(
+                process_map,
+                args.blender,
+                map_path,
+                get_report_path(output, args.maps_dir, map_path),
+                args.timeout,
+                not args.no_save,
+            ): map_path
+            for map_path in todo
+        }
+        try:
+            for i, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                map_path = futures[future]
+                report = future.result()
+                progress.set(map_path, report)
+                print(f'[{i}/{len(todo)}] {report["status"]:7} {report["timings"]["process"]:6.1f}s  {map_path}')
+        except KeyboardInterrupt:
+            print('Interrupted, run again to resume')
+            executor.shutdown(wait=False, cancel_futures=True)
+            return 130
+
+    statuses = [entry['status'] for entry in progress.maps.values()]
+    summary = {
+        'maps'      : len(progress.maps),
+        'ok'        : statuses.count('ok'),
+        'skipped'   : statuses.count('skipped'),
+        'error'     : statuses.count('error'),
+        'duration'  : time.perf_counter() - start,
+        'reports'   : {path: entry['report'] for path, entry in progress.maps.items()},
+    }
+    with open(output / SUMMARY_FILENAME, mode='w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=1)
+    print(f'{summary["ok"]} ok, {summary["skipped"]} skipped, {summary["error"]} errors, summary in {output / SUMMARY_FILENAME}')
+    return 1 if summary['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,15 +4,27 @@
 - on_active_scene
 - on_load_post
 - on_save_post
+- on_depsgraph_update
+
+Subsystems should not hook these routines, but subscribe to the debounced
+events of `event_bus` which they notify.
 """
 
 import bpy
 from bpy.app.handlers import persistent
 
 from . import logs
+from . import tracing
+from . import event_bus
+from .event_bus import Event
+from .update import AddonUpdate
+from ..properties import get_prefs
 
 log = logs.get_logger(__name__)
 
+# Seconds between blender startup & the update check
+_STARTUP_CHECK_DELAY = 2.0
+
 # Objects that will store handle to the msgbus subscription
 _active_obj_handle_owner = object()
 _active_scene_handle_owner = object()
@@ -23,39 +35,73 @@ _active_scene_handle_owner = object()
 #---------------------------------------------------------------------------
 
 # Do stuff when active object changes
+@tracing.traced('on_active_obj')
 def _on_active_obj(*args) -> None:
     """Run when active object changes:
     
     - When a different object is clicked in viewport
     - Everytime an object is clicked is outliner"""
-    pass
+    event_bus.notify(Event.ACTIVE_OBJECT)
 
 
 # Do stuff when active scene changes
+@tracing.traced('on_active_scene')
 def _on_active_scene(*args) -> None:
     """Run when active scene changes:
     
     - Doesn't trigger when a scene is created or deleted..."""
-    pass
+    event_bus.notify(Event.ACTIVE_SCENE)
+
+
+# Start the update check once blender UI is up
+def _start_startup_check() -> None:
+    prefs = get_prefs()
+    if prefs is not None and prefs.do_check_new_release_on_startup:
+        AddonUpdate.start_check(ttl=prefs.release_cache_ttl * 60)
 
 
 # Do stuff after blender startup
 @persistent
+@tracing.traced('on_load_post')
 def _on_load_post(filepath) -> None:
     """Run post blender startup & file load"""
     if filepath == "":
         # Runs post startup
-        bpy.ops.tmlg.update_check()
+        if not bpy.app.timers.is_registered(_start_startup_check):
+            bpy.app.timers.register(_start_startup_check, first_interval=_STARTUP_CHECK_DELAY)
     else:
         # Runs post file load
         pass
 
+    # Pending events refer to the previous file
+    event_bus.stop()
+    event_bus.notify(Event.LOAD, filepath)
+
 
 # Do stuff after blender file save
 @persistent
+@tracing.traced('on_save_post')
 def _on_save_post(filepath)-> None:
     """Run post blender file save"""
     log.info('Running post save routine...')
+    event_bus.notify(Event.SAVE, filepath)
+
+
+# Do stuff after depsgraph evaluation
+@persistent
+def _on_depsgraph_update(scene, depsgraph) -> None:
+    """Run after each depsgraph update, keep it fast:
+
+    - Notify the names of the objects whose transform or geometry changed"""
+    if not event_bus.has_subscribers(Event.DEPSGRAPH):
+        return
+
+    names = [
+        update.id.original.name for update in depsgraph.updates
+        if isinstance(update.id, bpy.types.Object) and (update.is_updated_transform or update.is_updated_geometry)
+    ]
+    if len(names) > 0:
+        event_bus.notify(Event.DEPSGRAPH, *names)
 
 
 #---------------------------------------------------------------------------
@@ -95,7 +141,7 @@ def _subscribe_active_scene(dummy) -> None:
 # Remove subscriber from msgbus
 @persistent
 def _unsubscribe_active_scene(dummy) -> None:
-    bpy.msgbus.clear_by_owner(_active_obj_handle_owner)
+    bpy.msgbus.clear_by_owner(_active_scene_handle_owner)
 
 
 #---------------------------------------------------------------------------
@@ -120,6 +166,9 @@ def start_listening() -> None:
     if _on_save_post not in bpy.app.handlers.save_post:
         bpy.app.handlers.save_post.append(_on_save_post)
 
+    if _on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+
 
 # Delete event handlers
 def stop_listening() -> None:
@@ -137,4 +186,12 @@ def stop_listening() -> None:
         bpy.app.handlers.load_post.remove(_on_load_post)
 
     if _on_save_post in bpy.app.handlers.save_post:
-        bpy.app.handlers.save_post.remove(_on_save_post)
\ No newline at end of file
+        bpy.app.handlers.save_post.remove(_on_save_post)
+
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+
+    event_bus.stop()
+
+    if bpy.app.timers.is_registered(_start_startup_check):
+        bpy.app.timers.unregister(_start_startup_check)
\ No newline at end of file
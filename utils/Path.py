@@ -23,4 +23,11 @@ def get_blenderfile_path() -> Path:
 
 def get_assets_dirname() -> str:
     """Returns the addon assets directory."""
-    return make_path(get_addon_path(), 'assets')
\ No newline at end of file
+    return make_path(get_addon_path(), 'assets')
+
+
+def get_user_cache_path(create: bool = True) -> Path:
+    """Returns the addon directory in blender user config, created if not exists and create is True.
+
+    Unlike the addon path, it is writable and kept across addon updates."""
+    return make_path(bpy.utils.user_resource('CONFIG', path=get_addon_path().name, create=create))
@@ -1,3 +1,7 @@
 # Github URLs
 GIT_REPO_URL = 'https://github.com/Skyrooow/TM-Landscape-Generator.git'
-URL_RELEASES = "https://api.github.com/repos/Skyrooow/TM-Landscape-Generator/releases"
\ No newline at end of file
+URL_RELEASES = "https://api.github.com/repos/Skyrooow/TM-Landscape-Generator/releases"
+URL_RAW = "https://raw.githubusercontent.com/Skyrooow/TM-Landscape-Generator"
+
+# Network
+REQUEST_TIMEOUT = 10 # seconds
@@ -0,0 +1,102 @@
+"""Debounced event bus: subsystems subscribe to typed events, notifications are coalesced.
+
+Function | Use
+:---|:---
+subscribe(event, callback)    | Call `callback(items)` once after each burst of the event
+unsubscribe(event, callback)  | Remove a subscriber
+has_subscribers(event)        | Return True if the event has subscribers
+notify(event, *items)         | Mark the event dirty, items are merged into its pending payload
+flush()                       | Run the subscribers of the dirty events now
+stop()                        | Forget the dirty events & stop the timer
+
+Notifications only set a dirty flag: subscribers are called from a `bpy.app.timers` function
+once no notification happened for DEBOUNCE seconds, so a burst of 50 selection changes
+results in one call, with the items of all the notifications.
+"""
+
+import enum
+import time
+from typing import Callable, Hashable
+
+import bpy
+
+from . import logs
+from . import tracing
+
+log = logs.get_logger(__name__)
+
+# Seconds without notification before subscribers are called
+DEBOUNCE = 0.1
+
+
+class Event(enum.Enum):
+    ACTIVE_OBJECT   = 'active_object'   # no items
+    ACTIVE_SCENE    = 'active_scene'    # no items
+    DEPSGRAPH       = 'depsgraph'       # names of the updated objects
+    LOAD            = 'load'            # loaded filepath
+    SAVE            = 'save'            # saved filepath
+
+
+_subscribers: dict[Event, list[Callable[[frozenset], None]]] = {}
+_dirty: dict[Event, set] = {}
+_last_notify = 0.0
+
+
+def subscribe(event: Event, callback: Callable[[frozenset], None]) -> None:
+    callbacks = _subscribers.setdefault(event, [])
+    if callback not in callbacks:
+        callbacks.append(callback)
+
+
+def unsubscribe(event: Event, callback: Callable[[frozenset], None]) -> None:
+    callbacks = _subscribers.get(event, [])
+    if callback in callbacks:
+        callbacks.remove(callback)
+    if len(callbacks) == 0:
+        _subscribers.pop(event, None)
+
+
+def has_subscribers(event: Event) -> bool:
+    return event in _subscribers
+
+
+def notify(event: Event, *items: Hashable) -> None:
+    """Mark the event dirty, its subscribers will be called once the notifications stop."""
+    global _last_notify
+    if event not in _subscribers:
+        return
+
+    _dirty.setdefault(event, set()).update(items)
+    _last_notify = time.monotonic()
+    if not bpy.app.timers.is_registered(_flush_timer):
+        bpy.app.timers.register(_flush_timer, first_interval=DEBOUNCE)
+
+
+def _flush_timer() -> float | None:
+    remaining = DEBOUNCE - (time.monotonic() - _last_notify)
+    if remaining > 0:
+        # Notified during the wait, debounce again
+        return remaining
+    flush()
+    return None
+
+
+@tracing.traced('event_bus.flush')
+def flush() -> None:
+    """Call the subscribers of each dirty event, once, with the merged items."""
+    pending = dict(_dirty)
+    _dirty.clear()
+    for event, items in pending.items():
+        items = frozenset(items)
+        for callback in list(_subscribers.get(event, ())):
+            try:
+                callback(items)
+            except Exception:
+                log.exception(f'Error in {event.name} subscriber {callback.__qualname__}')
+
+
+def stop() -> None:
+    """Forget the dirty events without calling subscribers, and stop the timer."""
+    _dirty.clear()
+    if bpy.app.timers.is_registered(_flush_timer):
+        bpy.app.timers.unregister(_flush_timer)
@@ -1,13 +1,17 @@
-"""Formatted logging with colors in console & in html file
+"""Formatted logging with colors in console & in rotating json lines files
 
 Function | Use
 :---|:---
 start_logging() | Start handling log messages
 stop_logging()  | Stop handling log messages
 get_logger(name)| Return a logger with the specified name
+render_html()   | Write the html report of the logs files
 
 For each file, create a logger object: `log = logs.get_logger(__name__)`
 
+Records are filtered by level on the calling thread, then formatted & written
+by a listener thread, so logging doesn't block blender.
+
 Logging level | Example | Note
 :---|:---|:---
 DEBUG     | `log.debug("Debug msg")`
@@ -19,11 +23,15 @@ CRITICAL  | `log.critical("Critical msg", stack_info=True)`
 """
 
 import logging
+import logging.handlers
+import functools
+import queue
+import json
 import html
 import platform
 import textwrap
-import copy
 import bpy
+from pathlib import Path
 
 from . import path
 from .. import (
@@ -32,24 +40,95 @@ from .. import (
 )
 
 
-html_logs_filepath = path.get_addon_path() / 'logs.html'
+# Logs are written outside of the addon directory, which is replaced by updates
+# Directory is created when the first record is written
+logs_dirpath = path.get_user_cache_path(create=False) / 'logs'
+jsonl_logs_filepath = logs_dirpath / 'logs.jsonl'
+html_logs_filepath = logs_dirpath / 'logs.html'
+
+# Rotation of the json lines logs: max file size in bytes & number of rotated files kept
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Debug informations are gathered on first use, platform functions may be slow
+@functools.cache
+def get_debug_info() -> dict:
+    return {
+        'bl_version'    : bpy.app.version_string,
+        'addon_version' : '.'.join(str(i) for i in bl_info["version"]),
+        'blender_bin'   : bpy.app.binary_path,
+        'addon_path'     : path.get_addon_path(),
+        'platform'      : platform.platform(),
+        'architecture'  : ' - '.join(str(i) for i in platform.architecture()),
+        'processor'     : platform.processor(),
+        'py_version'    : platform.python_version(),
+    }
+
+#---------------------------------------------------------------------------
+#   Style Formatter base classe
+#---------------------------------------------------------------------------
+
+class _RecordFields():
+    """Read-only mapping of a record attributes, with some overridden fields.
+
+    Lets multiple formatters handle the same record without copying nor editing it."""
+    __slots__ = ('record', 'fields')
+
+    def __init__(self, record: logging.LogRecord, fields: dict) -> None:
+        self.record = record
+        self.fields = fields
+
+    def __getitem__(self, key: str):
+        try:
+            return self.fields[key]
+        except KeyError:
+            return self.record.__dict__[key]
+
+
+class _StyleFormatter(logging.Formatter):
+    """Base of formatters which style the record fields by level.
+
+    One format string is prepared per level, with styled level name, logger name & thread name."""
+    level_to_color = {}
+
+    def __init__(self, fmt: str | None = None, datefmt: str | None = None) -> None:
+        super().__init__(fmt, datefmt)
+        self._level_fmts = {levelno: self._style_fmt(self._fmt, levelno) for levelno in self.level_to_color}
+
+    def _style_fmt(self, fmt: str, levelno: int) -> str:
+        """Return the format string of a level."""
+        return fmt
+
+    def style_message(self, message: str) -> str:
+        return message
+
+    def style_exception(self, text: str) -> str:
+        return text
+
+    def style_stack(self, text: str) -> str:
+        return text
+
+    def format(self, record) -> str:
+        fields = {'message': self.style_message(record.getMessage())}
+        if self.usesTime():
+            fields['asctime'] = self.formatTime(record, self.datefmt)
+        s = self._level_fmts.get(record.levelno, self._fmt) % _RecordFields(record, fields)
+
+        # Plain exception text is cached on the record, like logging.Formatter does
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter.formatException(self, record.exc_info)
+        if record.exc_text:
+            s = f'{s}\n{self.style_exception(record.exc_text)}'
+        if record.stack_info:
+            s = f'{s}\n{self.style_stack(logging.Formatter.formatStack(self, record.stack_info))}'
+        return s
 
-_debug_info={
-    'bl_version'    : bpy.app.version_string,
-    'addon_version' : '.'.join(str(i) for i in bl_info["version"]),
-    'blender_bin'   : bpy.app.binary_path,
-    'addon_path'     : path.get_addon_path(),
-    'platform'      : platform.platform(),
-    'architecture'  : ' - '.join(str(i) for i in platform.architecture()),
-    'processor'     : platform.processor(),
-    'py_version'    : platform.python_version(),
-}
 
 #---------------------------------------------------------------------------
 #   Console Formatter classe
 #---------------------------------------------------------------------------
 
-class _ConsoleStyleFormatter(logging.Formatter):
+class _ConsoleStyleFormatter(_StyleFormatter):
     """This is a formatter which add escape codes to the record."""
     level_to_color = {
         logging.DEBUG       :   '1;34', # bright blue
@@ -59,33 +138,30 @@ class _ConsoleStyleFormatter(logging.Formatter):
         logging.CRITICAL    :   '1;35', # bright magenta   
     }
 
-    def format(self, record) -> str:
-        # Do not edit the original record, this let multiple formatters handling the same record 
-        cpyRecord = copy.copy(record) 
-
-        levelcolor = self.level_to_color[cpyRecord.levelno]
-        
-        cpyRecord.levelname     = f'\x1b[{levelcolor}m{cpyRecord.levelname:^9}\x1b[0m'
-        cpyRecord.name          = f'\x1b[{levelcolor}m{cpyRecord.name}\x1b[0m'
-        cpyRecord.threadName    = f'\x1b[{levelcolor}m{cpyRecord.threadName}\x1b[0m'
-        cpyRecord.msg           = f'\x1b[2m{cpyRecord.msg}\x1b[0m' # faint
-        return super().format(cpyRecord)
+    def _style_fmt(self, fmt: str, levelno: int) -> str:
+        levelcolor = self.level_to_color[levelno]
+        levelname = f'{logging.getLevelName(levelno):^9}'
+        fmt = fmt.replace('%(levelname)s', f'\x1b[{levelcolor}m{levelname}\x1b[0m')
+        fmt = fmt.replace('%(name)s', f'\x1b[{levelcolor}m%(name)s\x1b[0m')
+        fmt = fmt.replace('%(threadName)s', f'\x1b[{levelcolor}m%(threadName)s\x1b[0m')
+        fmt = fmt.replace('%(message)s', '\x1b[2m%(message)s\x1b[0m') # faint
+        return fmt
 
     def formatTime(self, record, datefmt=None) -> str:
         return f'\x1b[2m{super().formatTime(record, datefmt)}\x1b[0m' # faint
     
-    def formatException(self, ei) -> str:
-        return f'\x1b[36m{super().formatException(ei)}\x1b[0m' # cyan
+    def style_exception(self, text: str) -> str:
+        return f'\x1b[36m{text}\x1b[0m' # cyan
     
-    def formatStack(self, stack_info) -> str:
-        return f'\x1b[36m{super().formatStack(stack_info)}\x1b[0m' # cyan
+    def style_stack(self, text: str) -> str:
+        return f'\x1b[36m{text}\x1b[0m' # cyan
 
 
 #---------------------------------------------------------------------------
 #   Html Formatter classe
 #---------------------------------------------------------------------------
 
-class _HtmlStyleFormatter(logging.Formatter):
+class _HtmlStyleFormatter(_StyleFormatter):
     """This is a formatter which add html balises to the record."""
     level_to_color = {
         logging.DEBUG       :   'l1',
@@ -94,29 +170,119 @@ class _HtmlStyleFormatter(logging.Formatter):
         logging.ERROR       :   'l4',
         logging.CRITICAL    :   'l5'    
     }
- 
-    def format(self, record) -> str:
-        # Do not edit the original record, this let multiple formatters handling the same record
-        cpyRecord = copy.copy(record)
 
-        levelcolor = self.level_to_color[cpyRecord.levelno]
-        
-        cpyRecord.levelname     = f'<span class="{levelcolor}">{cpyRecord.levelname:^9}</span>'
-        cpyRecord.name          = f'<span class="{levelcolor}">{cpyRecord.name}</span>'
-        cpyRecord.threadName    = f'<span class="{levelcolor}">{cpyRecord.threadName}</span>'
-        cpyRecord.msg           = f'<span class="msg">{html.escape(cpyRecord.msg)}</span>'
-        return super().format(cpyRecord)
+    def _style_fmt(self, fmt: str, levelno: int) -> str:
+        levelcolor = self.level_to_color[levelno]
+        levelname = f'{logging.getLevelName(levelno):^9}'
+        fmt = fmt.replace('%(levelname)s', f'<span class="{levelcolor}">{levelname}</span>')
+        fmt = fmt.replace('%(name)s', f'<span class="{levelcolor}">%(name)s</span>')
+        fmt = fmt.replace('%(threadName)s', f'<span class="{levelcolor}">%(threadName)s</span>')
+        fmt = fmt.replace('%(message)s', '<span class="msg">%(message)s</span>')
+        return fmt
+
+    def style_message(self, message: str) -> str:
+        return html.escape(message)
 
     def formatTime(self, record, datefmt=None) -> str:
         return f'<span class="t">{super().formatTime(record, datefmt)}</span>'
     
-    def formatException(self, exc_info) -> str:
-        return f'<span class="ei">{html.escape(super().formatException(exc_info))}</span>' 
+    def style_exception(self, text: str) -> str:
+        return f'<span class="ei">{html.escape(text)}</span>' 
     
-    def formatStack(self, stack_info) -> str:
-        return f'<span class="si">{html.escape(super().formatStack(stack_info))}</span>'
+    def style_stack(self, text: str) -> str:
+        return f'<span class="si">{html.escape(text)}</span>'
     
 
+#---------------------------------------------------------------------------
+#   Json lines Formatter & Handler classes
+#---------------------------------------------------------------------------
+
+class _JsonLinesFormatter(logging.Formatter):
+    """This is a formatter which serializes the record on a single json line."""
+
+    def format(self, record) -> str:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        line = {
+            't'         : record.created,
+            'lvl'       : record.levelno,
+            'name'      : record.name,
+            'thread'    : record.threadName,
+            'msg'       : record.getMessage(),
+        }
+        if record.exc_text:
+            line['exc'] = record.exc_text
+        if record.stack_info:
+            line['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(line, ensure_ascii=False)
+
+
+class _JsonLinesHandler(logging.handlers.RotatingFileHandler):
+    """Rotating json lines file, each file starts with a session line holding the debug informations."""
+
+    def _open(self):
+        logs_dirpath.mkdir(parents=True, exist_ok=True)
+        stream = super()._open()
+        if stream.tell() == 0:
+            stream.write(json.dumps({'session': {k: str(v) for k, v in get_debug_info().items()}}) + self.terminator)
+        return stream
+
+
+def _read_jsonl_logs():
+    """Yield the json lines of all the log files, oldest first."""
+    filepaths = [path.make_path(f'{jsonl_logs_filepath}.{i}') for i in range(LOG_BACKUP_COUNT, 0, -1)]
+    filepaths.append(jsonl_logs_filepath)
+    for filepath in filepaths:
+        try:
+            with open(filepath, mode='r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue # truncated line
+        except FileNotFoundError:
+            continue
+
+
+def render_html() -> Path:
+    """Write the html logs report from the json lines logs, streaming them. Return the report filepath."""
+    _jsonl_handler.flush()
+    formatter = _HtmlStyleFormatter(fmt=_debug_fmt)
+
+    logs_dirpath.mkdir(parents=True, exist_ok=True)
+    with open(file=html_logs_filepath, mode='w', encoding='utf-8') as f:
+        f.write(_html_metadata)
+        for line in _read_jsonl_logs():
+            if 'session' in line:
+                f.write(_html_header % line['session'])
+                continue
+            record = logging.makeLogRecord({
+                'name'      : line['name'],
+                'levelno'   : line['lvl'],
+                'levelname' : logging.getLevelName(line['lvl']),
+                'msg'       : line['msg'],
+                'created'   : line['t'],
+                'msecs'     : (line['t'] - int(line['t'])) * 1000,
+                'threadName': line['thread'],
+                'exc_text'  : line.get('exc'),
+                'stack_info': line.get('stack'),
+            })
+            f.write(formatter.format(record))
+            f.write('\n')
+    return html_logs_filepath
+
+
+#---------------------------------------------------------------------------
+#   Queue Handler classe
+#---------------------------------------------------------------------------
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records as they are: formatting is done by the listener thread handlers."""
+
+    def prepare(self, record) -> logging.LogRecord:
+        return record
+
+
 #---------------------------------------------------------------------------
 #   Filter class
 #---------------------------------------------------------------------------
@@ -124,7 +290,8 @@ class _HtmlStyleFormatter(logging.Formatter):
 class _LogsPackageFilter(logging.Filter):
 
     def filter(record):
-        return record.name.startswith(__package__)
+        # Addon root package, not this sub-package
+        return record.name.startswith(__package__.rpartition('.')[0])
     
 
 #---------------------------------------------------------------------------
@@ -162,11 +329,7 @@ _html_header = textwrap.dedent('\
         %(processor)s\n\
         Python: %(py_version)s\n\
     </header>\n\n\
-    ') % _debug_info
-
-with open(file=html_logs_filepath, mode='w', encoding='utf-8') as f:
-    f.write(_html_metadata)
-    f.write(_html_header)
+    ')
 
 # Format strings
 _min_fmt     = '%(levelname)s %(name)s: %(message)s'
@@ -180,16 +343,28 @@ if LOG_DEBUG:
     _level = logging.DEBUG
     _fmt = _debug_fmt
 
-# Configure Handlers
+# Configure Handlers, called from the listener thread
 _console_handler = logging.StreamHandler()
 _console_handler.setLevel(_level)
 _console_handler.setFormatter(_ConsoleStyleFormatter(_fmt))
-_console_handler.addFilter(_LogsPackageFilter)
 
-_html_handler = logging.FileHandler(filename=html_logs_filepath, mode='a', encoding='utf-8')
-_html_handler.setLevel(_level)
-_html_handler.setFormatter(_HtmlStyleFormatter(fmt=_fmt))
-_html_handler.addFilter(_LogsPackageFilter)
+_jsonl_handler = _JsonLinesHandler(
+    filename=jsonl_logs_filepath,
+    maxBytes=LOG_MAX_BYTES,
+    backupCount=LOG_BACKUP_COUNT,
+    encoding='utf-8',
+    delay=True,
+)
+_jsonl_handler.setLevel(_level)
+_jsonl_handler.setFormatter(_JsonLinesFormatter())
+
+# Records are filtered on the main thread, then formatted & written by the listener thread
+_queue = queue.SimpleQueue()
+_queue_handler = _QueueHandler(_queue)
+_queue_handler.setLevel(_level)
+_queue_handler.addFilter(_LogsPackageFilter)
+
+_listener = logging.handlers.QueueListener(_queue, _console_handler, _jsonl_handler, respect_handler_level=True)
 
 # Set root logger level
 _root_logger = logging.getLogger()
@@ -210,12 +385,10 @@ def get_logger(name: str | None = None) -> logging.Logger:
 
 # Add handlers to root logger
 def start_logging() -> None:
-    """Add console & file handlers to the root logger."""
-    if _console_handler not in _root_logger.handlers:   
-        _root_logger.addHandler(_console_handler)
-
-    if _html_handler not in _root_logger.handlers:
-        _root_logger.addHandler(_html_handler)
+    """Add queue handler to the root logger & start the listener thread."""
+    if _queue_handler not in _root_logger.handlers:   
+        _root_logger.addHandler(_queue_handler)
+        _listener.start()
     
     if LOG_DEBUG:
         get_logger(__name__).warning("DEBUG & INFO logging is enabled !")
@@ -223,9 +396,10 @@ def start_logging() -> None:
    
 # Remove handlers from root logger
 def stop_logging() -> None:
-    """Remove console & file handlers from the root logger."""
-    if _console_handler in _root_logger.handlers:   
-        _root_logger.removeHandler(_console_handler)
+    """Remove queue handler from the root logger, then write pending records & stop the listener thread."""
+    if _queue_handler in _root_logger.handlers:   
+        _root_logger.removeHandler(_queue_handler)
+        _listener.stop()
         
-    if _html_handler in _root_logger.handlers:
-        _root_logger.removeHandler(_html_handler)
\ No newline at end of file
+    _console_handler.flush()
+    _jsonl_handler.close()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Geometry nodes modifiers profiler, for the `TM_` node groups of the scene.
+
+Function | Use
+:---|:---
+get_profiled_modifiers(objects)  | Return the (object, modifier) using a `TM_` node group
+profile(context, iterations)     | Evaluate the depsgraph repeatedly & record each modifier execution time
+get_results()                    | Return the last results, ranked by cost per evaluation
+export_csv(filepath) / export_json(filepath) | Write the last results
+
+Each iteration tags the profiled objects and evaluates the view layer,
+then reads the `execution_time` blender measured for each modifier.
+"""
+
+import csv
+import json
+import math
+from dataclasses import dataclass
+
+import bpy
+
+from . import logs
+from . import tracing
+
+log = logs.get_logger(__name__)
+
+NODE_GROUP_PREFIX = 'TM_'
+
+
+@dataclass
+class NodeGroupTimings:
+    """Execution times (seconds) of the modifiers using a node group, one sample per modifier & iteration."""
+    node_group: str
+    object_count: int
+    samples: list[float]
+    iterations: int
+
+    @property
+    def mean_ms(self) -> float:
+        return sum(self.samples) / len(self.samples) * 1000 if self.samples else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        if len(self.samples) == 0:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(math.ceil(0.95 * len(ordered)) - 1, len(ordered) - 1)] * 1000
+
+    @property
+    def pass_ms(self) -> float:
+        """Mean time of the node group over all its objects, per evaluation pass."""
+        return sum(self.samples) / self.iterations * 1000 if self.iterations else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'node_group'    : self.node_group,
+            'object_count'  : self.object_count,
+            'mean_ms'       : self.mean_ms,
+            'p95_ms'        : self.p95_ms,
+            'pass_ms'       : self.pass_ms,
+            'samples'       : len(self.samples),
+        }
+
+
+_results: list[NodeGroupTimings] = []
+
+
+def get_profiled_modifiers(objects) -> list[tuple[bpy.types.Object, bpy.types.NodesModifier]]:
+    return [
+        (obj, modifier) for obj in objects for modifier in obj.modifiers
+        if modifier.type == 'NODES' and modifier.node_group and modifier.node_group.name.startswith(NODE_GROUP_PREFIX)
+    ]
+
+
+@tracing.traced('nodes_profiler.profile')
+def profile(context: bpy.types.Context, iterations: int = 10) -> list[NodeGroupTimings]:
+    """Evaluate the visible objects using `TM_` node groups several times, return the timings by node group."""
+    _results.clear()
+    objects = [obj for obj in context.view_layer.objects if obj.visible_get()]
+    profiled = get_profiled_modifiers(objects)
+    if len(profiled) == 0:
+        return []
+
+    samples: dict[str, list[float]] = {}
+    group_objects: dict[str, set[str]] = {}
+    tagged = {obj for obj, _ in profiled}
+    for _ in range(iterations):
+        for obj in tagged:
+            obj.update_tag()
+        context.view_layer.update()
+
+        for obj, modifier in profiled:
+            group_name = modifier.node_group.name
+            samples.setdefault(group_name, []).append(modifier.execution_time)
+            group_objects.setdefault(group_name, set()).add(obj.name)
+
+    _results.extend(
+        NodeGroupTimings(group_name, len(group_objects[group_name]), group_samples, iterations)
+        for group_name, group_samples in samples.items()
+    )
+    _results.sort(key=lambda timings: timings.pass_ms, reverse=True)
+    log.info(f'Profiled {len(profiled)} modifiers of {len(tagged)} objects, {iterations} iterations')
+    return list(_results)
+
+
+def get_results() -> list[NodeGroupTimings]:
+    return list(_results)
+
+
+def export_csv(filepath: str) -> int:
+    """Write the last results as CSV, return the number of rows."""
+    rows = [timings.to_dict() for timings in _results]
+    with open(filepath, mode='w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['node_group'])
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def export_json(filepath: str) -> int:
+    """Write the last results as JSON, with the raw samples, return the number of node groups."""
+    data = [dict(timings.to_dict(), samples_s=timings.samples) for timings in _results]
+    with open(filepath, mode='w', encoding='utf-8') as f:
+        json.dump({'blender': bpy.app.version_string, 'node_groups': data}, f, indent=1)
+    return len(data)
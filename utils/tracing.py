@@ -0,0 +1,209 @@
+"""Lightweight timing spans, aggregated by name & exportable as Chrome trace events
+
+Function | Use
+:---|:---
+enable() / disable()  | Start / stop recording spans
+is_enabled()          | Return True if spans are recorded
+span(name)            | Context manager timing a block
+traced(name)          | Decorator timing a function
+get_stats()           | Return the aggregated durations by span name
+export_chrome_trace(filepath) | Write the recorded spans as Chrome trace-event JSON
+reset()               | Forget the recorded spans
+
+While disabled, a span only costs a flag check.
+Set the `TMLG_TRACE=1` environment variable to record from the addon import (e.g. register()).
+
+Example | Note
+:---|:---
+`with tracing.span('load_assets'):`  | Time a block
+`@tracing.traced('on_load_post')`    | Time a function
+
+Blender checks the arguments count of registered class methods (e.g. `Operator.execute`),
+so don't decorate them: use `with tracing.span(self.bl_idname):` inside of them instead.
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+# Recorded spans kept for the Chrome trace export, oldest are dropped
+MAX_EVENTS = 100_000
+
+# Histogram buckets are powers of 2 of microseconds: [0, 1[, [1, 2[, [2, 4[...
+_BUCKETS = 32
+
+_enabled = os.environ.get('TMLG_TRACE', '') not in ('', '0')
+_lock = threading.Lock()
+_events = collections.deque(maxlen=MAX_EVENTS)
+_stats: dict[str, 'SpanStats'] = {}
+_thread_names: dict[int, str] = {}
+_epoch_ns = time.perf_counter_ns()
+
+
+#---------------------------------------------------------------------------
+#   Span stats classe
+#---------------------------------------------------------------------------
+
+class SpanStats():
+    """Durations histogram of a span."""
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, duration_ns: int) -> None:
+        if self.count == 0 or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.count += 1
+        self.total_ns += duration_ns
+        self.buckets[min((duration_ns // 1000).bit_length(), _BUCKETS - 1)] += 1
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
+
+    def percentile_ms(self, q: float) -> float:
+        """Return an upper estimate of the q (0-1) percentile, from the histogram buckets."""
+        threshold = q * self.count
+        cumulated = 0
+        for i, n in enumerate(self.buckets):
+            cumulated += n
+            if n and cumulated >= threshold:
+                upper_ns = (1 << i) * 1000
+                return min(upper_ns, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+
+#---------------------------------------------------------------------------
+#   Recording
+#---------------------------------------------------------------------------
+
+def _record(name: str, start_ns: int, end_ns: int) -> None:
+    thread = threading.current_thread()
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = SpanStats()
+        stats.add(end_ns - start_ns)
+        _events.append((name, start_ns, end_ns - start_ns, thread.ident))
+        _thread_names.setdefault(thread.ident, thread.name)
+
+
+class _Span():
+    __slots__ = ('name', 'start_ns')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _record(self.name, self.start_ns, time.perf_counter_ns())
+
+
+_null_span = contextlib.nullcontext()
+
+
+def span(name: str):
+    """Return a context manager recording the duration of its block."""
+    if not _enabled:
+        return _null_span
+    return _Span(name)
+
+
+def traced(name=None):
+    """Decorator recording the duration of each function call, named after the function by default.
+
+    Usable as `@traced`, `@traced()` or `@traced('name')`."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(span_name, start_ns, time.perf_counter_ns())
+        return wrapper
+
+    if callable(name):
+        func, name = name, None
+        return decorator(func)
+    return decorator
+
+
+#---------------------------------------------------------------------------
+#   Tracing functions
+#---------------------------------------------------------------------------
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _events.clear()
+        _stats.clear()
+        _thread_names.clear()
+
+
+def get_stats() -> dict[str, SpanStats]:
+    """Return a snapshot of the aggregated durations, by span name."""
+    with _lock:
+        return dict(_stats)
+
+
+def export_chrome_trace(filepath: str) -> int:
+    """Write the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+    Return the number of exported spans."""
+    with _lock:
+        events = list(_events)
+        thread_names = dict(_thread_names)
+
+    pid = os.getpid()
+    trace_events = [
+        {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+        for tid, thread_name in thread_names.items()
+    ]
+    trace_events.extend(
+        {
+            'name'  : name,
+            'cat'   : 'tmlg',
+            'ph'    : 'X',
+            'ts'    : (start_ns - _epoch_ns) / 1000,
+            'dur'   : duration_ns / 1000,
+            'pid'   : pid,
+            'tid'   : tid,
+        }
+        for name, start_ns, duration_ns, tid in events
+    )
+
+    with open(filepath, mode='w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+    return len(events)
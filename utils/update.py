@@ -9,21 +9,166 @@
 """
 
 import bpy
-import shutil
-import requests
 import zipfile
 import re
-import io
+import json
+import hashlib
+import shutil
+import tempfile
+import urllib.parse
+import os
+import time
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Callable
 
 from .. import bl_info
 from ..utils import path
 from ..utils import logs
 from ..utils.constants import (
     URL_RELEASES,
+    URL_RAW,
+    REQUEST_TIMEOUT,
 )
 
 log = logs.get_logger(__name__)
 
+# Seconds between two polls of the background check thread
+_POLL_INTERVAL = 0.2
+
+RELEASES_CACHE_FILENAME = 'releases_cache.json'
+
+# Download chunk size in bytes
+_CHUNK_SIZE = 1024 * 1024
+
+# Optional release asset listing the addon files with their size & SHA-256, for delta updates:
+# {"base_url": "<optional url the file paths are relative to>", "files": {"<path>": {"size": int, "sha256": str}}}
+FILES_MANIFEST_NAME = 'files_manifest.json'
+
+# Shared HTTP session, reuse connections for all update traffic.
+# requests is imported with it, as it is slow to import & only needed when checking for updates
+_session: 'requests.Session | None' = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> 'requests.Session':
+    """Return the HTTP session shared by all update requests. Thread safe."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            _session = requests.Session()
+            _session.headers.update({
+                'Accept'        : 'application/vnd.github+json',
+                'User-Agent'    : f'{bl_info["name"]}/{".".join(str(i) for i in bl_info["version"])}',
+            })
+        return _session
+
+
+def close_session() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class RateLimitedError(Exception):
+    """Github API rate limit is exceeded & no cached release metadata can be used."""
+
+
+def _read_release_cache(cache_filepath: str | None) -> dict:
+    if cache_filepath is None:
+        return {}
+    try:
+        with open(cache_filepath, mode='r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_release_cache(cache_filepath: str | None, cache: dict) -> None:
+    if cache_filepath is None:
+        return
+    tmp = f'{cache_filepath}.tmp'
+    try:
+        with open(tmp, mode='w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, cache_filepath)
+    except OSError:
+        log.warning(f'Cannot write release cache "{cache_filepath}"', exc_info=True)
+
+
+def _parse_digest(digest: str | None) -> str | None:
+    """Return the hex SHA-256 of a github asset digest ("sha256:<hex>"), None if not available."""
+    if digest is None:
+        return None
+    algorithm, _, value = digest.partition(':')
+    return value if algorithm == 'sha256' and value else None
+
+
+def _rate_limit_backoff(response: 'requests.Response') -> float:
+    """Return the epoch time until which the github API must not be requested, 0 if none."""
+    headers = response.headers
+    if 'Retry-After' in headers:
+        try:
+            return time.time() + float(headers['Retry-After'])
+        except ValueError:
+            pass
+    if headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            return float(headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return time.time() + 60
+    return 0
+
+
+class _ReleaseCheck():
+    """Background release check: the worker thread only sets its own attributes."""
+
+    def __init__(
+            self,
+            addon_update: type,
+            timeout: float,
+            ttl: float,
+            cache_filepath: str,
+            on_done: Callable[[], None] | None,
+        ) -> None:
+        self.release: dict | None = None
+        self.error: Exception | None = None
+        self.on_done = on_done
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(addon_update, timeout, ttl, cache_filepath),
+            name='TMLG-ReleaseCheck',
+            daemon=True,
+        )
+
+    def _run(self, addon_update: type, timeout: float, ttl: float, cache_filepath: str) -> None:
+        try:
+            self.release = addon_update.fetch_latest_release(timeout, ttl, cache_filepath)
+        except Exception as e:
+            self.error = e
+
+
+def _poll_release_check() -> float | None:
+    """Timer function, apply the background check result on the main thread once done."""
+    check = AddonUpdate._check
+    if check is None:
+        return None
+    if check.thread.is_alive():
+        return _POLL_INTERVAL
+    AddonUpdate._finish_check()
+    return None
+
+
+def _redraw_view3d_areas() -> None:
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
 
 class AddonUpdate():   
     current_addon_version:tuple = bl_info["version"]
@@ -33,12 +178,20 @@ class AddonUpdate():
     latest_is_prerelease:bool = False
     latest_filename:str = None
     latest_download_url:str = None
+    latest_size:int = None
+    latest_sha256:str = None
+    latest_tag_name:str = None
+    latest_manifest_url:str = None
     
     new_addon_available:bool = False
     current_blender_supported:bool = False
     can_update: bool = False
     update_successful = False
 
+    url_releases: str = URL_RELEASES
+    is_checking: bool = False
+    _check: '_ReleaseCheck | None' = None
+
     @classmethod
     def check_can_update(cls) :
         cls.new_addon_available = cls.latest_addon_version > cls.current_addon_version
@@ -60,65 +213,362 @@ class AddonUpdate():
             log.info('No update available')
 
 
+    @staticmethod
+    def parse_release(releases: list) -> dict:
+        """Parse the latest release from the github API releases JSON. Thread safe."""
+        latest = releases[0]
+        latest_tag_name    = latest['tag_name']
+        latest_is_prerelease = latest['prerelease']
+        # Addon archive is the first ".zip" asset, the files manifest is optional
+        latest_asset = next(asset for asset in latest['assets'] if asset['name'].lower().endswith('.zip'))
+        manifest_asset = next((asset for asset in latest['assets'] if asset['name'] == FILES_MANIFEST_NAME), None)
+        latest_asset_name = latest_asset['name']
+        latest_asset_download_url = latest_asset['browser_download_url']
+        # Get latest addon version from github API      
+        pattern = rf'^v(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
+        match = re.search(pattern, latest_tag_name, flags=re.IGNORECASE)
+        latest_addon_version = (int(match.group('major')), int(match.group('minor')), int(match.group('patch')))
+        # Get latest addon blender version from the asset name
+        pattern = rf'(?P<major>\d+)\.(?P<minor>\d+)\.zip$'
+        match = re.search(pattern, latest_asset_name, flags=re.IGNORECASE)
+        latest_minimal_blender_version = (int(match.group('major')), int(match.group('minor')))
+
+        return {
+            'addon_version'             : latest_addon_version,
+            'is_prerelease'             : latest_is_prerelease,
+            'minimal_blender_version'   : latest_minimal_blender_version,
+            'filename'                  : latest_asset_name,
+            'download_url'              : latest_asset_download_url,
+            'size'                      : latest_asset.get('size'),
+            'sha256'                    : _parse_digest(latest_asset.get('digest')),
+            'tag_name'                  : latest_tag_name,
+            'manifest_url'              : manifest_asset['browser_download_url'] if manifest_asset else None,
+        }
+
+
+    @classmethod
+    def fetch_latest_release(
+            cls,
+            timeout: float = REQUEST_TIMEOUT,
+            ttl: float = 0,
+            cache_filepath: str | None = None,
+        ) -> dict:
+        """Request & parse the latest release metadata. Thread safe, doesn't touch class attributes.
+
+        Cached metadata younger than ttl seconds is returned without request, older metadata is
+        revalidated with ETag/Last-Modified headers (a 304 response isn't parsed).
+        While rate limited, cached metadata is returned whatever its age."""
+        cache = _read_release_cache(cache_filepath)
+        cached_release = cache.get('release')
+        now = time.time()
+
+        if cache.get('backoff_until', 0) > now:
+            log.warning(f'Github API rate limited until {time.ctime(cache["backoff_until"])}')
+            if cached_release is None:
+                raise RateLimitedError(f'Rate limited until {time.ctime(cache["backoff_until"])}')
+            return cached_release
+
+        if cached_release is not None and now - cache.get('fetched_at', 0) < ttl:
+            log.debug('Using cached release metadata')
+            return cached_release
+
+        headers = {}
+        if cached_release is not None:
+            if 'etag' in cache:
+                headers['If-None-Match'] = cache['etag']
+            if 'last_modified' in cache:
+                headers['If-Modified-Since'] = cache['last_modified']
+
+        response = get_session().get(cls.url_releases, headers=headers, timeout=timeout)
+        backoff_until = _rate_limit_backoff(response)
+
+        if response.status_code == 304 and cached_release is not None:
+            log.debug('Release metadata not modified')
+            release = cached_release
+        elif response.status_code in (403, 429) and backoff_until > 0:
+            _write_release_cache(cache_filepath, cache | {'backoff_until': backoff_until})
+            if cached_release is None:
+                raise RateLimitedError(f'Rate limited until {time.ctime(backoff_until)}')
+            log.warning(f'Github API rate limited until {time.ctime(backoff_until)}, using cached release metadata')
+            return cached_release
+        else:
+            response.raise_for_status()
+            release = cls.parse_release(response.json())
+            cache = {'release': release}
+            if 'ETag' in response.headers:
+                cache['etag'] = response.headers['ETag']
+            if 'Last-Modified' in response.headers:
+                cache['last_modified'] = response.headers['Last-Modified']
+
+        cache['fetched_at'] = now
+        cache['backoff_until'] = backoff_until
+        _write_release_cache(cache_filepath, cache)
+        return release
+
+
+    @classmethod
+    def get_cache_filepath(cls) -> str:
+        """Return the release metadata cache filepath. Main thread only."""
+        return str(path.get_user_cache_path() / RELEASES_CACHE_FILENAME)
+
+
     @classmethod
-    def check_for_new_release(cls):
+    def apply_release(cls, release: dict) -> None:
+        """Update class attributes from parsed release metadata."""
+        # Versions are lists once cached as JSON
+        cls.latest_addon_version = tuple(release['addon_version'])
+        cls.latest_is_prerelease = release['is_prerelease']
+        cls.latest_minimal_blender_version = tuple(release['minimal_blender_version'])
+        cls.latest_filename = release['filename']
+        cls.latest_download_url = release['download_url']
+        cls.latest_size = release.get('size')
+        cls.latest_sha256 = release.get('sha256')
+        cls.latest_tag_name = release.get('tag_name')
+        cls.latest_manifest_url = release.get('manifest_url')
+
+
+    @classmethod
+    def check_for_new_release(cls, ttl: float = 0):
+        """Check for a new release, blocking until the request ends or times out."""
         log.info('Checking for new release...')
         try:
-            response = requests.get(URL_RELEASES)
-            # Parse latest release
-            latest = response.json()[0]
-            latest_tag_name    = latest['tag_name']
-            latest_is_prerelease = latest['prerelease']
-            latest_asset = latest['assets'][0]
-            latest_asset_name = latest_asset['name']
-            latest_asset_download_url = latest_asset['browser_download_url']
-            # Get latest addon version from github API      
-            pattern = rf'^v(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)'
-            match = re.search(pattern, latest_tag_name, flags=re.IGNORECASE)
-            latest_addon_version = (int(match.group('major')), int(match.group('minor')), int(match.group('patch')))
-            # Get latest addon blender version from the asset name
-            pattern = rf'(?P<major>\d+)\.(?P<minor>\d+)\.zip$'
-            match = re.search(pattern, latest_asset_name, flags=re.IGNORECASE)
-            latest_minimal_blender_version = (int(match.group('major')), int(match.group('minor')))
+            release = cls.fetch_latest_release(ttl=ttl, cache_filepath=cls.get_cache_filepath())
         except Exception as e:
             log.exception('Error during parse of release metadata.')
         else:
-            # Update class attributes
-            cls.latest_addon_version = latest_addon_version
-            cls.latest_is_prerelease = latest_is_prerelease
-            cls.latest_minimal_blender_version = latest_minimal_blender_version
-            cls.latest_filename = latest_asset_name
-            cls.latest_download_url = latest_asset_download_url        
+            cls.apply_release(release)
         finally:
             cls.check_can_update()
 
 
     @classmethod
-    def do_update(cls) -> None:
-        
-        def on_rmtree_error(function, path, excinfo):
-            log.error(f'<{function.__name__}> {excinfo[1]}')
+    def start_check(
+            cls,
+            on_done: Callable[[], None] | None = None,
+            timeout: float = REQUEST_TIMEOUT,
+            ttl: float = 0,
+        ) -> bool:
+        """Check for a new release in a worker thread, without blocking blender.
+
+        Results are applied on the main thread by a timer, then VIEW_3D areas are redrawn
+        and on_done is called. Return False if a check is already running."""
+        if cls.is_checking:
+            return False
+
+        log.info('Checking for new release in background...')
+        check = _ReleaseCheck(cls, timeout, ttl, cls.get_cache_filepath(), on_done)
+        cls._check = check
+        cls.is_checking = True
+        check.thread.start()
+        # Persistent: a file loaded during the check must not drop the timer, is_checking would stay True
+        bpy.app.timers.register(_poll_release_check, first_interval=_POLL_INTERVAL, persistent=True)
+        return True
+
 
+    @classmethod
+    def cancel_check(cls) -> None:
+        """Cancel the running background check, its result will be discarded."""
+        if cls._check is not None:
+            cls._check.cancelled.set()
+            cls._check = None
+            log.debug('Release check cancelled')
+        cls.is_checking = False
+        if bpy.app.timers.is_registered(_poll_release_check):
+            bpy.app.timers.unregister(_poll_release_check)
+
+
+    @classmethod
+    def _finish_check(cls) -> None:
+        check = cls._check
+        cls._check = None
+        cls.is_checking = False
+
+        if check.cancelled.is_set():
+            return
+
+        if check.error is not None:
+            log.error('Error during parse of release metadata.', exc_info=check.error)
+        else:
+            cls.apply_release(check.release)
+        cls.check_can_update()
+
+        _redraw_view3d_areas()
+        if check.on_done is not None:
+            check.on_done()
+
+
+    @classmethod
+    def do_update(
+            cls,
+            progress: Callable[[int, int], None] | None = None,
+            addon_path: Path | None = None,
+        ) -> None:
+        """Download, verify & install the latest release.
+
+        If the release publishes a files manifest, only the changed files are downloaded and the
+        unchanged ones are reused from the installed addon. Otherwise (or if that fails) the archive
+        is streamed to a temporary file (progress is called with downloaded & total bytes),
+        checked against the release asset size & SHA-256 and extracted.
+        The staging directory then replaces the addon directory. The current addon is restored on error."""
         if cls.can_update:
             log.info('Updating addon now...')
 
             url = cls.latest_download_url
-            addon_path = path.get_addon_path().resolve()
-            extract_to = addon_path.parent
+            addon_path = (addon_path or path.get_addon_path()).resolve()
+            install_dir = addon_path.parent
 
             log.debug(f'{addon_path = }')
-            log.debug(f'{extract_to = }')
+            log.debug(f'{install_dir = }')
             
             try:
-                r = requests.get(url)
-                z = zipfile.ZipFile(io.BytesIO(r.content))
-
-                shutil.rmtree(addon_path, ignore_errors=False, onerror=on_rmtree_error)
-                z.extractall(extract_to)
+                # Temporary files on the same volume, so directories are swapped by renaming
+                with tempfile.TemporaryDirectory(prefix='.tmlg_update_', dir=install_dir, ignore_cleanup_errors=True) as tmp:
+                    tmp = path.make_path(tmp)
+                    staged = None
+                    if cls.latest_manifest_url:
+                        try:
+                            base_url = f'{URL_RAW}/{cls.latest_tag_name}/'
+                            staged = _stage_delta(cls.latest_manifest_url, base_url, addon_path, tmp / 'delta', progress)
+                        except Exception as e:
+                            log.warning('Delta update failed, downloading the full release', exc_info=True)
+                            staged = None
+                    if staged is None:
+                        archive = tmp / 'release.zip'
+                        _download(url, archive, cls.latest_size, cls.latest_sha256, progress)
+                        staged = _extract(archive, tmp / 'staging', addon_path.name)
+                    _swap_directories(staged, addon_path, tmp / 'previous')
                 
             except Exception as e:
                 log.exception('Error during addon update')
 
             else:
                 cls.update_successful = True
-                log.info('Addon updated, blender must be restarted.')
\ No newline at end of file
+                log.info('Addon updated, blender must be restarted.')
+
+
+#---------------------------------------------------------------------------
+#   Install functions
+#---------------------------------------------------------------------------
+
+def _download(
+        url: str,
+        filepath: Path,
+        expected_size: int | None = None,
+        expected_sha256: str | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> None:
+    """Stream a file to disk by chunks, then check its size & SHA-256 if known."""
+    sha256 = hashlib.sha256()
+    size = 0
+    with get_session().get(url, stream=True, timeout=REQUEST_TIMEOUT) as r:
+        r.raise_for_status()
+        total = int(r.headers.get('Content-Length', 0)) or expected_size or 0
+        with open(filepath, mode='wb') as f:
+            for chunk in r.iter_content(chunk_size=_CHUNK_SIZE):
+                f.write(chunk)
+                sha256.update(chunk)
+                size += len(chunk)
+                if progress is not None:
+                    progress(size, total)
+
+    log.debug(f'Downloaded {size} bytes, sha256:{sha256.hexdigest()}')
+    if expected_size is not None and size != expected_size:
+        raise ValueError(f'Downloaded size {size} doesn\'t match release size {expected_size}')
+    if expected_sha256 is not None and sha256.hexdigest() != expected_sha256.lower():
+        raise ValueError(f'Downloaded SHA-256 {sha256.hexdigest()} doesn\'t match release {expected_sha256}')
+
+
+def _extract(archive: Path, staging: Path, addon_dirname: str) -> Path:
+    """Extract the release archive and return the staged addon directory."""
+    staging.mkdir()
+    with zipfile.ZipFile(archive) as z:
+        for member in z.namelist():
+            if not (staging / member).resolve().is_relative_to(staging.resolve()):
+                raise ValueError(f'Unsafe path in release archive: "{member}"')
+        z.extractall(staging)
+
+    staged = staging / addon_dirname
+    if not staged.is_dir():
+        # Archive top directory may be named differently
+        dirs = [p for p in staging.iterdir() if p.is_dir()]
+        if len(dirs) != 1:
+            raise ValueError('Release archive must contain a single addon directory')
+        staged = dirs[0]
+    return staged
+
+
+def _file_matches(filepath: Path, size: int, sha256: str) -> bool:
+    """Return True if the file exists with the given size & SHA-256."""
+    try:
+        if filepath.stat().st_size != size:
+            return False
+        digest = hashlib.sha256()
+        with open(filepath, mode='rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.hexdigest() == sha256.lower()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard link a file when possible (no data copied), copy it otherwise."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _stage_delta(
+        manifest_url: str,
+        base_url: str,
+        addon_path: Path,
+        staging: Path,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> Path:
+    """Stage the release from the files manifest: unchanged files are taken from the installed addon,
+    changed files are downloaded & verified. Return the staged addon directory."""
+    response = get_session().get(manifest_url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    manifest = response.json()
+    base_url = manifest.get('base_url') or base_url
+    if not base_url.endswith('/'):
+        base_url += '/'
+
+    staged = staging / addon_path.name
+    changed = []
+    for relpath, meta in manifest['files'].items():
+        parts = PurePosixPath(relpath).parts
+        if PurePosixPath(relpath).is_absolute() or '..' in parts:
+            raise ValueError(f'Unsafe path in files manifest: "{relpath}"')
+        dst = staged.joinpath(*parts)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        src = addon_path.joinpath(*parts)
+        if _file_matches(src, meta['size'], meta['sha256']):
+            _link_or_copy(src, dst)
+        else:
+            changed.append((relpath, dst, meta))
+
+    total = sum(meta['size'] for _, _, meta in changed)
+    log.info(f'Delta update: {len(changed)}/{len(manifest["files"])} files changed, {total} bytes to download')
+
+    done = 0
+    for relpath, dst, meta in changed:
+        file_progress = None
+        if progress is not None:
+            file_progress = lambda size, _total, done=done: progress(done + size, total)
+        _download(base_url + urllib.parse.quote(relpath), dst, meta['size'], meta['sha256'], file_progress)
+        done += meta['size']
+
+    return staged
+
+
+def _swap_directories(staged: Path, addon_path: Path, backup: Path) -> None:
+    """Replace the addon directory by the staged one, restoring it if anything fails."""
+    os.replace(addon_path, backup)
+    try:
+        os.replace(staged, addon_path)
+    except OSError:
+        log.error('Cannot install the new release, restoring current addon')
+        os.replace(backup, addon_path)
+        raise